@@ -1,29 +1,71 @@
 """The Family Health Tracker integration."""
 import logging
+import os
 from typing import Any
 from datetime import datetime
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.const import CONF_NAME, CONF_DEVICE_ID
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.const import (
+    CONF_DEVICE_ID,
+    CONF_NAME,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+)
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
     CONF_MEMBERS,
     ATTR_TEMPERATURE,
     ATTR_MEDICATION,
+    ATTR_MEASUREMENTS,
+    ATTR_MEASURED_AT,
+    ATTR_START,
+    ATTR_END,
+    ATTR_BIN_MINUTES,
+    ATTR_RESPONSE_HOURS,
+    ATTR_FORMAT,
+    ATTR_PATH,
+    ATTR_CURSOR,
+    ATTR_LIMIT,
+    ATTR_IDEMPOTENCY_KEY,
+    IDEMPOTENCY_TTL,
+    HISTORY_PAGE_SIZE,
+    HISTORY_MAX_PAGE_SIZE,
     VERSION,
-    get_medication_values,
     CONF_MEDICATIONS,
+    CONF_INSTRUMENTATION,
+    CONF_STATISTICS_WINDOWS,
     DEFAULT_MEDICATIONS,
-    get_combined_medications
+    DEFAULT_STATISTICS_WINDOWS,
+    SIGNAL_MEMBERS_ADDED,
 )
+from .analytics import MemberSeries, summarize
+from .dose import async_get_dose_scheduler
+from .export import EXPORT_FORMATS, write_export
+from .history import HistoryStore, Measurement
+from .idempotency import async_get_idempotency_cache
+from .levels import get_levels
+from .medications import MedicationIndex
+from .metrics import Metrics
+from .query import query_page
+from .runtime import MemberRuntime, async_get_member_directory, normalize_member
+from .snapshot import StateSnapshot
+from . import websocket
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,23 +85,97 @@ CONFIG_SCHEMA = vol.Schema({
     })
 }, extra=vol.ALLOW_EXTRA)
 
-PLATFORMS = ["sensor", "number", "select", "button"]
+PLATFORMS = ["sensor", "binary_sensor", "number", "select", "button"]
 
-MEASUREMENT_SERVICE_SCHEMA = vol.Schema({
-    vol.Required(CONF_NAME): cv.string,
+# A member is addressed by name, or by device id when the name is not unique
+MEMBER_FIELDS = {
+    vol.Optional(CONF_NAME): cv.string,
+    vol.Optional(CONF_DEVICE_ID): cv.string,
+}
+
+# Medications are checked against the member's own library in the handler
+MEASUREMENT_FIELDS = {
+    **MEMBER_FIELDS,
     vol.Required(ATTR_TEMPERATURE): vol.Coerce(float),
-    vol.Required(ATTR_MEDICATION): vol.In(get_medication_values())
+    vol.Required(ATTR_MEDICATION): cv.string,
+    vol.Optional(ATTR_IDEMPOTENCY_KEY): cv.string,
+}
+
+MEASUREMENT_SERVICE_SCHEMA = vol.All(
+    vol.Schema(MEASUREMENT_FIELDS),
+    cv.has_at_least_one_key(CONF_NAME, CONF_DEVICE_ID),
+)
+
+BATCH_RECORD_SCHEMA = vol.All(
+    vol.Schema({
+        **MEASUREMENT_FIELDS,
+        vol.Optional(ATTR_MEASURED_AT): cv.datetime,
+    }),
+    cv.has_at_least_one_key(CONF_NAME, CONF_DEVICE_ID),
+)
+
+BATCH_SERVICE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_MEASUREMENTS): vol.All(
+        cv.ensure_list, vol.Length(min=1), [BATCH_RECORD_SCHEMA]
+    ),
 })
 
+ANALYTICS_SERVICE_SCHEMA = vol.All(
+    vol.Schema({
+        **MEMBER_FIELDS,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_BIN_MINUTES, default=60): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_RESPONSE_HOURS, default=4): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1)
+        ),
+    }),
+    cv.has_at_least_one_key(CONF_NAME, CONF_DEVICE_ID),
+)
+
+IMPORT_SERVICE_SCHEMA = vol.Schema({
+    vol.Optional(CONF_NAME): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(CONF_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+})
+
+EXPORT_SERVICE_SCHEMA = vol.All(
+    vol.Schema({
+        **MEMBER_FIELDS,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_FORMAT, default="csv"): vol.In(EXPORT_FORMATS),
+        vol.Optional(ATTR_PATH): cv.string,
+    }),
+    cv.has_at_least_one_key(CONF_NAME, CONF_DEVICE_ID),
+)
+
+HISTORY_SERVICE_SCHEMA = vol.All(
+    vol.Schema({
+        **MEMBER_FIELDS,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_CURSOR): cv.string,
+        vol.Optional(ATTR_LIMIT, default=HISTORY_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=HISTORY_MAX_PAGE_SIZE)
+        ),
+    }),
+    cv.has_at_least_one_key(CONF_NAME, CONF_DEVICE_ID),
+)
+
+GET_MEDICATIONS_SCHEMA = vol.Schema({})
+
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Family Health Tracker component."""
     _LOGGER.debug("Setting up Family Health Tracker integration")
 
-    if DOMAIN not in config:
-        return True
-
     hass.data.setdefault(DOMAIN, {})
 
+    # Services are registered once and route each call to its member
+    _async_register_services(hass)
+    websocket.async_setup(hass)
+
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -69,30 +185,246 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     # Initialize storage for this entry
     hass.data[DOMAIN][entry.entry_id] = {}
-    
-    # Store medications in hass.data
-    hass.data[DOMAIN][CONF_MEDICATIONS] = entry.options.get(CONF_MEDICATIONS, {})
 
-    # Register services
-    async def add_measurement(call: ServiceCall) -> None:
-        """Add a new measurement."""
-        name = call.data[CONF_NAME]
-        temperature = call.data[ATTR_TEMPERATURE]
-        medication = call.data[ATTR_MEDICATION]
+    # Load the measurement history once; all reads are served from memory
+    history = HistoryStore(hass, entry.entry_id)
+    await history.async_load()
+    hass.data[DOMAIN][entry.entry_id]["history"] = history
+
+    async def _flush_history(event: Event) -> None:
+        """Persist pending measurements before Home Assistant stops."""
+        await history.async_close()
+
+    entry.async_on_unload(
+        hass.bus.async_listen(EVENT_HOMEASSISTANT_FINAL_WRITE, _flush_history)
+    )
 
-        # Get the correct entities
-        name_lower = name.lower()
-        temp_entity_id = f"sensor.temperature_{name_lower}"
-        med_entity_id = f"sensor.medication_{name_lower}"
+    # Last known member state, read once so entities start populated
+    snapshot = StateSnapshot(hass, entry.entry_id)
+    await snapshot.async_load()
+    hass.data[DOMAIN][entry.entry_id]["snapshot"] = snapshot
 
-        temp_sensor = hass.data[DOMAIN][entry.entry_id].get(temp_entity_id)
-        med_sensor = hass.data[DOMAIN][entry.entry_id].get(med_entity_id)
+    # Latency histograms and counters; near free while disabled
+    metrics = Metrics(entry.options.get(CONF_INSTRUMENTATION, False))
+    hass.data[DOMAIN][entry.entry_id]["metrics"] = metrics
 
-        if temp_sensor is None or med_sensor is None:
-            raise HomeAssistantError(f"Could not find sensors for {name}")
+    # Each entry keeps its own medication library, rebuilt only when it changes
+    started = metrics.start()
+    medications = MedicationIndex(entry.options.get(CONF_MEDICATIONS, {}))
+    metrics.record("medication_rebuild", started)
+    hass.data[DOMAIN][entry.entry_id]["medications"] = medications
 
-        await temp_sensor.update_temperature(temperature)
-        await med_sensor.update_medication(medication)
+    doses = async_get_dose_scheduler(hass)
+    entry.async_on_unload(lambda: doses.async_remove_entry(entry.entry_id))
+    directory = async_get_member_directory(hass)
+    entry.async_on_unload(lambda: directory.async_remove_entry(entry.entry_id))
+
+    # Create a hub device first
+    device_registry = dr.async_get(hass)
+    hub = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, entry.entry_id)},
+        name="Family Health Tracker",
+        manufacturer="Family Health Tracker",
+        model="Hub",
+        sw_version=VERSION,
+    )
+
+    # Build one runtime and device per member; platforms attach their entities to it
+    members = {}
+    for name in _member_names(entry):
+        runtime = _async_add_member(hass, entry, name)
+        members[runtime.key] = runtime
+    hass.data[DOMAIN][entry.entry_id]["members"] = members
+
+    # Drop devices of members removed while the entry was not loaded
+    keep = {hub.id, *(runtime.device_id for runtime in members.values())}
+    for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+        if device.id not in keep:
+            device_registry.async_remove_device(device.id)
+
+    # Member changes are applied as a diff, other option changes reload
+    hass.data[DOMAIN][entry.entry_id]["options"] = dict(entry.options)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    _LOGGER.debug("Starting platform setup for: %s", PLATFORMS)
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    return True
+
+def _member_names(entry: ConfigEntry) -> list[str]:
+    """Return the configured member names, the options taking precedence."""
+    names = {}
+    for name in entry.options.get(CONF_MEMBERS, entry.data[CONF_MEMBERS]).split(","):
+        name = name.strip()
+        if name:
+            names.setdefault(normalize_member(name), name)
+    return list(names.values())
+
+@callback
+def _async_add_member(hass: HomeAssistant, entry: ConfigEntry, name: str) -> MemberRuntime:
+    """Build a member's runtime, register its device and index it."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    runtime = MemberRuntime(
+        hass,
+        name,
+        entry.entry_id,
+        entry_data["history"],
+        entry_data["medications"],
+        async_get_dose_scheduler(hass),
+        entry_data["metrics"],
+        entry_data["snapshot"],
+    )
+    _async_restore_doses(runtime)
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id,
+        entry_type=dr.DeviceEntryType.SERVICE,  # This is important for showing the configuration section
+        **runtime.device_info,
+    )
+    runtime.device_id = device.id
+    async_get_member_directory(hass).async_add_member(runtime)
+    return runtime
+
+@callback
+def _async_remove_member(hass: HomeAssistant, runtime: MemberRuntime) -> None:
+    """Remove a member's device, entities, deadlines and index entries.
+
+    The measurement history and the state snapshot are kept, so a member
+    that is added again continues where it left off.
+    """
+    async_get_member_directory(hass).async_remove_member(runtime)
+    runtime.doses.async_remove_member(runtime.entry_id, runtime.key)
+    # Removing the device removes its entities from the registry and
+    # from their platforms
+    dr.async_get(hass).async_remove_device(runtime.device_id)
+
+@callback
+def _async_remove_statistics_entities(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the statistics sensors of windows that are no longer configured."""
+    windows = {
+        f"{hours}h"
+        for hours in entry.options.get(CONF_STATISTICS_WINDOWS, DEFAULT_STATISTICS_WINDOWS)
+    }
+    entity_registry = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id):
+        _, stats, window = entity.unique_id.rpartition("_temperature_stats_")
+        if stats and window not in windows:
+            entity_registry.async_remove(entity.entity_id)
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    previous = entry_data["options"]
+    entry_data["options"] = options = dict(entry.options)
+    changed = {
+        key for key in previous.keys() | options.keys()
+        if previous.get(key) != options.get(key)
+    }
+    # The medication library is rebuilt live by the options flow
+    if changed - {CONF_MEMBERS, CONF_MEDICATIONS}:
+        if CONF_STATISTICS_WINDOWS in changed:
+            _async_remove_statistics_entities(hass, entry)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    if CONF_MEMBERS not in changed:
+        return
+
+    members = entry_data["members"]
+    wanted = {normalize_member(name): name for name in _member_names(entry)}
+    removed = [runtime for key, runtime in members.items() if key not in wanted]
+    for runtime in removed:
+        del members[runtime.key]
+        _async_remove_member(hass, runtime)
+    added = []
+    for key, name in wanted.items():
+        if key not in members:
+            runtime = members[key] = _async_add_member(hass, entry, name)
+            added.append(runtime)
+    if added:
+        async_dispatcher_send(hass, SIGNAL_MEMBERS_ADDED.format(entry.entry_id), added)
+    _LOGGER.debug(
+        "Updated members of %s: %s added, %s removed",
+        entry.entry_id,
+        len(added),
+        len(removed),
+    )
+
+@callback
+def _async_restore_doses(runtime: MemberRuntime) -> None:
+    """Reschedule dose deadlines from the member's stored history."""
+    last_given = {}
+    for measurement in runtime.history.ring(runtime.key):
+        if measurement.medication != "none":
+            last_given[measurement.medication] = measurement.timestamp
+    for medication, timestamp in last_given.items():
+        runtime.record_dose(medication, timestamp, notify=False)
+
+@callback
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register the domain services, shared by every config entry."""
+    directory = async_get_member_directory(hass)
+    idempotency = async_get_idempotency_cache(hass)
+
+    def _resolve(data: dict[str, Any]) -> MemberRuntime:
+        """Return the member a call or batch record refers to."""
+        return directory.resolve(data.get(CONF_NAME), data.get(CONF_DEVICE_ID))
+
+    def _resolve_recording(data: dict[str, Any]) -> MemberRuntime:
+        """Return the member of a measurement, checking it can be recorded."""
+        runtime = _resolve(data)
+        if not runtime.sensors_ready:
+            raise HomeAssistantError(f"Could not find sensors for {runtime.name}")
+        if data[ATTR_MEDICATION] not in runtime.medications:
+            raise HomeAssistantError(
+                f"Unknown medication {data[ATTR_MEDICATION]} for {runtime.name}"
+            )
+        return runtime
+
+    def _duplicate_key(
+        runtime: MemberRuntime, data: dict[str, Any], timestamp: float | None
+    ) -> tuple | None:
+        """Return the key identifying a measurement, if it has one.
+
+        Without an idempotency key, a reading is identified by its exact
+        measured_at and values. A reading stamped on arrival has no key, so
+        a genuine repeat of the same values is never dropped.
+        """
+        key = data.get(ATTR_IDEMPOTENCY_KEY)
+        if key is not None:
+            return (runtime.entry_id, runtime.key, key)
+        if timestamp is not None:
+            return (
+                runtime.entry_id,
+                runtime.key,
+                timestamp,
+                data[ATTR_TEMPERATURE],
+                data[ATTR_MEDICATION],
+            )
+        return None
+
+    def _is_duplicate(runtime: MemberRuntime, cache_key: tuple | None) -> bool:
+        """Return True if a measurement with this key was already applied."""
+        if cache_key is None or not idempotency.async_seen(cache_key):
+            return False
+        runtime.metrics.increment("duplicates")
+        return True
+
+    async def add_measurement(call: ServiceCall) -> None:
+        """Add a new measurement."""
+        runtime = _resolve_recording(call.data)
+        cache_key = _duplicate_key(runtime, call.data, None)
+        if _is_duplicate(runtime, cache_key):
+            _LOGGER.debug("Ignoring duplicate measurement for %s", runtime.name)
+            return
+        started = runtime.metrics.start()
+        await runtime.async_record(
+            call.data[ATTR_TEMPERATURE], call.data[ATTR_MEDICATION]
+        )
+        runtime.metrics.record("add_measurement", started)
+        # Only remembered once applied, so a failed call can be retried
+        if cache_key is not None:
+            idempotency.async_add(cache_key, IDEMPOTENCY_TTL)
 
     hass.services.async_register(
         DOMAIN,
@@ -101,11 +433,232 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         schema=MEASUREMENT_SERVICE_SCHEMA,
     )
 
+    async def add_measurements_batch(call: ServiceCall) -> None:
+        """Add many measurements, writing each affected entity once."""
+        now = dt_util.now()
+        records = []
+        # Resolve every member before applying anything so a bad record
+        # does not leave the batch half-applied
+        for record in call.data[ATTR_MEASUREMENTS]:
+            runtime = _resolve_recording(record)
+            measured_at = record.get(ATTR_MEASURED_AT)
+            measured_at = dt_util.as_local(measured_at) if measured_at else None
+            records.append((measured_at or now, measured_at is None, runtime, record))
+
+        records.sort(key=lambda item: item[0])
+
+        dirty = set()
+        duplicates = 0
+        for measured_at, on_arrival, runtime, record in records:
+            temperature = record[ATTR_TEMPERATURE]
+            medication = record[ATTR_MEDICATION]
+            timestamp = measured_at.timestamp()
+            cache_key = _duplicate_key(
+                runtime, record, None if on_arrival else timestamp
+            )
+            if _is_duplicate(runtime, cache_key):
+                duplicates += 1
+                continue
+            history = runtime.history
+            ring = history.ring(runtime.key)
+            is_latest = ring.last is None or timestamp >= ring.last.timestamp
+            history.async_record(runtime.key, timestamp, temperature, medication)
+            runtime.snapshot.async_update(runtime.key, timestamp, temperature, medication)
+            runtime.metrics.increment("measurements")
+            dirty.update(
+                runtime.apply_measurement(measured_at, temperature, medication, is_latest)
+            )
+            # The dose sensor is written with the others, not once per record
+            runtime.record_dose(medication, timestamp, notify=False)
+            if medication != "none" and runtime.dose_sensor is not None:
+                dirty.add(runtime.dose_sensor)
+            runtime.async_fire_measurement(timestamp, temperature, medication)
+            if cache_key is not None:
+                idempotency.async_add(cache_key, IDEMPOTENCY_TTL)
+
+        for sensor in dirty:
+            sensor.async_write_ha_state()
+
+        _LOGGER.debug(
+            "Applied %s measurements, skipped %s duplicates, wrote %s entity states",
+            len(records) - duplicates,
+            duplicates,
+            len(dirty),
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        "add_measurements_batch",
+        add_measurements_batch,
+        schema=BATCH_SERVICE_SCHEMA,
+    )
+
+    # Per member: (ring, ring version, series); a reloaded entry has new rings
+    series_cache = {}
+
+    async def get_analytics(call: ServiceCall) -> ServiceResponse:
+        """Summarize a member's measurement history."""
+        runtime = _resolve(call.data)
+
+        # Snapshot the ring in the event loop; the NumPy columns are only
+        # rebuilt after new measurements arrived
+        cache_key = (runtime.entry_id, runtime.key)
+        ring = runtime.history.ring(runtime.key)
+        version = ring.version
+        cached = series_cache.get(cache_key)
+        columns = (
+            ring.columns()
+            if cached is None or cached[0] is not ring or cached[1] != version
+            else None
+        )
+
+        start = call.data.get(ATTR_START)
+        end = call.data.get(ATTR_END)
+        end_ts = dt_util.as_utc(end).timestamp() if end else dt_util.utcnow().timestamp()
+        levels = get_levels(hass, runtime.key)
+
+        def _summarize() -> tuple[MemberSeries, dict]:
+            series = MemberSeries(*columns) if columns is not None else cached[2]
+            return series, summarize(
+                series,
+                levels,
+                dt_util.as_utc(start).timestamp() if start else None,
+                end_ts,
+                call.data[ATTR_BIN_MINUTES] * 60,
+                call.data[ATTR_RESPONSE_HOURS] * 3600,
+            )
+
+        series, summary = await hass.async_add_executor_job(_summarize)
+        if columns is not None:
+            series_cache[cache_key] = (ring, version, series)
+        return {"member": runtime.name, **summary}
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_analytics",
+        get_analytics,
+        schema=ANALYTICS_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def import_recorder_history(call: ServiceCall) -> ServiceResponse:
+        """Stream past measurements from the recorder into the history."""
+        # Imported lazily so the integration still loads without a recorder
+        from .backfill import async_import_member
+
+        names = call.data.get(CONF_NAME, [])
+        device_ids = call.data.get(CONF_DEVICE_ID, [])
+        if names or device_ids:
+            selected = [directory.resolve(name=name) for name in names]
+            selected.extend(
+                directory.resolve(device_id=device_id) for device_id in device_ids
+            )
+        else:
+            selected = list(directory)
+
+        progress = {"imported": 0, "skipped": 0, "rows_read": 0}
+        for runtime in selected:
+            await async_import_member(hass, runtime, progress)
+        # Deadlines may have changed with the imported doses
+        for runtime in selected:
+            _async_restore_doses(runtime)
+        return progress
+
+    hass.services.async_register(
+        DOMAIN,
+        "import_recorder_history",
+        import_recorder_history,
+        schema=IMPORT_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def export_history(call: ServiceCall) -> ServiceResponse:
+        """Export a member's history to a CSV or JSONL file."""
+        runtime = _resolve(call.data)
+
+        export_format = call.data[ATTR_FORMAT]
+        path = call.data.get(ATTR_PATH)
+        if not path:
+            # The integration's own folder needs no allowlist entry
+            path = hass.config.path(
+                DOMAIN,
+                f"{runtime.key}_{dt_util.now().strftime('%Y%m%d_%H%M%S')}"
+                f".{export_format}",
+            )
+        # is_allowed_path resolves the path on disk, so not in the event loop
+        elif not await hass.async_add_executor_job(
+            hass.config.is_allowed_path, path
+        ):
+            raise HomeAssistantError(f"Cannot write to {path}, path is not allowed")
+
+        # Copy the flat columns of the requested range in the event loop;
+        # the rows are built and written lazily on the executor
+        ring = runtime.history.ring(runtime.key)
+        start = call.data.get(ATTR_START)
+        end = call.data.get(ATTR_END)
+        lo = ring.bisect_left(dt_util.as_utc(start).timestamp()) if start else 0
+        hi = ring.bisect_right(dt_util.as_utc(end).timestamp()) if end else len(ring)
+        times, temps, meds = ring.columns()
+        measurements = map(
+            Measurement, times[lo:hi], temps[lo:hi], meds[lo:hi]
+        )
+
+        def _write() -> int:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            return write_export(
+                path,
+                export_format,
+                runtime.name,
+                measurements,
+                get_levels(hass, runtime.key),
+                runtime.medications,
+            )
+
+        rows = await hass.async_add_executor_job(_write)
+        _LOGGER.debug("Exported %s measurements of %s to %s", rows, runtime.name, path)
+        return {"path": path, "rows": rows}
+
+    hass.services.async_register(
+        DOMAIN,
+        "export_history",
+        export_history,
+        schema=EXPORT_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def get_history(call: ServiceCall) -> ServiceResponse:
+        """Return one page of a member's readings within a time range."""
+        runtime = _resolve(call.data)
+        start = call.data.get(ATTR_START)
+        end = call.data.get(ATTR_END)
+        try:
+            return query_page(
+                runtime,
+                dt_util.as_utc(start).timestamp() if start else None,
+                dt_util.as_utc(end).timestamp() if end else None,
+                call.data.get(ATTR_CURSOR),
+                call.data[ATTR_LIMIT],
+            )
+        except ValueError as err:
+            raise HomeAssistantError(str(err)) from err
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_history",
+        get_history,
+        schema=HISTORY_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
     async def get_medications(call: ServiceCall) -> None:
         """Get all configured medications."""
-        user_medications = hass.data[DOMAIN].get(CONF_MEDICATIONS, {})
-        all_medications = get_combined_medications(user_medications)
-        
+        # Libraries are kept per entry; the library entity lists them all
+        all_medications = {}
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            entry_data = hass.data[DOMAIN].get(entry.entry_id)
+            if entry_data is not None:
+                all_medications.update(entry_data["medications"].medications)
+
         # Create a persistent entity
         entity_id = f"{DOMAIN}.medication_library"
         
@@ -130,9 +683,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             }
         )
 
-    # Register with schema
-    GET_MEDICATIONS_SCHEMA = vol.Schema({})
-
     hass.services.async_register(
         DOMAIN,
         "get_medications",
@@ -140,58 +690,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         schema=GET_MEDICATIONS_SCHEMA,
     )
 
-    # Create a hub device first
-    device_registry = dr.async_get(hass)
-    device_registry.async_get_or_create(
-        config_entry_id=entry.entry_id,
-        identifiers={(DOMAIN, entry.entry_id)},
-        name="Family Health Tracker",
-        manufacturer="Family Health Tracker",
-        model="Hub",
-        sw_version=VERSION,
-    )
-
-    # Register devices for each family member
-    members = [m.strip() for m in entry.data[CONF_MEMBERS].split(",")]
-    
-    for member in members:
-        device_registry.async_get_or_create(
-            config_entry_id=entry.entry_id,
-            identifiers={(DOMAIN, f"{entry.entry_id}_{member.lower()}")},
-            name=f"{member}",
-            manufacturer="Family Health Tracker",
-            model="Health Monitor",
-            sw_version=VERSION,
-            via_device=(DOMAIN, entry.entry_id),
-            entry_type="service",  # This is important for showing the configuration section
-        )
-
-    _LOGGER.debug("Starting platform setup for: %s", PLATFORMS)
-
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
-    return True
-
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.debug("Unloading entry %s", entry.entry_id)
 
-    # Remove the service when the last config entry is unloaded
-    if len(hass.data[DOMAIN]) == 1:
-        hass.services.async_remove(DOMAIN, "add_measurement")
-
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        # Clean up devices
-        device_registry = dr.async_get(hass)
-        devices = dr.async_entries_for_config_entry(
-            device_registry, entry.entry_id
-        )
-        for device in devices:
-            device_registry.async_remove_device(device.id)
+        await hass.data[DOMAIN][entry.entry_id]["history"].async_close()
+        await hass.data[DOMAIN][entry.entry_id]["snapshot"].async_save()
 
         hass.data[DOMAIN].pop(entry.entry_id)
         _LOGGER.debug("Successfully unloaded entry %s", entry.entry_id)
 
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data when a config entry is deleted."""
+    await HistoryStore(hass, entry.entry_id).async_remove()
+    await StateSnapshot(hass, entry.entry_id).async_remove()
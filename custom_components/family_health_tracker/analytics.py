@@ -0,0 +1,175 @@
+"""Columnar measurement analytics for Family Health Tracker."""
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+import numpy as np
+
+from .levels import TemperatureLevels
+
+# A reading is assumed to hold until the next one, but never longer than this
+MAX_HOLD_SECONDS = 12 * 3600
+
+
+class MemberSeries:
+    """A member's history as contiguous NumPy columns, oldest first."""
+
+    __slots__ = ("times", "temperatures", "codes", "medication_ids", "none_code")
+
+    def __init__(
+        self,
+        times: Sequence[float],
+        temperatures: Sequence[float | None],
+        medications: Sequence[str],
+    ) -> None:
+        """Build the columns from plain sequences."""
+        self.times = np.asarray(times, dtype=np.float64)
+        self.temperatures = np.array(temperatures, dtype=np.float64)
+        medication_ids, codes = np.unique(
+            np.asarray(medications, dtype=object), return_inverse=True
+        )
+        self.medication_ids: list[str] = [str(med_id) for med_id in medication_ids]
+        self.codes = codes.astype(np.int32)
+        self.none_code = (
+            self.medication_ids.index("none") if "none" in self.medication_ids else -1
+        )
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def window(self, start: float | None, end: float | None) -> MemberSeries:
+        """Return the readings taken within [start, end]."""
+        lo = 0 if start is None else int(np.searchsorted(self.times, start, "left"))
+        hi = len(self.times) if end is None else int(np.searchsorted(self.times, end, "right"))
+        series = object.__new__(MemberSeries)
+        series.times = self.times[lo:hi]
+        series.temperatures = self.temperatures[lo:hi]
+        series.codes = self.codes[lo:hi]
+        series.medication_ids = self.medication_ids
+        series.none_code = self.none_code
+        return series
+
+    def hold_durations(self, end: float) -> np.ndarray:
+        """Return how long each reading held, in seconds, capped at MAX_HOLD_SECONDS."""
+        if not len(self.times):
+            return np.empty(0)
+        next_times = np.append(self.times[1:], max(end, self.times[-1]))
+        return np.minimum(next_times - self.times, MAX_HOLD_SECONDS)
+
+
+def time_weighted_average(series: MemberSeries, end: float) -> float | None:
+    """Return the average temperature weighted by how long each reading held."""
+    valid = ~np.isnan(series.temperatures)
+    weights = series.hold_durations(end)[valid]
+    if not weights.size:
+        return None
+    if not weights.sum():
+        return float(series.temperatures[valid].mean())
+    return float(np.average(series.temperatures[valid], weights=weights))
+
+
+def time_in_levels(
+    series: MemberSeries, levels: TemperatureLevels, end: float
+) -> dict[str, float]:
+    """Return the hours spent in each temperature level."""
+    names = ["unknown", *levels.levels, "unknown"]
+    indices = levels.classify_indices(series.temperatures)
+    seconds = np.bincount(
+        indices, weights=series.hold_durations(end), minlength=len(names)
+    )
+    hours = {name: 0.0 for name in levels.levels}
+    hours["unknown"] = float(seconds[0] + seconds[-1]) / 3600
+    for index, name in enumerate(levels.levels, start=1):
+        hours[name] = float(seconds[index]) / 3600
+    return hours
+
+
+def fever_curve(series: MemberSeries, bin_seconds: float) -> list[dict[str, Any]]:
+    """Return mean and max temperature per time bin, skipping empty bins."""
+    valid = ~np.isnan(series.temperatures)
+    times = series.times[valid]
+    temps = series.temperatures[valid]
+    if not times.size:
+        return []
+    origin = times[0] - times[0] % bin_seconds
+    bins = ((times - origin) // bin_seconds).astype(np.int64)
+    counts = np.bincount(bins)
+    sums = np.bincount(bins, weights=temps)
+    maxima = np.full(counts.size, -np.inf)
+    np.maximum.at(maxima, bins, temps)
+    occupied = np.flatnonzero(counts)
+    return [
+        {
+            "start": float(origin + index * bin_seconds),
+            "mean": round(float(sums[index] / counts[index]), 2),
+            "max": float(maxima[index]),
+            "readings": int(counts[index]),
+        }
+        for index in occupied
+    ]
+
+
+def dose_responses(
+    series: MemberSeries, response_seconds: float
+) -> list[dict[str, Any]]:
+    """Return the temperature response within response_seconds of each dose."""
+    dose_index = np.flatnonzero(series.codes != series.none_code)
+    if not dose_index.size:
+        return []
+    times = series.times
+    temps = np.where(np.isnan(series.temperatures), np.inf, series.temperatures)
+    window_end = np.searchsorted(times, times[dose_index] + response_seconds, "right")
+
+    # Minimum of each dose's window [dose, window_end) in one reduceat pass;
+    # reduceat needs strictly usable bounds, so pad with a sentinel
+    padded = np.append(temps, np.inf)
+    bounds = np.column_stack((dose_index, window_end)).ravel()
+    minima = np.minimum.reduceat(padded, bounds)[::2]
+
+    responses = []
+    for position, index in enumerate(dose_index):
+        start_temp = series.temperatures[index]
+        lowest = minima[position]
+        after = slice(index, window_end[position])
+        lowest_at = index + int(np.argmin(temps[after])) if np.isfinite(lowest) else None
+        responses.append(
+            {
+                "given_at": float(times[index]),
+                "medication": series.medication_ids[series.codes[index]],
+                "temperature": None if np.isnan(start_temp) else float(start_temp),
+                "lowest": float(lowest) if np.isfinite(lowest) else None,
+                "drop": (
+                    round(float(start_temp - lowest), 2)
+                    if np.isfinite(lowest) and not np.isnan(start_temp)
+                    else None
+                ),
+                "hours_to_lowest": (
+                    round(float(times[lowest_at] - times[index]) / 3600, 2)
+                    if lowest_at is not None
+                    else None
+                ),
+            }
+        )
+    return responses
+
+
+def summarize(
+    series: MemberSeries,
+    levels: TemperatureLevels,
+    start: float | None,
+    end: float,
+    bin_seconds: float,
+    response_seconds: float,
+) -> dict[str, Any]:
+    """Return the full analytics summary of a member between start and end."""
+    window = series.window(start, end)
+    valid = window.temperatures[~np.isnan(window.temperatures)]
+    return {
+        "readings": len(window),
+        "min": float(valid.min()) if valid.size else None,
+        "max": float(valid.max()) if valid.size else None,
+        "time_weighted_average": time_weighted_average(window, end),
+        "hours_in_levels": time_in_levels(window, levels, end),
+        "fever_curve": fever_curve(window, bin_seconds),
+        "dose_responses": dose_responses(window, response_seconds),
+    }
@@ -0,0 +1,239 @@
+"""Streaming import of past measurements from the recorder database."""
+from __future__ import annotations
+
+import heapq
+import logging
+from collections.abc import Iterator
+from typing import Any
+
+from sqlalchemy import Row, select
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.db_schema import (
+    StateAttributes,
+    States,
+    StatesMeta,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .const import BACKFILL_CHUNK_SIZE, BACKFILL_PAIR_SECONDS, EVENT_IMPORT_PROGRESS
+from .history import HistoryStore, Measurement
+from .runtime import MemberRuntime
+
+_LOGGER = logging.getLogger(__name__)
+
+_SKIP_STATES = {STATE_UNKNOWN, STATE_UNAVAILABLE, None, ""}
+
+
+def _measured_at(row: Row) -> float | None:
+    """Return when the measurement behind a state row was taken.
+
+    The sensors carry the measurement time in their last_updated attribute.
+    A state restored after a restart or reload is written again with the
+    same attribute, so its row maps to the same measurement instead of to
+    the time it was written. Rows without the attribute fall back to when
+    the state last changed.
+    """
+    if row.shared_attrs:
+        try:
+            measured = json_loads(row.shared_attrs).get("last_updated")
+        except ValueError:
+            measured = None
+        if isinstance(measured, str) and (
+            parsed := dt_util.parse_datetime(measured)
+        ) is not None:
+            return parsed.timestamp()
+    # last_changed_ts is only stored when it differs from last_updated_ts
+    return row.last_changed_ts or row.last_updated_ts
+
+
+class _StateStream:
+    """Keyset-paginated stream of one entity's measurements, oldest first.
+
+    Rows repeating the value and measurement time of the row before them
+    are rewrites of the same measurement and are skipped.
+    """
+
+    def __init__(self, hass: HomeAssistant, metadata_id: int | None, chunk_size: int) -> None:
+        self._hass = hass
+        self._metadata_id = metadata_id
+        self._chunk_size = chunk_size
+        self._last_state_id = 0
+        self._previous: tuple[float, str] | None = None
+        self.rows_read = 0
+
+    def __iter__(self) -> Iterator[tuple[float, str]]:
+        if self._metadata_id is None:
+            return
+        while True:
+            with session_scope(hass=self._hass, read_only=True) as session:
+                rows = session.execute(
+                    select(
+                        States.state_id,
+                        States.last_updated_ts,
+                        States.last_changed_ts,
+                        States.state,
+                        StateAttributes.shared_attrs,
+                    )
+                    .outerjoin(
+                        StateAttributes,
+                        States.attributes_id == StateAttributes.attributes_id,
+                    )
+                    .where(
+                        States.metadata_id == self._metadata_id,
+                        States.state_id > self._last_state_id,
+                    )
+                    .order_by(States.state_id)
+                    .limit(self._chunk_size)
+                ).all()
+            if not rows:
+                return
+            self._last_state_id = rows[-1].state_id
+            self.rows_read += len(rows)
+            for row in rows:
+                if row.state in _SKIP_STATES:
+                    continue
+                timestamp = _measured_at(row)
+                if timestamp is None or (timestamp, row.state) == self._previous:
+                    continue
+                self._previous = (timestamp, row.state)
+                yield timestamp, row.state
+
+
+class RecorderImporter:
+    """Convert a member's recorder rows into measurements in bounded chunks.
+
+    Temperature and medication rows are read through two keyset-paginated
+    streams and merged by time. A medication row within
+    BACKFILL_PAIR_SECONDS of a temperature row belongs to the same
+    measurement. Only one page per stream and one output chunk are held in
+    memory at a time, whatever the size of the database.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        runtime: MemberRuntime,
+        chunk_size: int = BACKFILL_CHUNK_SIZE,
+    ) -> None:
+        """Initialize the importer."""
+        self._hass = hass
+        self._runtime = runtime
+        self._chunk_size = chunk_size
+        self._merged: Iterator[Measurement] | None = None
+        self._streams: list[_StateStream] = []
+
+    @property
+    def rows_read(self) -> int:
+        """Return the number of recorder rows read so far."""
+        return sum(stream.rows_read for stream in self._streams)
+
+    def _open(self) -> None:
+        """Resolve the entities and open the merged stream (executor)."""
+        key = self._runtime.key
+        temp_entity_id = f"sensor.temperature_{key}"
+        med_entity_id = f"sensor.medication_{key}"
+        with session_scope(hass=self._hass, read_only=True) as session:
+            metadata_ids = dict(
+                session.execute(
+                    select(StatesMeta.entity_id, StatesMeta.metadata_id).where(
+                        StatesMeta.entity_id.in_((temp_entity_id, med_entity_id))
+                    )
+                ).all()
+            )
+        temperatures = _StateStream(
+            self._hass, metadata_ids.get(temp_entity_id), self._chunk_size
+        )
+        medications = _StateStream(
+            self._hass, metadata_ids.get(med_entity_id), self._chunk_size
+        )
+        self._streams = [temperatures, medications]
+        self._merged = _pair(
+            heapq.merge(
+                ((ts, 0, state) for ts, state in temperatures),
+                ((ts, 1, state) for ts, state in medications),
+            )
+        )
+
+    def fetch_chunk(self) -> list[Measurement]:
+        """Return the next chunk of measurements; empty when done (executor)."""
+        if self._merged is None:
+            self._open()
+        chunk = []
+        for measurement in self._merged:
+            chunk.append(measurement)
+            if len(chunk) >= self._chunk_size:
+                break
+        return chunk
+
+
+def _pair(rows: Iterator[tuple[float, int, str]]) -> Iterator[Measurement]:
+    """Pair temperature rows (kind 0) with nearby medication rows (kind 1)."""
+    pending: tuple[float, float] | None = None
+    for timestamp, kind, state in rows:
+        if kind == 0:
+            try:
+                temperature = float(state)
+            except ValueError:
+                continue
+            if pending is not None:
+                yield Measurement(pending[0], pending[1], "none")
+            pending = (timestamp, temperature)
+            continue
+
+        if pending is not None and timestamp - pending[0] <= BACKFILL_PAIR_SECONDS:
+            yield Measurement(pending[0], pending[1], state)
+        else:
+            if pending is not None:
+                yield Measurement(pending[0], pending[1], "none")
+            if state != "none":
+                yield Measurement(timestamp, None, state)
+        pending = None
+    if pending is not None:
+        yield Measurement(pending[0], pending[1], "none")
+
+
+def _is_duplicate(history: HistoryStore, member_key: str, item: Measurement) -> bool:
+    """Return True if the history already holds this measurement."""
+    ring = history.ring(member_key)
+    index = ring.bisect_left(item.timestamp - BACKFILL_PAIR_SECONDS)
+    while index < len(ring):
+        existing = ring[index]
+        if existing.timestamp > item.timestamp + BACKFILL_PAIR_SECONDS:
+            return False
+        if (
+            existing.temperature == item.temperature
+            and existing.medication == item.medication
+        ):
+            return True
+        index += 1
+    return False
+
+
+async def async_import_member(
+    hass: HomeAssistant, runtime: MemberRuntime, progress: dict[str, Any]
+) -> None:
+    """Stream a member's recorder rows into its measurement history."""
+    importer = RecorderImporter(hass, runtime)
+    recorder = get_instance(hass)
+    history = runtime.history
+    rows_before = progress["rows_read"]
+    while chunk := await recorder.async_add_executor_job(importer.fetch_chunk):
+        for item in chunk:
+            # Duplicates, and rows older than a full ring, are not kept
+            if _is_duplicate(history, runtime.key, item) or not history.async_record(
+                runtime.key, *item
+            ):
+                progress["skipped"] += 1
+                continue
+            progress["imported"] += 1
+        progress["rows_read"] = rows_before + importer.rows_read
+        hass.bus.async_fire(
+            EVENT_IMPORT_PROGRESS,
+            {**progress, "entry_id": runtime.entry_id, "member": runtime.name},
+        )
+        _LOGGER.debug("Import progress for %s: %s", runtime.name, progress)
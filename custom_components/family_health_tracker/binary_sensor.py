@@ -0,0 +1,92 @@
+"""Binary sensor platform for Family Health Tracker."""
+import logging
+from collections.abc import Iterable
+from typing import Any, Dict
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    SIGNAL_MEMBERS_ADDED,
+)
+from .runtime import MemberRuntime
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Family Health Tracker binary sensors."""
+    @callback
+    def _async_add_members(runtimes: Iterable[MemberRuntime]) -> None:
+        entities = []
+        for runtime in runtimes:
+            dose_sensor = DoseDueSensor(hass, runtime, runtime.device_info)
+            runtime.dose_sensor = dose_sensor
+            entities.append(dose_sensor)
+        async_add_entities(entities)
+
+    _async_add_members(hass.data[DOMAIN][config_entry.entry_id]["members"].values())
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_MEMBERS_ADDED.format(config_entry.entry_id),
+            _async_add_members,
+        )
+    )
+
+class DoseDueSensor(BinarySensorEntity):
+    """On while the next dose of a medication is allowed for a family member."""
+
+    def __init__(self, hass: HomeAssistant, member: MemberRuntime, device_info: DeviceInfo) -> None:
+        """Initialize the binary sensor."""
+        self._hass = hass
+        self._member = member
+        self._name = name = member.name
+        self._entry_id = member.entry_id
+        self._attr_device_info = device_info
+        self._attr_unique_id = f"{self._entry_id}_{name.lower()}_dose_due"
+        self.entity_id = f"binary_sensor.dose_due_{name.lower()}"
+        self._attr_name = f"{name} Dose Due"
+        self._attr_icon = "mdi:pill-multiple"
+        self._attr_translation_key = "dose_due"
+        self._attr_should_poll = False
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if any medication's next dose is due."""
+        return bool(self._member.doses.due(self._entry_id, self._member.key))
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the state attributes."""
+        next_due = self._member.doses.next_deadline(self._entry_id, self._member.key)
+        return {
+            "due_medications": sorted(
+                self._member.doses.due(self._entry_id, self._member.key)
+            ),
+            "next_dose_due": (
+                dt_util.utc_from_timestamp(next_due).isoformat() if next_due else None
+            ),
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the dose scheduler for this member."""
+        self.async_on_remove(
+            self._member.doses.async_add_listener(
+                self._entry_id, self._member.key, self._handle_dose_update
+            )
+        )
+
+    @callback
+    def _handle_dose_update(self) -> None:
+        """Write the state after the member's due set changed."""
+        self.async_write_ha_state()
@@ -1,23 +1,27 @@
 """Button platform for Family Health Tracker."""
 import logging
+from collections.abc import Iterable
+import time
 from typing import Any
 
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.const import CONF_NAME
 
 from .const import (
     DOMAIN,
-    CONF_MEMBERS,
+    SIGNAL_MEMBERS_ADDED,
     ATTR_TEMPERATURE,
     ATTR_MEDICATION,
-    VERSION,
     CONF_MEDICATIONS,
     get_medication_values,
+    PRESS_DEBOUNCE_SECONDS,
 )
+from .runtime import MemberRuntime
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,91 +31,102 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Family Health Tracker buttons."""
-    members = [member.strip() for member in config_entry.data[CONF_MEMBERS].split(",")]
-
-    entities = []
-    for member in members:
-        member_lower = member.lower()
-        device_id = f"{config_entry.entry_id}_{member_lower}"
-        
-        device_info = DeviceInfo(
-            identifiers={(DOMAIN, device_id)},
-            name=member,
-            manufacturer="Family Health Tracker",
-            model="Health Monitor",
-            sw_version=VERSION,
-            via_device=(DOMAIN, config_entry.entry_id),
+    @callback
+    def _async_add_members(runtimes: Iterable[MemberRuntime]) -> None:
+        entities = []
+        for runtime in runtimes:
+            record_button = RecordMeasurementButton(hass, runtime, runtime.device_info)
+            runtime.button = record_button
+            entities.append(record_button)
+        async_add_entities(entities)
+
+    _async_add_members(hass.data[DOMAIN][config_entry.entry_id]["members"].values())
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_MEMBERS_ADDED.format(config_entry.entry_id),
+            _async_add_members,
         )
-
-        record_button = RecordMeasurementButton(hass, member, device_info, config_entry.entry_id)
-        entities.append(record_button)
-
-    async_add_entities(entities, True)
+    )
 
 class RecordMeasurementButton(ButtonEntity):
     """Button to record measurements."""
 
-    def __init__(self, hass: HomeAssistant, name: str, device_info: DeviceInfo, entry_id: str) -> None:
+    def __init__(self, hass: HomeAssistant, member: MemberRuntime, device_info: DeviceInfo) -> None:
         """Initialize the button."""
         self._hass = hass
-        self._name = name
-        self._entry_id = entry_id
+        self._member = member
+        self._name = name = member.name
+        self._entry_id = member.entry_id
         self._attr_device_info = device_info
         self._attr_unique_id = f"{self._entry_id}_{name.lower()}_record_button"
         self.entity_id = f"button.record_measurement_{name.lower()}"
         self._attr_name = f"Add Record for {name}"
         self._attr_icon = "mdi:content-save-plus"
         self._attr_translation_key = "record_button"
+        self._last_press: float | None = None
+        self._last_latency_ms: float | None = None
+        self._debounced_presses = 0
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return {
+            "last_record_latency_ms": self._last_latency_ms,
+            "debounced_presses": self._debounced_presses,
+        }
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        # Get all entities to help debug
-        all_entities = self._hass.states.async_all()
-        entity_ids = [entity.entity_id for entity in all_entities]
-        _LOGGER.debug("All available entities: %s", entity_ids)
-
-        # Get input states
-        temp_input_entity_id = f"number.temperature_{self._name.lower()}"
-        med_input_entity_id = f"select.medication_{self._name.lower()}"
-
-        _LOGGER.debug("Looking for temperature entity: %s", temp_input_entity_id)
-        _LOGGER.debug("Looking for medication entity: %s", med_input_entity_id)
+        started = time.perf_counter()
+
+        # Collapse rapid double presses into a single measurement
+        now = time.monotonic()
+        if (
+            self._last_press is not None
+            and now - self._last_press < PRESS_DEBOUNCE_SECONDS
+        ):
+            self._debounced_presses += 1
+            self._member.metrics.increment("debounced_presses")
+            _LOGGER.debug("Ignoring repeated press for %s", self._name)
+            # The press state was written before async_press was called
+            self.async_write_ha_state()
+            return
 
-        temp_state = self._hass.states.get(temp_input_entity_id)
-        med_state = self._hass.states.get(med_input_entity_id)
+        # Read the paired inputs directly
+        temp_input = self._member.temperature_input
+        med_input = self._member.medication_input
+        temperature = temp_input.native_value if temp_input else None
+        medication = med_input.current_option if med_input else None
 
-        if temp_state is None or med_state is None:
+        if temperature is None or medication is None:
             _LOGGER.warning(
-                "Missing input states for %s. Temperature: %s, Medication: %s",
+                "Missing input values for %s. Temperature: %s, Medication: %s",
                 self._name,
-                temp_state,
-                med_state
+                temperature,
+                medication
             )
             return
 
         try:
-            # Get the sensor entities from the registry
-            name_lower = self._name.lower()
-            temp_sensor_id = f"sensor.temperature_{name_lower}"
-            med_sensor_id = f"sensor.medication_{name_lower}"
-
-            temp_sensor = self._hass.data[DOMAIN][self._entry_id].get(temp_sensor_id)
-            med_sensor = self._hass.data[DOMAIN][self._entry_id].get(med_sensor_id)
-
-            if temp_sensor is None or med_sensor is None:
-                _LOGGER.error("Could not find sensor entities in registry")
+            if not self._member.sensors_ready:
+                _LOGGER.error("Could not find sensor entities for %s", self._name)
                 return
 
-            # Get the values from the input entities
-            temperature = float(temp_state.state)
-            medication = med_state.state
-
             # Update the sensor entities directly
-            await temp_sensor.update_temperature(temperature)
-            await med_sensor.update_medication(medication)
-
-            _LOGGER.debug("Successfully recorded measurement - Temperature: %s, Medication: %s", 
-                         temperature, medication)
+            await self._member.async_record(float(temperature), medication)
+            # Only a recorded measurement starts the debounce window
+            self._last_press = now
+
+            self._last_latency_ms = round((time.perf_counter() - started) * 1000, 3)
+            self._member.metrics.observe("button_press", self._last_latency_ms)
+            _LOGGER.debug(
+                "Successfully recorded measurement - Temperature: %s, Medication: %s (%s ms)",
+                temperature,
+                medication,
+                self._last_latency_ms,
+            )
+            self.async_write_ha_state()
 
         except Exception as e:
-            _LOGGER.error("Failed to record measurement: %s", e) 
\ No newline at end of file
+            _LOGGER.error("Failed to record measurement: %s", e)
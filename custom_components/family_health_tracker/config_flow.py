@@ -12,7 +12,11 @@ from .const import (
     DOMAIN,
     CONF_MEMBERS,
     CONF_MEDICATIONS,
+    CONF_COMPACT_ATTRIBUTES,
+    CONF_INSTRUMENTATION,
+    CONF_STATISTICS_WINDOWS,
     DEFAULT_MEDICATIONS,
+    DEFAULT_STATISTICS_WINDOWS,
     ATTR_DOSAGE,
     ATTR_INTERVAL,
     ATTR_CATEGORY,
@@ -20,6 +24,22 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+def parse_statistics_windows(value: str) -> list[int]:
+    """Parse a comma-separated list of window lengths in whole hours.
+
+    The hours become part of the statistics sensors' entity and unique IDs,
+    so only positive integers are accepted.
+    """
+    windows = set()
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdigit() or int(part) <= 0:
+            raise vol.Invalid(f"Invalid statistics window: {part}")
+        windows.add(int(part))
+    return sorted(windows)
+
 class FamilyHealthTrackerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Family Health Tracker."""
 
@@ -53,18 +73,16 @@ class FamilyHealthTrackerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Get the options flow for this handler."""
         return OptionsFlowHandler(config_entry)
 
-class OptionsFlowHandler(config_entries.OptionsFlow):
+class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
     """Handle options flow for Family Health Tracker."""
 
-    def __init__(self, entry: config_entries.ConfigEntry) -> None:
-        """Initialize options flow."""
-        super().__init__(entry)
-
     async def async_step_init(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
         """Manage the options."""
         if user_input is not None:
             if user_input["step"] == "members":
                 return await self.async_step_members()
+            elif user_input["step"] == "settings":
+                return await self.async_step_settings()
             else:
                 return await self.async_step_medication()
 
@@ -73,7 +91,8 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             data_schema=vol.Schema({
                 vol.Required("step", default="members"): vol.In({
                     "members": "Manage Family Members",
-                    "medication": "Add Medication"
+                    "medication": "Add Medication",
+                    "settings": "Settings"
                 })
             })
         )
@@ -81,19 +100,67 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_members(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
         """Handle family members step."""
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            return self.async_create_entry(
+                title="",
+                data={**self.config_entry.options, **user_input}
+            )
 
         return self.async_show_form(
             step_id="members",
             data_schema=vol.Schema({
-                vol.Required(CONF_MEMBERS, default=self.entry.data[CONF_MEMBERS]): str,
+                vol.Required(
+                    CONF_MEMBERS,
+                    default=self.config_entry.options.get(CONF_MEMBERS, self.config_entry.data[CONF_MEMBERS]),
+                ): str,
             }),
         )
 
+    async def async_step_settings(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
+        """Handle general settings."""
+        errors = {}
+
+        if user_input is not None:
+            try:
+                # An emptied field is left out of the input
+                user_input[CONF_STATISTICS_WINDOWS] = parse_statistics_windows(
+                    user_input.get(CONF_STATISTICS_WINDOWS, "")
+                )
+            except vol.Invalid:
+                errors[CONF_STATISTICS_WINDOWS] = "invalid_statistics_windows"
+            else:
+                return self.async_create_entry(
+                    title="",
+                    data={**self.config_entry.options, **user_input}
+                )
+
+        windows = self.config_entry.options.get(
+            CONF_STATISTICS_WINDOWS, DEFAULT_STATISTICS_WINDOWS
+        )
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_COMPACT_ATTRIBUTES,
+                    default=self.config_entry.options.get(CONF_COMPACT_ATTRIBUTES, False),
+                ): bool,
+                vol.Required(
+                    CONF_INSTRUMENTATION,
+                    default=self.config_entry.options.get(CONF_INSTRUMENTATION, False),
+                ): bool,
+                vol.Optional(
+                    CONF_STATISTICS_WINDOWS,
+                    description={
+                        "suggested_value": ", ".join(str(hours) for hours in windows)
+                    },
+                ): str,
+            }),
+            errors=errors,
+        )
+
     async def async_step_medication(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
         """Handle medication configuration."""
         if user_input is not None:
-            medications = self.entry.options.get(CONF_MEDICATIONS, {})
+            medications = dict(self.config_entry.options.get(CONF_MEDICATIONS, {}))
             med_id = user_input.pop("id").lower().replace(" ", "_")
             medications[med_id] = {
                 "name": user_input["name"],
@@ -103,13 +170,20 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 "category": user_input.get("category", "other")
             }
             
-            # Update hass.data and fire event
-            self.hass.data[DOMAIN][CONF_MEDICATIONS] = medications
-            self.hass.bus.async_fire(f"{DOMAIN}_medications_updated")
+            # Rebuild this entry's medication index and fire event
+            entry_data = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+            if entry_data is not None:
+                metrics = entry_data["metrics"]
+                started = metrics.start()
+                entry_data["medications"].rebuild(medications)
+                metrics.record("medication_rebuild", started)
+            self.hass.bus.async_fire(
+                f"{DOMAIN}_medications_updated", {"entry_id": self.config_entry.entry_id}
+            )
             
             return self.async_create_entry(
                 title="",
-                data={CONF_MEDICATIONS: medications}
+                data={**self.config_entry.options, CONF_MEDICATIONS: medications}
             )
 
         return self.async_show_form(
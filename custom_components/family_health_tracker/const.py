@@ -1,10 +1,14 @@
 """Constants for the Family Health Tracker integration."""
+from datetime import timedelta
 
 DOMAIN = "family_health_tracker"
 VERSION = "0.4.2"
 
 CONF_MEMBERS = "members"
 CONF_MEDICATIONS = "medications"
+CONF_STATISTICS_WINDOWS = "statistics_windows"
+CONF_COMPACT_ATTRIBUTES = "compact_attributes"
+CONF_INSTRUMENTATION = "instrumentation"
 
 # Default medication library (only 'none' option)
 DEFAULT_MEDICATIONS = {
@@ -39,15 +43,71 @@ TEMP_LEVELS = {
 # Default config
 DEFAULT_TEMP_LEVELS = TEMP_LEVELS.copy()
 
+# Rolling temperature statistics
+DEFAULT_STATISTICS_WINDOWS = (6, 24, 72)  # hours
+FEVER_THRESHOLD = 38.0  # °C
+
 # Attributes
 ATTR_TEMPERATURE = "temperature"
 ATTR_MEDICATION = "medication"
 ATTR_DOSAGE = "dosage"
 ATTR_INTERVAL = "interval_hours"
 ATTR_CATEGORY = "category"
+ATTR_MEASUREMENTS = "measurements"
+ATTR_MEASURED_AT = "measured_at"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_BIN_MINUTES = "bin_minutes"
+ATTR_RESPONSE_HOURS = "response_hours"
+ATTR_FORMAT = "format"
+ATTR_PATH = "path"
+ATTR_CURSOR = "cursor"
+ATTR_LIMIT = "limit"
+ATTR_IDEMPOTENCY_KEY = "idempotency_key"
+ATTR_LEVEL = "level"
 
 DEFAULT_NAME = "Health Tracker"
 
+# Time-since-medication sensors display 0.1 h, so their value changes
+# every 6 minutes; statistics sensors refresh on this interval too
+DURATION_REFRESH_SECONDS = 360
+
+# Presses of the record button closer together than this are merged
+PRESS_DEBOUNCE_SECONDS = 1.0
+
+# Duplicate measurement detection
+IDEMPOTENCY_CACHE_SIZE = 4096  # keys kept across all members
+IDEMPOTENCY_TTL = 600  # seconds a key or timestamped reading is remembered
+
+# Dispatcher signal with the runtimes of members added to an entry
+SIGNAL_MEMBERS_ADDED = f"{DOMAIN}_members_added_{{}}"
+# Dispatcher signal with the measurements and due doses of one device
+SIGNAL_DEVICE_TRIGGER = f"{DOMAIN}_device_trigger_{{}}"
+
+# Events
+EVENT_DOSE_DUE = f"{DOMAIN}_dose_due"
+EVENT_IMPORT_PROGRESS = f"{DOMAIN}_import_progress"
+EVENT_MEASUREMENT = f"{DOMAIN}_measurement"
+
+# Measurement history
+HISTORY_STORAGE_VERSION = 1
+HISTORY_STORAGE_KEY = f"{DOMAIN}.history"
+HISTORY_MAX_ENTRIES = 5000  # per family member
+HISTORY_SAVE_DELAY = 10  # seconds before the journal is flushed
+HISTORY_COMPACT_RECORDS = 1000  # journal records that trigger a snapshot
+HISTORY_COMPACT_INTERVAL = timedelta(hours=1)
+HISTORY_PAGE_SIZE = 100  # readings per page of a history query
+HISTORY_MAX_PAGE_SIZE = 1000
+
+# Last known member state
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.state"
+SNAPSHOT_SAVE_DELAY = 5  # seconds
+
+# Recorder backfill
+BACKFILL_CHUNK_SIZE = 1000  # rows per page and measurements per chunk
+BACKFILL_PAIR_SECONDS = 5  # medication rows this close belong to a temperature
+
 # Helper functions to work with medications
 def get_medication_options(user_medications=None):
     """Get medication options in the format needed for select entity."""
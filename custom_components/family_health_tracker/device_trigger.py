@@ -1,29 +1,65 @@
 """Provides device triggers for Family Health Tracker."""
 from __future__ import annotations
 
+from typing import Any
+
 import voluptuous as vol
 
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
 from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
-from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, ATTR_TEMPERATURE, ATTR_MEDICATION, MEDICATION_OPTIONS, MEDICATION_VALUES
+from .const import (
+    ATTR_INTERVAL,
+    ATTR_LEVEL,
+    ATTR_MEDICATION,
+    DOMAIN,
+    SIGNAL_DEVICE_TRIGGER,
+)
+from .levels import get_levels
+from .medications import MedicationIndex
+from .runtime import MemberRuntime, async_get_member_directory
+
+TRIGGER_MEASUREMENT_RECORDED = "measurement_recorded"
+TRIGGER_LEVEL_ENTERED = "level_entered"
+TRIGGER_DOSE_DUE = "dose_due"
+
+TRIGGER_TYPES = {TRIGGER_MEASUREMENT_RECORDED, TRIGGER_LEVEL_ENTERED, TRIGGER_DOSE_DUE}
+
+
+def _require_level(config: ConfigType) -> ConfigType:
+    """Check that a level trigger names its level."""
+    if config[CONF_TYPE] == TRIGGER_LEVEL_ENTERED and ATTR_LEVEL not in config:
+        raise vol.Invalid(f"{ATTR_LEVEL} is required for {TRIGGER_LEVEL_ENTERED}")
+    return config
 
-TRIGGER_TYPES = {"record_measurement"}
 
-TRIGGER_SCHEMA = vol.Schema(
-    {
-        vol.Required(CONF_PLATFORM): "device",
-        vol.Required(CONF_DOMAIN): DOMAIN,
-        vol.Required(CONF_DEVICE_ID): str,
-        vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
-        vol.Required(ATTR_TEMPERATURE): vol.Coerce(float),
-        vol.Required(ATTR_MEDICATION): vol.In(MEDICATION_VALUES),
-    }
+# Levels and medications are checked against the member's live library
+# by the capabilities; the stored config only needs to be well formed
+TRIGGER_SCHEMA = vol.All(
+    DEVICE_TRIGGER_BASE_SCHEMA.extend(
+        {
+            vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
+            vol.Optional(ATTR_LEVEL): cv.string,
+            vol.Optional(ATTR_MEDICATION): cv.string,
+        }
+    ),
+    _require_level,
 )
 
+
+def _get_runtime(hass: HomeAssistant, device_id: str) -> MemberRuntime | None:
+    """Return the loaded member of a device."""
+    if DOMAIN not in hass.data:
+        return None
+    return async_get_member_directory(hass).get_by_device(device_id)
+
+
 async def async_get_triggers(
     hass: HomeAssistant, device_id: str
 ) -> list[dict[str, str]]:
@@ -31,44 +67,115 @@ async def async_get_triggers(
     device_registry = dr.async_get(hass)
     device = device_registry.async_get(device_id)
 
-    if not device:
+    # Only member devices have triggers; they are attached to the hub
+    if (
+        not device
+        or device.via_device_id is None
+        or not any(x[0] == DOMAIN for x in device.identifiers)
+    ):
         return []
 
-    # Check if this is our device
-    if not any(x[0] == DOMAIN for x in device.identifiers):
-        return []
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+        }
+        for trigger_type in (
+            TRIGGER_MEASUREMENT_RECORDED,
+            TRIGGER_LEVEL_ENTERED,
+            TRIGGER_DOSE_DUE,
+        )
+    ]
+
+
+async def async_get_trigger_capabilities(
+    hass: HomeAssistant, config: ConfigType
+) -> dict[str, vol.Schema]:
+    """List the extra fields of a trigger, from the member's live library."""
+    runtime = _get_runtime(hass, config[CONF_DEVICE_ID])
+
+    if config[CONF_TYPE] == TRIGGER_LEVEL_ENTERED:
+        levels = get_levels(hass, runtime.key if runtime else None)
+        return {
+            "extra_fields": vol.Schema(
+                {vol.Required(ATTR_LEVEL): vol.In(levels.levels)}
+            )
+        }
+
+    if config[CONF_TYPE] == TRIGGER_DOSE_DUE:
+        medications = runtime.medications if runtime else MedicationIndex()
+        # Only medications with a dose interval ever become due
+        options = {
+            med_id: med_info["label"]
+            for med_id, med_info in medications.medications.items()
+            if med_info.get(ATTR_INTERVAL)
+        }
+        return {
+            "extra_fields": vol.Schema(
+                {vol.Optional(ATTR_MEDICATION): vol.In(options)}
+            )
+        }
+
+    return {}
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Attach a trigger to its device's dispatcher signal.
+
+    Measurements and due doses are sent on a signal per device, so only
+    the triggers of the affected member run.
+    """
+    device_id = config[CONF_DEVICE_ID]
+    trigger_type = config[CONF_TYPE]
+    level = config.get(ATTR_LEVEL)
+    medication = config.get(ATTR_MEDICATION)
+    trigger_data = trigger_info["trigger_data"]
+    job = HassJob(action, f"{DOMAIN} {trigger_type} trigger")
+
+    if trigger_type == TRIGGER_DOSE_DUE:
+        kind = "dose_due"
+
+        def _matches(data: dict[str, Any]) -> bool:
+            return medication is None or data["medication"] == medication
+
+    else:
+        kind = "measurement"
+
+        def _matches(data: dict[str, Any]) -> bool:
+            if trigger_type == TRIGGER_MEASUREMENT_RECORDED:
+                return True
+            return (
+                data["latest"]
+                and data["level"] == level
+                and data["previous_level"] != level
+            )
+
+    @callback
+    def _async_handle(event_kind: str, data: dict[str, Any]) -> None:
+        if event_kind != kind or not _matches(data):
+            return
+        hass.async_run_hass_job(
+            job,
+            {
+                "trigger": {
+                    **trigger_data,
+                    **data,
+                    CONF_PLATFORM: "device",
+                    CONF_DOMAIN: DOMAIN,
+                    CONF_DEVICE_ID: device_id,
+                    CONF_TYPE: trigger_type,
+                    "description": f"{DOMAIN} {trigger_type}",
+                }
+            },
+        )
 
-    triggers = []
-
-    # Add the record measurement trigger
-    triggers.append({
-        CONF_PLATFORM: "device",
-        CONF_DOMAIN: DOMAIN,
-        CONF_DEVICE_ID: device_id,
-        CONF_TYPE: "record_measurement",
-        "metadata": {
-            "secondary": False,
-            "description": "Record a new measurement",
-            "fields": [
-                {
-                    "name": ATTR_TEMPERATURE,
-                    "required": True,
-                    "type": "float",
-                    "description": "Temperature (34-43°C)",
-                },
-                {
-                    "name": ATTR_MEDICATION,
-                    "required": True,
-                    "type": "select",
-                    "options": [
-                        {"value": "none", "label": "No medication given"},
-                        {"value": "paracetamol", "label": "Paracetamol administered"},
-                        {"value": "ibuprofen", "label": "Ibuprofen administered"},
-                    ],
-                    "description": "Select medication",
-                },
-            ],
-        },
-    })
-
-    return triggers 
\ No newline at end of file
+    return async_dispatcher_connect(
+        hass, SIGNAL_DEVICE_TRIGGER.format(device_id), _async_handle
+    )
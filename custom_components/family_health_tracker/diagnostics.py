@@ -0,0 +1,31 @@
+"""Diagnostics support for Family Health Tracker."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_MEDICATIONS, CONF_MEMBERS, DOMAIN
+from .idempotency import async_get_idempotency_cache
+
+# Member names and the medication library describe the family
+TO_REDACT = {CONF_MEDICATIONS, CONF_MEMBERS}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    members = entry_data["members"]
+    history = entry_data["history"]
+    return {
+        "options": async_redact_data(entry.options, TO_REDACT),
+        "members": len(members),
+        "medications": len(entry_data["medications"]),
+        "history_sizes": [len(history.ring(key)) for key in members],
+        "metrics": entry_data["metrics"].as_dict(),
+        "idempotency": async_get_idempotency_cache(hass).as_dict(),
+    }
@@ -0,0 +1,222 @@
+"""Dose-due scheduling for Family Health Tracker."""
+from __future__ import annotations
+
+import heapq
+import logging
+from datetime import datetime
+from itertools import count
+from typing import Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, EVENT_DOSE_DUE, SIGNAL_DEVICE_TRIGGER
+from .runtime import async_get_member_directory
+
+_LOGGER = logging.getLogger(__name__)
+
+# (entry_id, member_key)
+MemberId = tuple[str, str]
+# (entry_id, member_key, medication)
+DoseKey = tuple[str, str, str]
+
+
+class DoseScheduler:
+    """Track the next allowed dose of every (member, medication) pair.
+
+    Deadlines live in a single min-heap shared by all config entries, and one
+    timer is armed for the earliest deadline. Rescheduling pushes a new heap
+    entry and invalidates the old one lazily, so recording a dose costs
+    O(log n) and nothing is ever rescanned.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._heap: list[tuple[float, int, DoseKey]] = []
+        self._sequence = count()
+        self._deadlines: dict[DoseKey, float] = {}
+        self._given: dict[MemberId, dict[str, float]] = {}
+        self._members: dict[MemberId, dict[str, float]] = {}
+        self._due: dict[MemberId, set[str]] = {}
+        self._listeners: dict[MemberId, Callable[[], None]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+        self._armed_at: float | None = None
+
+    def due(self, entry_id: str, member_key: str) -> set[str]:
+        """Return the medications whose next dose is due for a member."""
+        return self._due.get((entry_id, member_key), set())
+
+    def next_deadline(self, entry_id: str, member_key: str) -> float | None:
+        """Return the earliest pending deadline of a member."""
+        deadlines = self._members.get((entry_id, member_key))
+        return min(deadlines.values()) if deadlines else None
+
+    @callback
+    def async_add_listener(
+        self, entry_id: str, member_key: str, update_callback: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Call update_callback whenever a member's doses change."""
+        member_id = (entry_id, member_key)
+        self._listeners[member_id] = update_callback
+
+        @callback
+        def _remove() -> None:
+            self._listeners.pop(member_id, None)
+
+        return _remove
+
+    @callback
+    def async_record_dose(
+        self,
+        entry_id: str,
+        member_key: str,
+        medication: str,
+        interval_hours: float | None,
+        given_at: float,
+        notify: bool = True,
+    ) -> None:
+        """Record a dose and schedule when the next one is allowed."""
+        member_id = (entry_id, member_key)
+        key = (entry_id, member_key, medication)
+        given = self._given.setdefault(member_id, {})
+        if given_at < given.get(medication, given_at):
+            # Older than a dose we already know about
+            return
+        given[medication] = given_at
+        due = self._due.get(member_id)
+        if due is not None:
+            due.discard(medication)
+
+        if interval_hours:
+            deadline = given_at + interval_hours * 3600
+            if deadline <= dt_util.utcnow().timestamp():
+                # Already passed (backfill or restart); due without an event
+                self._forget(key)
+                self._due.setdefault(member_id, set()).add(medication)
+                if notify:
+                    self._notify(member_id)
+                return
+            self._deadlines[key] = deadline
+            self._members.setdefault(member_id, {})[medication] = deadline
+            heapq.heappush(self._heap, (deadline, next(self._sequence), key))
+            self._compact()
+            if self._armed_at is None or deadline < self._armed_at:
+                self._arm()
+
+        if notify:
+            self._notify(member_id)
+
+    def _forget(self, key: DoseKey) -> None:
+        """Drop the pending deadline of a (member, medication) pair."""
+        if self._deadlines.pop(key, None) is None:
+            return
+        member_id = key[:2]
+        member_deadlines = self._members[member_id]
+        del member_deadlines[key[2]]
+        if not member_deadlines:
+            del self._members[member_id]
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> None:
+        """Forget every deadline of a config entry."""
+        for member_id in [m for m in self._given if m[0] == entry_id]:
+            self.async_remove_member(*member_id)
+
+    @callback
+    def async_remove_member(self, entry_id: str, member_key: str) -> None:
+        """Forget every deadline of a member."""
+        member_id = (entry_id, member_key)
+        for medication in self._members.pop(member_id, ()):
+            self._deadlines.pop((*member_id, medication), None)
+        self._due.pop(member_id, None)
+        self._given.pop(member_id, None)
+        if not self._deadlines:
+            self._heap.clear()
+            self._disarm()
+
+    def _compact(self) -> None:
+        """Drop stale heap entries once they outnumber the live ones."""
+        if len(self._heap) > 2 * len(self._deadlines) + 16:
+            self._heap = [
+                item for item in self._heap if self._deadlines.get(item[2]) == item[0]
+            ]
+            heapq.heapify(self._heap)
+
+    @callback
+    def _disarm(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+        self._unsub = None
+        self._armed_at = None
+
+    @callback
+    def _arm(self) -> None:
+        """Arm the timer for the earliest live deadline."""
+        self._disarm()
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        if not heap:
+            return
+        self._armed_at = heap[0][0]
+        self._unsub = async_track_point_in_utc_time(
+            self._hass, self._fire, dt_util.utc_from_timestamp(self._armed_at)
+        )
+
+    @callback
+    def _fire(self, now: datetime) -> None:
+        """Mark every passed deadline as due."""
+        self._unsub = None
+        self._armed_at = None
+        self._process_due(now.timestamp())
+        self._arm()
+
+    @callback
+    def _process_due(self, now: float) -> None:
+        """Move every deadline at or before now into the due sets."""
+        heap = self._heap
+        changed: set[MemberId] = set()
+        directory = async_get_member_directory(self._hass)
+        while heap and heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(heap)
+            if self._deadlines.get(key) != deadline:
+                continue
+            self._forget(key)
+            entry_id, member_key, medication = key
+            member_id = (entry_id, member_key)
+            self._due.setdefault(member_id, set()).add(medication)
+            changed.add(member_id)
+            data = {
+                "entry_id": entry_id,
+                "member": member_key,
+                "medication": medication,
+                "due_since": dt_util.utc_from_timestamp(deadline).isoformat(),
+            }
+            self._hass.bus.async_fire(EVENT_DOSE_DUE, data)
+            runtime = directory.get(entry_id, member_key)
+            if runtime is not None and runtime.device_id is not None:
+                async_dispatcher_send(
+                    self._hass,
+                    SIGNAL_DEVICE_TRIGGER.format(runtime.device_id),
+                    "dose_due",
+                    data,
+                )
+        for member_id in changed:
+            self._notify(member_id)
+
+    def _notify(self, member_id: MemberId) -> None:
+        update_callback = self._listeners.get(member_id)
+        if update_callback is not None:
+            update_callback()
+
+
+@callback
+def async_get_dose_scheduler(hass: HomeAssistant) -> DoseScheduler:
+    """Return the domain-wide dose scheduler."""
+    scheduler = hass.data[DOMAIN].get("dose_scheduler")
+    if scheduler is None:
+        scheduler = hass.data[DOMAIN]["dose_scheduler"] = DoseScheduler(hass)
+    return scheduler
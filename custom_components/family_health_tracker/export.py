@@ -0,0 +1,86 @@
+"""Streaming export of measurement history."""
+from __future__ import annotations
+
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any, TextIO
+
+from homeassistant.util import dt as dt_util
+
+from .history import Measurement
+from .levels import TemperatureLevels
+from .medications import MedicationIndex
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+EXPORT_FIELDS = (
+    "member",
+    "measured_at",
+    "temperature",
+    "level",
+    "medication",
+    "medication_label",
+    "dosage",
+)
+
+
+def _enrich(
+    member: str,
+    measurements: Iterable[Measurement],
+    levels: TemperatureLevels,
+    medications: MedicationIndex,
+) -> Iterator[dict[str, Any]]:
+    """Yield export rows with the derived level and medication fields."""
+    for measurement in measurements:
+        temperature = measurement.temperature
+        med_info = medications.get(measurement.medication) or {}
+        yield {
+            "member": member,
+            "measured_at": dt_util.as_local(
+                dt_util.utc_from_timestamp(measurement.timestamp)
+            ).isoformat(),
+            "temperature": temperature,
+            "level": levels.classify(temperature) if temperature is not None else None,
+            "medication": measurement.medication,
+            "medication_label": med_info.get("label"),
+            "dosage": med_info.get("dosage"),
+        }
+
+
+def _write_csv(rows: Iterable[dict[str, Any]], file: TextIO) -> int:
+    writer = csv.DictWriter(file, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def _write_jsonl(rows: Iterable[dict[str, Any]], file: TextIO) -> int:
+    count = 0
+    for row in rows:
+        file.write(json.dumps(row, ensure_ascii=False))
+        file.write("\n")
+        count += 1
+    return count
+
+
+def write_export(
+    path: str,
+    export_format: str,
+    member: str,
+    measurements: Iterable[Measurement],
+    levels: TemperatureLevels,
+    medications: MedicationIndex,
+) -> int:
+    """Write measurements to path one row at a time; returns the row count.
+
+    Runs in the executor. Rows are generated, enriched and written lazily,
+    so memory use does not depend on the number of measurements.
+    """
+    rows = _enrich(member, measurements, levels, medications)
+    writer = _write_csv if export_format == "csv" else _write_jsonl
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        return writer(rows, file)
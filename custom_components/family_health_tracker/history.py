@@ -0,0 +1,388 @@
+"""Measurement history for Family Health Tracker."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterator, NamedTuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+
+from .const import (
+    HISTORY_COMPACT_INTERVAL,
+    HISTORY_COMPACT_RECORDS,
+    HISTORY_MAX_ENTRIES,
+    HISTORY_SAVE_DELAY,
+    HISTORY_STORAGE_KEY,
+    HISTORY_STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Measurement(NamedTuple):
+    """A single recorded measurement."""
+
+    timestamp: float
+    temperature: float | None
+    medication: str
+
+
+class _TimestampView:
+    """Read-only sequence view over the timestamps of a ring, oldest first."""
+
+    __slots__ = ("_ring",)
+
+    def __init__(self, ring: MeasurementRing) -> None:
+        self._ring = ring
+
+    def __len__(self) -> int:
+        return self._ring._size
+
+    def __getitem__(self, index: int) -> float:
+        ring = self._ring
+        return ring._times[(ring._head + index) % ring._capacity]
+
+
+class MeasurementRing:
+    """Fixed-capacity ring buffer of measurements, ordered by timestamp.
+
+    Once full, every new measurement overwrites the oldest one, so memory
+    stays bounded no matter how long the integration runs.
+    """
+
+    __slots__ = ("_capacity", "_times", "_temps", "_meds", "_head", "_size", "version")
+
+    def __init__(self, capacity: int = HISTORY_MAX_ENTRIES) -> None:
+        """Initialize an empty ring."""
+        self._capacity = capacity
+        self._times: list[float] = [0.0] * capacity
+        self._temps: list[float | None] = [None] * capacity
+        self._meds: list[str] = ["none"] * capacity
+        self._head = 0
+        self._size = 0
+        # Increases on every change so derived views can tell they are stale
+        self.version = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Measurement]:
+        for index in range(self._size):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> Measurement:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("measurement index out of range")
+        pos = (self._head + index) % self._capacity
+        return Measurement(self._times[pos], self._temps[pos], self._meds[pos])
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of measurements kept."""
+        return self._capacity
+
+    @property
+    def last(self) -> Measurement | None:
+        """Return the newest measurement."""
+        return self[-1] if self._size else None
+
+    def _set(self, index: int, item: Measurement) -> None:
+        pos = (self._head + index) % self._capacity
+        self._times[pos], self._temps[pos], self._meds[pos] = item
+
+    def append(
+        self, timestamp: float, temperature: float | None, medication: str
+    ) -> bool:
+        """Add a measurement, keeping the ring ordered by timestamp.
+
+        Returns False if the ring is full and the measurement is older than
+        everything it keeps, in which case nothing changes.
+        """
+        capacity = self._capacity
+        if self._size and timestamp < self._times[(self._head + self._size - 1) % capacity]:
+            return self._insert(timestamp, temperature, medication)
+
+        if self._size < capacity:
+            pos = (self._head + self._size) % capacity
+            self._size += 1
+        else:
+            pos = self._head
+            self._head = (self._head + 1) % capacity
+        self._times[pos] = timestamp
+        self._temps[pos] = temperature
+        self._meds[pos] = medication
+        self.version += 1
+        return True
+
+    def _insert(
+        self, timestamp: float, temperature: float | None, medication: str
+    ) -> bool:
+        """Insert an out-of-order measurement (backfill); O(n) in the worst case."""
+        index = self.bisect_right(timestamp)
+        if self._size == self._capacity:
+            if index == 0:
+                # Older than everything we keep
+                return False
+            # Drop the oldest entry to make room
+            self._head = (self._head + 1) % self._capacity
+            self._size -= 1
+            index -= 1
+
+        self._size += 1
+        for pos in range(self._size - 1, index, -1):
+            self._set(pos, self[pos - 1])
+        self._set(index, Measurement(timestamp, temperature, medication))
+        self.version += 1
+        return True
+
+    def bisect_left(self, timestamp: float) -> int:
+        """Return the index of the first measurement at or after timestamp."""
+        return bisect_left(_TimestampView(self), timestamp)
+
+    def bisect_right(self, timestamp: float) -> int:
+        """Return the index of the first measurement after timestamp."""
+        return bisect_right(_TimestampView(self), timestamp)
+
+    def since(self, timestamp: float) -> list[Measurement]:
+        """Return all measurements taken at or after timestamp."""
+        return [self[i] for i in range(self.bisect_left(timestamp), self._size)]
+
+    def latest(self, count: int) -> list[Measurement]:
+        """Return up to count of the newest measurements, oldest first."""
+        start = max(self._size - count, 0)
+        return [self[i] for i in range(start, self._size)]
+
+    def columns(self) -> tuple[list[float], list[float | None], list[str]]:
+        """Return copies of the timestamp, temperature and medication columns."""
+        head, end = self._head, self._head + self._size
+        if end <= self._capacity:
+            return (
+                self._times[head:end],
+                self._temps[head:end],
+                self._meds[head:end],
+            )
+        end -= self._capacity
+        return (
+            self._times[head:] + self._times[:end],
+            self._temps[head:] + self._temps[:end],
+            self._meds[head:] + self._meds[:end],
+        )
+
+    def as_dict(self) -> dict[str, list]:
+        """Return the ring as columns, oldest first, for storage."""
+        times, temps, meds = self.columns()
+        return {
+            "timestamps": times,
+            "temperatures": temps,
+            "medications": meds,
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: dict[str, list], capacity: int = HISTORY_MAX_ENTRIES
+    ) -> MeasurementRing:
+        """Rebuild a ring from stored columns."""
+        ring = cls(capacity)
+        for item in zip(
+            data.get("timestamps", []),
+            data.get("temperatures", []),
+            data.get("medications", []),
+        ):
+            ring.append(*item)
+        return ring
+
+
+class HistoryStore:
+    """Per config entry measurement history with write-behind persistence.
+
+    Recording a measurement only touches memory: it updates the member's
+    ring and appends to an in-memory journal. The journal is flushed after
+    a delay to an append-only file on the executor, and compacted into a
+    Store snapshot periodically or once it grows large. On load, the
+    snapshot is read and the journal records newer than it are replayed,
+    so a crash loses at most the last unflushed delay window.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, capacity: int = HISTORY_MAX_ENTRIES
+    ) -> None:
+        """Initialize the history store."""
+        self._hass = hass
+        self._capacity = capacity
+        self._store: Store[dict[str, Any]] = Store(
+            hass, HISTORY_STORAGE_VERSION, f"{HISTORY_STORAGE_KEY}.{entry_id}"
+        )
+        self._journal_path = hass.config.path(
+            STORAGE_DIR, f"{HISTORY_STORAGE_KEY}.{entry_id}.journal"
+        )
+        self._rings: dict[str, MeasurementRing] = {}
+        # Sequence number of the last recorded measurement
+        self._seq = 0
+        self._pending: list[list[Any]] = []
+        self._journal_records = 0
+        self._lock = asyncio.Lock()
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._unsub_compact: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> None:
+        """Load the snapshot and replay the journal."""
+        data = await self._store.async_load() or {}
+        for member_key, columns in data.get("members", {}).items():
+            self._rings[member_key] = MeasurementRing.from_dict(columns, self._capacity)
+        self._seq = data.get("seq", 0)
+
+        records, torn = await self._hass.async_add_executor_job(
+            _read_journal, self._journal_path
+        )
+        replayed = 0
+        for seq, member_key, timestamp, temperature, medication in records:
+            if seq <= self._seq:
+                # Already part of the snapshot (crash before truncation)
+                continue
+            self.ring(member_key).append(timestamp, temperature, medication)
+            self._seq = seq
+            replayed += 1
+        _LOGGER.debug(
+            "Loaded measurement history for %s members, replayed %s journal records",
+            len(self._rings),
+            replayed,
+        )
+        if records or torn:
+            # Start from a clean journal so new records never follow a torn line
+            await self.async_compact()
+
+        self._unsub_compact = async_track_time_interval(
+            self._hass, self._async_scheduled_compact, HISTORY_COMPACT_INTERVAL
+        )
+
+    async def async_close(self) -> None:
+        """Stop the timers and persist everything still in memory."""
+        if self._unsub_compact is not None:
+            self._unsub_compact()
+            self._unsub_compact = None
+        await self.async_flush()
+
+    async def async_remove(self) -> None:
+        """Remove the persisted history."""
+        await self._store.async_remove()
+        await self._hass.async_add_executor_job(_remove_file, self._journal_path)
+
+    def ring(self, member_key: str) -> MeasurementRing:
+        """Return the history ring of a member, creating it if needed."""
+        ring = self._rings.get(member_key)
+        if ring is None:
+            ring = self._rings[member_key] = MeasurementRing(self._capacity)
+        return ring
+
+    @callback
+    def async_record(
+        self,
+        member_key: str,
+        timestamp: float,
+        temperature: float | None,
+        medication: str,
+    ) -> bool:
+        """Record a measurement; persistence happens later in the background.
+
+        Returns False if the member's ring did not keep the measurement
+        because it is full of newer ones; nothing is journaled then.
+        """
+        if not self.ring(member_key).append(timestamp, temperature, medication):
+            return False
+        self._seq += 1
+        self._pending.append([self._seq, member_key, timestamp, temperature, medication])
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._hass, HISTORY_SAVE_DELAY, self._async_scheduled_flush
+            )
+        return True
+
+    async def _async_scheduled_flush(self, _now: Any) -> None:
+        self._unsub_flush = None
+        await self.async_flush()
+        if self._journal_records >= HISTORY_COMPACT_RECORDS:
+            await self.async_compact()
+
+    async def _async_scheduled_compact(self, _now: Any) -> None:
+        if self._journal_records or self._pending:
+            await self.async_compact()
+
+    async def async_flush(self) -> None:
+        """Append the pending journal records to the journal file."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        async with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            await self._hass.async_add_executor_job(
+                _append_journal, self._journal_path, pending
+            )
+            self._journal_records += len(pending)
+
+    async def async_compact(self) -> None:
+        """Write a snapshot of all rings and truncate the journal."""
+        async with self._lock:
+            # The snapshot covers every record so far, pending ones included
+            data = self._data_to_save()
+            self._pending = []
+            await self._store.async_save(data)
+            await self._hass.async_add_executor_job(_remove_file, self._journal_path)
+            self._journal_records = 0
+        _LOGGER.debug("Compacted measurement history at sequence %s", data["seq"])
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the snapshot to persist."""
+        return {
+            "seq": self._seq,
+            "members": {
+                member_key: ring.as_dict() for member_key, ring in self._rings.items()
+            },
+        }
+
+
+def _read_journal(path: str) -> tuple[list[list[Any]], bool]:
+    """Read all complete journal records (executor).
+
+    Returns the records and whether a corrupt record was skipped.
+    """
+    records = []
+    torn = False
+    try:
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # Torn write of the last record before a crash
+                    _LOGGER.warning("Skipping corrupt journal record in %s", path)
+                    torn = True
+    except FileNotFoundError:
+        pass
+    return records, torn
+
+
+def _append_journal(path: str, records: list[list[Any]]) -> None:
+    """Append records to the journal and sync them to disk (executor)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as file:
+        file.writelines(json.dumps(record) + "\n" for record in records)
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def _remove_file(path: str) -> None:
+    """Remove a file if it exists (executor)."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,77 @@
+"""Duplicate measurement detection for Family Health Tracker."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, IDEMPOTENCY_CACHE_SIZE
+
+
+class IdempotencyCache:
+    """Keys of recently applied measurements, bounded in time and size.
+
+    Every key expires after its own time to live. The cache never holds
+    more than max_size keys: adding one more evicts the least recently
+    used, so memory stays fixed however many measurements arrive. Expired
+    keys are only dropped when they are looked up or evicted.
+
+    Looking a key up and remembering it are separate steps, so a key is
+    only remembered once its measurement was applied and a failed attempt
+    can be retried.
+    """
+
+    def __init__(self, max_size: int = IDEMPOTENCY_CACHE_SIZE) -> None:
+        """Initialize an empty cache."""
+        self._max_size = max_size
+        self._expires: OrderedDict[Hashable, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    @callback
+    def async_seen(self, key: Hashable) -> bool:
+        """Return True if key was remembered within its time to live."""
+        expires = self._expires.get(key)
+        if expires is not None:
+            if expires > monotonic():
+                self._expires.move_to_end(key)
+                self.hits += 1
+                return True
+            del self._expires[key]
+        self.misses += 1
+        return False
+
+    @callback
+    def async_add(self, key: Hashable, ttl: float) -> None:
+        """Remember key for ttl seconds."""
+        self._expires[key] = monotonic() + ttl
+        self._expires.move_to_end(key)
+        if len(self._expires) > self._max_size:
+            self._expires.popitem(last=False)
+            self.evictions += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the size and counters of the cache."""
+        return {
+            "size": len(self._expires),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+@callback
+def async_get_idempotency_cache(hass: HomeAssistant) -> IdempotencyCache:
+    """Return the domain-wide idempotency cache."""
+    cache = hass.data[DOMAIN].get("idempotency_cache")
+    if cache is None:
+        cache = hass.data[DOMAIN]["idempotency_cache"] = IdempotencyCache()
+    return cache
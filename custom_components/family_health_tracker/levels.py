@@ -0,0 +1,120 @@
+"""Temperature level classification for Family Health Tracker."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Mapping
+
+import numpy as np
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, TEMP_LEVELS
+
+LEVEL_UNKNOWN = "unknown"
+
+
+class TemperatureLevels:
+    """Temperature level table compiled into a sorted boundary array.
+
+    The configured ranges are stored at one-decimal precision, which leaves
+    gaps between them (37.25 is neither "normal" nor "elevated"). The
+    compiled table only uses each level's lower bound, so a level covers
+    everything from its own minimum up to the next level's minimum. The
+    highest level ends at its configured maximum.
+    """
+
+    __slots__ = ("ranges", "_bounds", "_levels", "_upper", "_labels")
+
+    def __init__(self, ranges: Mapping[str, Mapping[str, float]]) -> None:
+        """Compile the level ranges."""
+        if not ranges:
+            raise ValueError("At least one temperature level is required")
+        ordered = sorted(ranges.items(), key=lambda item: item[1]["min"])
+        self.ranges = ranges
+        self._bounds = [float(limits["min"]) for _, limits in ordered]
+        self._levels = [level for level, _ in ordered]
+        self._upper = float(ordered[-1][1]["max"])
+        # Index 0 and the slot past the last level map to "unknown"
+        self._labels = np.array([LEVEL_UNKNOWN, *self._levels, LEVEL_UNKNOWN])
+
+    @property
+    def levels(self) -> list[str]:
+        """Return the level names, coldest first."""
+        return list(self._levels)
+
+    def classify(self, temperature: float) -> str:
+        """Return the level of a single temperature."""
+        if not temperature <= self._upper:  # also catches NaN
+            return LEVEL_UNKNOWN
+        index = bisect_right(self._bounds, temperature)
+        if index == 0:
+            return LEVEL_UNKNOWN
+        return self._levels[index - 1]
+
+    def classify_indices(self, temperatures: Any) -> np.ndarray:
+        """Return level indices for an array of temperatures.
+
+        Index 0 means "unknown", index i > 0 is the i-th level coldest first.
+        """
+        temps = np.asarray(temperatures, dtype=np.float64)
+        indices = np.searchsorted(self._bounds, temps, side="right")
+        indices[(temps > self._upper) | np.isnan(temps)] = len(self._levels) + 1
+        return indices
+
+    def classify_many(self, temperatures: Any) -> np.ndarray:
+        """Return the level names for a whole array of temperatures."""
+        return self._labels[self.classify_indices(temperatures)]
+
+
+DEFAULT_LEVELS = TemperatureLevels(TEMP_LEVELS)
+
+# Distinct range tables kept compiled; older ones are compiled again when used
+COMPILED_TABLES = 32
+
+FrozenRanges = tuple[tuple[str, float, float], ...]
+
+
+def _freeze(ranges: Mapping[str, Mapping[str, float]]) -> FrozenRanges:
+    """Return a range table as a hashable tuple, coldest level first."""
+    return tuple(
+        sorted(
+            (
+                (level, float(limits["min"]), float(limits["max"]))
+                for level, limits in ranges.items()
+            ),
+            key=lambda item: (item[1], item[0]),
+        )
+    )
+
+
+@lru_cache(maxsize=COMPILED_TABLES)
+def _compile_frozen(table: FrozenRanges) -> TemperatureLevels:
+    """Compile a frozen range table."""
+    return TemperatureLevels(
+        {level: {"min": low, "max": high} for level, low, high in table}
+    )
+
+
+def _compile(ranges: Mapping[str, Mapping[str, float]]) -> TemperatureLevels:
+    """Compile a range table; equal tables share one compiled table."""
+    if ranges is TEMP_LEVELS:
+        return DEFAULT_LEVELS
+    return _compile_frozen(_freeze(ranges))
+
+
+def get_levels(hass: HomeAssistant, member_key: str | None = None) -> TemperatureLevels:
+    """Return the compiled level table for a member.
+
+    ``hass.data[DOMAIN]["temp_levels"]`` may hold either a single range
+    table used for everyone, or a mapping of member keys to range tables.
+    """
+    custom = hass.data.get(DOMAIN, {}).get("temp_levels")
+    if not custom:
+        return DEFAULT_LEVELS
+    if all(isinstance(limits, Mapping) and "min" in limits for limits in custom.values()):
+        return _compile(custom)
+    member_ranges = custom.get(member_key) if member_key is not None else None
+    if member_ranges:
+        return _compile(member_ranges)
+    return DEFAULT_LEVELS
@@ -0,0 +1,88 @@
+"""Medication library index for Family Health Tracker."""
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from .const import (
+    ATTR_CATEGORY,
+    ATTR_DOSAGE,
+    ATTR_INTERVAL,
+    get_combined_medications,
+)
+
+
+class MedicationIndex:
+    """Precomputed view of the combined medication library.
+
+    The index is rebuilt only when the library changes; every read is a
+    constant-time lookup into the precomputed structures. The version
+    counter increases on each rebuild so consumers can cheaply tell
+    whether their own cached data is stale.
+    """
+
+    def __init__(self, user_medications: Mapping[str, Any] | None = None) -> None:
+        """Initialize the index."""
+        self.version = 0
+        self.rebuild(user_medications)
+
+    def rebuild(self, user_medications: Mapping[str, Any] | None = None) -> None:
+        """Rebuild the index from the user medication library."""
+        medications = get_combined_medications(user_medications)
+        self._medications = MappingProxyType(medications)
+        self._attributes = {
+            med_id: MappingProxyType(
+                {
+                    ATTR_DOSAGE: med_info.get(ATTR_DOSAGE),
+                    ATTR_INTERVAL: med_info.get(ATTR_INTERVAL),
+                    ATTR_CATEGORY: med_info.get(ATTR_CATEGORY),
+                }
+            )
+            for med_id, med_info in medications.items()
+        }
+        self._options = tuple(
+            {"value": med_id, "label": med_info["label"]}
+            for med_id, med_info in medications.items()
+        )
+        self._value_list = tuple(medications)
+        self._values = frozenset(medications)
+        self.version += 1
+
+    def __contains__(self, med_id: object) -> bool:
+        return med_id in self._values
+
+    def __len__(self) -> int:
+        return len(self._value_list)
+
+    def get(self, med_id: str) -> Mapping[str, Any] | None:
+        """Return the library entry of a medication."""
+        return self._medications.get(med_id)
+
+    def attributes(self, med_id: str) -> Mapping[str, Any]:
+        """Return the precomputed state attributes of a medication."""
+        return self._attributes.get(med_id, _UNKNOWN)
+
+    @property
+    def medications(self) -> Mapping[str, Any]:
+        """Return the combined medication library (read-only)."""
+        return self._medications
+
+    @property
+    def options(self) -> tuple[dict[str, str], ...]:
+        """Return the value/label options for select entities."""
+        return self._options
+
+    @property
+    def value_list(self) -> tuple[str, ...]:
+        """Return the medication ids in library order."""
+        return self._value_list
+
+    @property
+    def values(self) -> frozenset[str]:
+        """Return the set of valid medication ids."""
+        return self._values
+
+
+_UNKNOWN: Mapping[str, Any] = MappingProxyType(
+    {ATTR_DOSAGE: None, ATTR_INTERVAL: None, ATTR_CATEGORY: None}
+)
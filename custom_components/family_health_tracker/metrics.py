@@ -0,0 +1,116 @@
+"""Latency instrumentation for Family Health Tracker."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from math import inf
+from time import perf_counter
+from typing import Any
+
+# Upper bounds of the histogram buckets in milliseconds
+BUCKET_BOUNDS_MS = (
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, inf
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram.
+
+    Recording is a bisect over a short tuple and an increment; percentiles
+    are read from the cumulative bucket counts and reported as the upper
+    bound of the bucket they fall in.
+    """
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * len(BUCKET_BOUNDS_MS)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        """Add one observation."""
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the bucket bound below which fraction of observations fall."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bound, bucket_count in zip(BUCKET_BOUNDS_MS, self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return self.max_ms if bound is inf else bound
+        return self.max_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the summary of the histogram."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+        }
+
+
+class Metrics:
+    """Latency histograms and counters of one config entry.
+
+    While disabled, start() returns None and record() and increment()
+    return immediately, so instrumented code pays two method calls.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        """Initialize the metrics."""
+        self.enabled = enabled
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._counters: dict[str, int] = {}
+
+    def start(self) -> float | None:
+        """Return a start mark for record(), or None while disabled."""
+        return perf_counter() if self.enabled else None
+
+    def record(self, name: str, started: float | None) -> None:
+        """Record the time elapsed since a start mark."""
+        if started is None:
+            return
+        self._observe(name, (perf_counter() - started) * 1000)
+
+    def observe(self, name: str, elapsed_ms: float) -> None:
+        """Record a latency that was measured elsewhere."""
+        if self.enabled:
+            self._observe(name, elapsed_ms)
+
+    def _observe(self, name: str, elapsed_ms: float) -> None:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = LatencyHistogram()
+        histogram.record(elapsed_ms)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increase a counter."""
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def histogram(self, name: str) -> LatencyHistogram | None:
+        """Return a histogram, if anything was recorded under that name."""
+        return self._histograms.get(name)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all histograms and counters."""
+        return {
+            "enabled": self.enabled,
+            "latency": {
+                name: histogram.as_dict()
+                for name, histogram in sorted(self._histograms.items())
+            },
+            "counters": dict(sorted(self._counters.items())),
+        }
@@ -1,21 +1,23 @@
 """Number platform for Family Health Tracker."""
 import logging
+from collections.abc import Iterable
 from typing import Any
 
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.const import CONF_NAME, UnitOfTemperature
 
 from .const import (
     DOMAIN,
-    CONF_MEMBERS,
+    SIGNAL_MEMBERS_ADDED,
     ATTR_TEMPERATURE,
     ATTR_MEDICATION,
-    VERSION,
 )
+from .runtime import MemberRuntime
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,42 +27,40 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Family Health Tracker number inputs."""
-    members = [member.strip() for member in config_entry.data[CONF_MEMBERS].split(",")]
+    @callback
+    def _async_add_members(runtimes: Iterable[MemberRuntime]) -> None:
+        entities = []
+        for runtime in runtimes:
+            temp_input = TemperatureInput(hass, runtime, runtime.device_info)
+            runtime.temperature_input = temp_input
+            entities.append(temp_input)
 
-    entities = []
-    for member in members:
-        member_lower = member.lower()
-        device_id = f"{config_entry.entry_id}_{member_lower}"
-        
-        device_info = DeviceInfo(
-            identifiers={(DOMAIN, device_id)},
-            name=member,
-            manufacturer="Family Health Tracker",
-            model="Health Monitor",
-            sw_version=VERSION,
-            via_device=(DOMAIN, config_entry.entry_id),
-        )
+            # Debug log the entity ID being created
+            _LOGGER.debug(
+                "Creating temperature input entity with ID: number.%s_%s_temperature_input",
+                config_entry.entry_id,
+                runtime.key
+            )
+        async_add_entities(entities)
 
-        temp_input = TemperatureInput(hass, member, device_info, config_entry.entry_id)
-        entities.append(temp_input)
-        
-        # Debug log the entity ID being created
-        _LOGGER.debug(
-            "Creating temperature input entity with ID: number.%s_%s_temperature_input",
-            config_entry.entry_id,
-            member_lower
+    _async_add_members(hass.data[DOMAIN][config_entry.entry_id]["members"].values())
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_MEMBERS_ADDED.format(config_entry.entry_id),
+            _async_add_members,
         )
-
-    async_add_entities(entities, True)
+    )
 
 class TemperatureInput(NumberEntity):
     """Temperature input for a family member."""
 
-    def __init__(self, hass: HomeAssistant, name: str, device_info: DeviceInfo, entry_id: str) -> None:
+    def __init__(self, hass: HomeAssistant, member: MemberRuntime, device_info: DeviceInfo) -> None:
         """Initialize the input."""
         self._hass = hass
-        self._name = name
-        self._entry_id = entry_id
+        self._member = member
+        self._name = name = member.name
+        self._entry_id = member.entry_id
         self._attr_device_info = device_info
         self._attr_unique_id = f"{self._entry_id}_{name.lower()}_temperature_input"
         self.entity_id = f"number.temperature_{name.lower()}"
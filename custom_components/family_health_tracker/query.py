@@ -0,0 +1,78 @@
+"""Paginated range queries over measurement history."""
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .levels import get_levels
+from .runtime import MemberRuntime
+
+
+def _parse_cursor(cursor: str) -> tuple[float, int]:
+    """Split a cursor into the last timestamp and how many readings at it were sent."""
+    try:
+        timestamp, skip = cursor.rsplit(":", 1)
+        parsed = float(timestamp), int(skip)
+    except ValueError as err:
+        raise ValueError(f"Invalid cursor {cursor}") from err
+    if not math.isfinite(parsed[0]) or parsed[1] < 0:
+        raise ValueError(f"Invalid cursor {cursor}")
+    return parsed
+
+
+def query_page(
+    runtime: MemberRuntime,
+    start: float | None,
+    end: float | None,
+    cursor: str | None,
+    limit: int,
+) -> dict[str, Any]:
+    """Return one page of a member's readings taken within [start, end].
+
+    Both range ends and the cursor are resolved by bisecting the
+    time-sorted history, so a page costs O(log n + limit) however long
+    the history is. The cursor encodes the last timestamp returned and
+    how many readings at that timestamp were already returned, so it
+    stays valid while older readings are evicted from the history.
+    """
+    ring = runtime.history.ring(runtime.key)
+    first = ring.bisect_left(start) if start is not None else 0
+    hi = ring.bisect_right(end) if end is not None else len(ring)
+    lo = first
+    if cursor:
+        timestamp, skip = _parse_cursor(cursor)
+        lo = max(ring.bisect_left(timestamp) + skip, first)
+    stop = min(lo + limit, hi)
+
+    levels = get_levels(runtime.hass, runtime.key)
+    medications = runtime.medications
+    readings = []
+    for index in range(lo, stop):
+        timestamp, temperature, medication = ring[index]
+        med_info = medications.get(medication) or {}
+        readings.append(
+            {
+                "measured_at": dt_util.as_local(
+                    dt_util.utc_from_timestamp(timestamp)
+                ).isoformat(),
+                "timestamp": timestamp,
+                "temperature": temperature,
+                "level": levels.classify(temperature) if temperature is not None else None,
+                "medication": medication,
+                "medication_label": med_info.get("label"),
+                **medications.attributes(medication),
+            }
+        )
+
+    next_cursor = None
+    if stop < hi and readings:
+        last = readings[-1]["timestamp"]
+        next_cursor = f"{last!r}:{stop - ring.bisect_left(last)}"
+    return {
+        "member": runtime.name,
+        "total": max(hi - first, 0),
+        "readings": readings,
+        "next_cursor": next_cursor,
+    }
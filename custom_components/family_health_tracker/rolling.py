@@ -0,0 +1,124 @@
+"""Incremental rolling temperature statistics for Family Health Tracker."""
+from __future__ import annotations
+
+import math
+from collections import deque
+from itertools import count
+
+from .const import FEVER_THRESHOLD
+
+
+class RollingWindow:
+    """Rolling mean, min, max, std and time above a threshold.
+
+    Readings are added in time order. Mean and variance use Welford's
+    algorithm with removal, min and max use monotonic deques, and time
+    above the threshold is kept as a running total of closed segments. Every
+    update and read is O(1) amortised regardless of the window length.
+    """
+
+    def __init__(self, window_seconds: float, threshold: float = FEVER_THRESHOLD) -> None:
+        """Initialize an empty window."""
+        self.window_seconds = window_seconds
+        self.threshold = threshold
+        self._sequence = count()
+        # (sequence, timestamp, temperature) of readings inside the window
+        self._readings: deque[tuple[int, float, float]] = deque()
+        self._min: deque[tuple[int, float]] = deque()
+        self._max: deque[tuple[int, float]] = deque()
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        # Closed (start, end) segments spent above the threshold
+        self._above: deque[tuple[float, float]] = deque()
+        self._above_total = 0.0
+        self._last: tuple[float, float] | None = None
+
+    def add(self, timestamp: float, temperature: float) -> None:
+        """Add a reading; readings older than the last one are ignored."""
+        if self._last is not None and timestamp < self._last[0]:
+            return
+
+        if self._last is not None and self._last[1] >= self.threshold:
+            self._above.append((self._last[0], timestamp))
+            self._above_total += timestamp - self._last[0]
+        self._last = (timestamp, temperature)
+
+        seq = next(self._sequence)
+        self._readings.append((seq, timestamp, temperature))
+        self._count += 1
+        delta = temperature - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (temperature - self._mean)
+
+        while self._min and self._min[-1][1] >= temperature:
+            self._min.pop()
+        self._min.append((seq, temperature))
+        while self._max and self._max[-1][1] <= temperature:
+            self._max.pop()
+        self._max.append((seq, temperature))
+
+        self.evict(timestamp)
+
+    def evict(self, now: float) -> None:
+        """Drop everything that slid out of the window."""
+        cutoff = now - self.window_seconds
+        readings = self._readings
+        while readings and readings[0][1] < cutoff:
+            seq, _, temperature = readings.popleft()
+            self._count -= 1
+            if self._count:
+                delta = temperature - self._mean
+                self._mean -= delta / self._count
+                self._m2 -= delta * (temperature - self._mean)
+            else:
+                self._mean = self._m2 = 0.0
+            if self._min and self._min[0][0] == seq:
+                self._min.popleft()
+            if self._max and self._max[0][0] == seq:
+                self._max.popleft()
+
+        above = self._above
+        while above and above[0][1] <= cutoff:
+            start, end = above.popleft()
+            self._above_total -= end - start
+
+    @property
+    def count(self) -> int:
+        """Return the number of readings in the window."""
+        return self._count
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean temperature."""
+        return self._mean if self._count else None
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the lowest temperature."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the highest temperature."""
+        return self._max[0][1] if self._max else None
+
+    @property
+    def std_dev(self) -> float | None:
+        """Return the sample standard deviation."""
+        if not self._count:
+            return None
+        if self._count < 2:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (self._count - 1))
+
+    def seconds_above(self, now: float) -> float:
+        """Return the time spent at or above the threshold within the window."""
+        cutoff = now - self.window_seconds
+        total = self._above_total
+        if self._above and self._above[0][0] < cutoff:
+            # Only part of the oldest segment is still inside the window
+            total -= cutoff - self._above[0][0]
+        if self._last is not None and self._last[1] >= self.threshold:
+            total += now - max(self._last[0], cutoff)
+        return max(total, 0.0)
@@ -0,0 +1,321 @@
+"""Runtime objects for Family Health Tracker members."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_INTERVAL,
+    DOMAIN,
+    EVENT_MEASUREMENT,
+    SIGNAL_DEVICE_TRIGGER,
+    VERSION,
+)
+from .history import HistoryStore
+from .levels import get_levels
+from .medications import MedicationIndex
+from .metrics import Metrics
+from .snapshot import StateSnapshot
+
+if TYPE_CHECKING:
+    from .binary_sensor import DoseDueSensor
+    from .dose import DoseScheduler
+    from .button import RecordMeasurementButton
+    from .number import TemperatureInput
+    from .select import MedicationInput
+    from .sensor import (
+        LastMedicationDurationSensor,
+        MedicationSensor,
+        TemperatureLevelSensor,
+        TemperatureSensor,
+        TemperatureStatisticsSensor,
+    )
+
+
+def normalize_member(name: str) -> str:
+    """Return the key used to index a family member."""
+    return name.strip().lower()
+
+
+class MemberRuntime:
+    """Direct references to one family member's entities and history.
+
+    Built once per member in async_setup_entry, together with the member's
+    device info. Each platform creates its entities from the runtimes and
+    attaches them, so neither setup nor hot paths re-parse the member list
+    or rebuild device info and entity ids.
+    """
+
+    __slots__ = (
+        "hass",
+        "name",
+        "key",
+        "entry_id",
+        "device_identifier",
+        "device_info",
+        "device_id",
+        "history",
+        "medications",
+        "doses",
+        "metrics",
+        "snapshot",
+        "temperature_sensor",
+        "level_sensor",
+        "medication_sensor",
+        "duration_sensor",
+        "temperature_input",
+        "medication_input",
+        "button",
+        "dose_sensor",
+        "statistics_sensors",
+    )
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        entry_id: str,
+        history: HistoryStore,
+        medications: MedicationIndex,
+        doses: DoseScheduler,
+        metrics: Metrics,
+        snapshot: StateSnapshot,
+    ) -> None:
+        """Initialize the member runtime."""
+        self.hass = hass
+        self.name = name
+        self.key = normalize_member(name)
+        self.entry_id = entry_id
+        self.device_identifier = (DOMAIN, f"{entry_id}_{self.key}")
+        self.device_info = DeviceInfo(
+            identifiers={self.device_identifier},
+            name=name,
+            manufacturer="Family Health Tracker",
+            model="Health Monitor",
+            sw_version=VERSION,
+            via_device=(DOMAIN, entry_id),
+        )
+        # Device registry id, set once the member's device is registered
+        self.device_id: str | None = None
+        self.history = history
+        self.medications = medications
+        self.doses = doses
+        self.metrics = metrics
+        self.snapshot = snapshot
+        self.temperature_sensor: TemperatureSensor | None = None
+        self.level_sensor: TemperatureLevelSensor | None = None
+        self.medication_sensor: MedicationSensor | None = None
+        self.duration_sensor: LastMedicationDurationSensor | None = None
+        self.temperature_input: TemperatureInput | None = None
+        self.medication_input: MedicationInput | None = None
+        self.button: RecordMeasurementButton | None = None
+        self.dose_sensor: DoseDueSensor | None = None
+        self.statistics_sensors: list[TemperatureStatisticsSensor] = []
+
+    @property
+    def sensors_ready(self) -> bool:
+        """Return True once the sensor platform attached its entities."""
+        return (
+            self.temperature_sensor is not None
+            and self.medication_sensor is not None
+        )
+
+    async def async_record(self, temperature: float, medication: str) -> None:
+        """Record a measurement on the member's sensors and history."""
+        measured_at = dt_util.now()
+        timestamp = measured_at.timestamp()
+        self.metrics.increment("measurements")
+        started = self.metrics.start()
+        for entity in self.apply_measurement(measured_at, temperature, medication):
+            entity.async_write_ha_state()
+        self.metrics.record("state_commit", started)
+        self.history.async_record(self.key, timestamp, temperature, medication)
+        self.snapshot.async_update(self.key, timestamp, temperature, medication)
+        self.record_dose(medication, timestamp)
+        self.async_fire_measurement(timestamp, temperature, medication)
+
+    def apply_measurement(
+        self,
+        measured_at: datetime,
+        temperature: float,
+        medication: str,
+        is_latest: bool = True,
+    ) -> list[Entity]:
+        """Update the member's sensors in memory and return the ones to write.
+
+        Nothing is written here, so callers write every returned entity in
+        the same loop iteration and state listeners never see the
+        temperature, level and medication out of step. A measurement older
+        than the newest one only moves the time since medication forward.
+        """
+        dirty: list[Entity] = []
+        if is_latest:
+            self.temperature_sensor.set_temperature(temperature, measured_at)
+            self.level_sensor.set_temperature(temperature)
+            self.medication_sensor.set_medication(medication, measured_at)
+            dirty.extend(
+                (self.temperature_sensor, self.level_sensor, self.medication_sensor)
+            )
+            dirty.extend(self.statistics_sensors)
+        if self.duration_sensor.set_medication_time(medication, measured_at):
+            dirty.append(self.duration_sensor)
+        return dirty
+
+    @callback
+    def async_fire_measurement(
+        self, timestamp: float, temperature: float | None, medication: str
+    ) -> None:
+        """Fire the compact measurement event for live subscribers.
+
+        The member's device triggers get the measurement on their own
+        dispatcher signal, together with the level of the reading before
+        it, so they never have to filter the event bus.
+        """
+        levels = get_levels(self.hass, self.key)
+        data = {
+            "entry_id": self.entry_id,
+            "member": self.key,
+            "name": self.name,
+            "measured_at": timestamp,
+            "temperature": temperature,
+            "level": levels.classify(temperature) if temperature is not None else None,
+            "medication": medication,
+        }
+        self.hass.bus.async_fire(EVENT_MEASUREMENT, data)
+        if self.device_id is None:
+            return
+
+        # Only the newest measurement can move the member into a level
+        ring = self.history.ring(self.key)
+        latest = ring.last is not None and ring.last.timestamp == timestamp
+        previous_level = None
+        if latest:
+            for index in range(len(ring) - 2, -1, -1):
+                previous = ring[index].temperature
+                if previous is not None:
+                    previous_level = levels.classify(previous)
+                    break
+        async_dispatcher_send(
+            self.hass,
+            SIGNAL_DEVICE_TRIGGER.format(self.device_id),
+            "measurement",
+            {**data, "latest": latest, "previous_level": previous_level},
+        )
+
+    def record_dose(self, medication: str, timestamp: float, notify: bool = True) -> None:
+        """Schedule the next allowed dose after a medication was given."""
+        if medication == "none":
+            return
+        med_info = self.medications.get(medication)
+        self.doses.async_record_dose(
+            self.entry_id,
+            self.key,
+            medication,
+            med_info.get(ATTR_INTERVAL) if med_info else None,
+            timestamp,
+            notify,
+        )
+
+
+class MemberDirectory:
+    """Domain-wide index of every loaded member, across all config entries.
+
+    Services are registered once for the domain and use this index to find
+    the member a call is about in constant time, whichever entry it belongs
+    to. Members are indexed by normalized name and by device id; a name
+    shared by members of several entries needs the device id to resolve.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty directory."""
+        self._by_key: dict[str, dict[str, MemberRuntime]] = {}
+        self._by_device: dict[str, MemberRuntime] = {}
+        self._entries: dict[str, dict[str, MemberRuntime]] = {}
+
+    def __iter__(self) -> Iterator[MemberRuntime]:
+        for runtimes in self._entries.values():
+            yield from runtimes.values()
+
+    @callback
+    def async_add_entry(self, entry_id: str, runtimes: Iterable[MemberRuntime]) -> None:
+        """Index the members of a config entry."""
+        self.async_remove_entry(entry_id)
+        for runtime in runtimes:
+            self.async_add_member(runtime)
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> None:
+        """Drop the members of a config entry from the index."""
+        for runtime in list(self._entries.get(entry_id, {}).values()):
+            self.async_remove_member(runtime)
+        self._entries.pop(entry_id, None)
+
+    @callback
+    def async_add_member(self, runtime: MemberRuntime) -> None:
+        """Index one member."""
+        self._entries.setdefault(runtime.entry_id, {})[runtime.key] = runtime
+        self._by_key.setdefault(runtime.key, {})[runtime.entry_id] = runtime
+        if runtime.device_id is not None:
+            self._by_device[runtime.device_id] = runtime
+
+    @callback
+    def async_remove_member(self, runtime: MemberRuntime) -> None:
+        """Drop one member from the index."""
+        entry_members = self._entries.get(runtime.entry_id)
+        if entry_members is not None:
+            entry_members.pop(runtime.key, None)
+        by_entry = self._by_key.get(runtime.key)
+        if by_entry is not None:
+            by_entry.pop(runtime.entry_id, None)
+            if not by_entry:
+                del self._by_key[runtime.key]
+        if runtime.device_id is not None:
+            self._by_device.pop(runtime.device_id, None)
+
+    def get(self, entry_id: str, member_key: str) -> MemberRuntime | None:
+        """Return a member of a config entry."""
+        return self._entries.get(entry_id, {}).get(member_key)
+
+    def get_by_device(self, device_id: str) -> MemberRuntime | None:
+        """Return the member of a device."""
+        return self._by_device.get(device_id)
+
+    def resolve(
+        self, name: str | None = None, device_id: str | None = None
+    ) -> MemberRuntime:
+        """Return the member a service call refers to.
+
+        Raises HomeAssistantError if no member, or more than one, matches.
+        """
+        if device_id is not None:
+            runtime = self._by_device.get(device_id)
+            if runtime is None or (
+                name is not None and runtime.key != normalize_member(name)
+            ):
+                raise HomeAssistantError(f"Unknown family member device {device_id}")
+            return runtime
+
+        by_entry = self._by_key.get(normalize_member(name)) if name else None
+        if not by_entry:
+            raise HomeAssistantError(f"Unknown family member {name}")
+        if len(by_entry) > 1:
+            raise HomeAssistantError(
+                f"Family member {name} exists in several entries, use device_id"
+            )
+        return next(iter(by_entry.values()))
+
+
+@callback
+def async_get_member_directory(hass: HomeAssistant) -> MemberDirectory:
+    """Return the domain-wide member directory."""
+    directory = hass.data[DOMAIN].get("member_directory")
+    if directory is None:
+        directory = hass.data[DOMAIN]["member_directory"] = MemberDirectory()
+    return directory
@@ -1,23 +1,23 @@
 """Select platform for Family Health Tracker."""
 import logging
+from collections.abc import Iterable
 from typing import Any
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.const import CONF_NAME, UnitOfTemperature
 
 from .const import (
     DOMAIN,
-    CONF_MEMBERS,
-    CONF_MEDICATIONS,
+    SIGNAL_MEMBERS_ADDED,
     ATTR_TEMPERATURE,
     ATTR_MEDICATION,
-    VERSION,
-    get_medication_options,
 )
+from .runtime import MemberRuntime
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,53 +27,50 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Family Health Tracker select inputs."""
-    members = [member.strip() for member in config_entry.data[CONF_MEMBERS].split(",")]
+    @callback
+    def _async_add_members(runtimes: Iterable[MemberRuntime]) -> None:
+        entities = []
+        for runtime in runtimes:
+            med_input = MedicationInput(hass, runtime, runtime.device_info)
+            runtime.medication_input = med_input
+            entities.append(med_input)
 
-    entities = []
-    for member in members:
-        member_lower = member.lower()
-        device_id = f"{config_entry.entry_id}_{member_lower}"
-        
-        device_info = DeviceInfo(
-            identifiers={(DOMAIN, device_id)},
-            name=member,
-            manufacturer="Family Health Tracker",
-            model="Health Monitor",
-            sw_version=VERSION,
-            via_device=(DOMAIN, config_entry.entry_id),
-        )
+            # Debug log the entity ID being created
+            _LOGGER.debug(
+                "Creating medication input entity with ID: select.%s_%s_medication_input",
+                config_entry.entry_id,
+                runtime.key
+            )
+        async_add_entities(entities)
 
-        med_input = MedicationInput(hass, member, device_info, config_entry.entry_id)
-        entities.append(med_input)
-        
-        # Debug log the entity ID being created
-        _LOGGER.debug(
-            "Creating medication input entity with ID: select.%s_%s_medication_input",
-            config_entry.entry_id,
-            member_lower
+    _async_add_members(hass.data[DOMAIN][config_entry.entry_id]["members"].values())
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_MEMBERS_ADDED.format(config_entry.entry_id),
+            _async_add_members,
         )
-
-    async_add_entities(entities, True)
+    )
 
 class MedicationInput(SelectEntity):
     """Medication input for a family member."""
 
-    def __init__(self, hass: HomeAssistant, name: str, device_info: DeviceInfo, entry_id: str) -> None:
+    def __init__(self, hass: HomeAssistant, member: MemberRuntime, device_info: DeviceInfo) -> None:
         """Initialize the input."""
         self._hass = hass
-        self._name = name
-        self._entry_id = entry_id
+        self._member = member
+        self._name = name = member.name
+        self._entry_id = member.entry_id
         self._attr_device_info = device_info
         self._attr_unique_id = f"{self._entry_id}_{name.lower()}_medication_input"
         self.entity_id = f"select.medication_{name.lower()}"
         self._attr_name = f"{name} Medication Input"
         self._attr_icon = "mdi:pill"
         
-        # Get medication options using the helper function
-        user_medications = self._hass.data[DOMAIN].get(CONF_MEDICATIONS, {})
-        medication_options = get_medication_options(user_medications)
-        self._options_map = {opt["value"]: opt["label"] for opt in medication_options}
-        self._attr_options = [opt["value"] for opt in medication_options]
+        # Get medication options from the precomputed index
+        self._medications = hass.data[DOMAIN][self._entry_id]["medications"]
+        self._options_version = self._medications.version
+        self._attr_options = list(self._medications.value_list)
         self._attr_current_option = self._attr_options[0]
 
     @property
@@ -94,10 +91,10 @@ class MedicationInput(SelectEntity):
         # Update options when medications change
         async def _update_options(event=None):
             """Update options from current medications."""
-            user_medications = self._hass.data[DOMAIN].get(CONF_MEDICATIONS, {})
-            medication_options = get_medication_options(user_medications)
-            self._options_map = {opt["value"]: opt["label"] for opt in medication_options}
-            self._attr_options = [opt["value"] for opt in medication_options]
+            if self._options_version == self._medications.version:
+                return
+            self._options_version = self._medications.version
+            self._attr_options = list(self._medications.value_list)
             self.async_write_ha_state()
 
         # Listen for config entry updates
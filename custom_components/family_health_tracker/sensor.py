@@ -1,5 +1,6 @@
 """Sensor platform for Family Health Tracker."""
 import logging
+from collections.abc import Iterable
 from typing import Any, Dict, Optional
 from datetime import datetime
 
@@ -9,22 +10,33 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.const import CONF_NAME, UnitOfTemperature
+from homeassistant.const import CONF_NAME, EntityCategory, UnitOfTemperature
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
-    CONF_MEMBERS,
+    SIGNAL_MEMBERS_ADDED,
     ATTR_TEMPERATURE,
     ATTR_MEDICATION,
-    VERSION,
-    TEMP_LEVELS,
     DEFAULT_MEDICATIONS,
-    get_combined_medications,
-    CONF_MEDICATIONS
+    CONF_STATISTICS_WINDOWS,
+    CONF_COMPACT_ATTRIBUTES,
+    ATTR_DOSAGE,
+    ATTR_INTERVAL,
+    ATTR_CATEGORY,
+    DEFAULT_STATISTICS_WINDOWS,
+    DURATION_REFRESH_SECONDS,
+    FEVER_THRESHOLD,
 )
+from .levels import get_levels
+from .rolling import RollingWindow
+from .runtime import MemberRuntime
+from .snapshot import state_from_history
+from .ticker import async_get_ticker
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,49 +48,102 @@ async def async_setup_entry(
     """Set up the Family Health Tracker sensor."""
     _LOGGER.debug("Setting up sensors for config entry: %s", config_entry.data)
 
-    members = [member.strip() for member in config_entry.data[CONF_MEMBERS].split(",")]
-
-    entities = []
-    for member in members:
-        member_lower = member.lower()
-        device_id = f"{config_entry.entry_id}_{member_lower}"
-        
-        device_info = DeviceInfo(
-            identifiers={(DOMAIN, device_id)},
-            name=member,
-            manufacturer="Family Health Tracker",
-            model="Health Monitor",
-            sw_version=VERSION,
-            via_device=(DOMAIN, config_entry.entry_id),
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    windows = config_entry.options.get(CONF_STATISTICS_WINDOWS, DEFAULT_STATISTICS_WINDOWS)
+    compact = config_entry.options.get(CONF_COMPACT_ATTRIBUTES, False)
+
+    hub_entities = [MedicationLibrarySensor(hass, config_entry)]
+    if entry_data["metrics"].enabled:
+        hub_entities.append(LatencySensor(hass, config_entry))
+    async_add_entities(hub_entities)
+
+    @callback
+    def _async_add_members(runtimes: Iterable[MemberRuntime]) -> None:
+        now = dt_util.utcnow().timestamp()
+        entities = []
+        for runtime in runtimes:
+            device_info = runtime.device_info
+            temp_sensor = TemperatureSensor(hass, runtime, device_info, compact=compact)
+            med_sensor = MedicationSensor(hass, runtime, device_info, compact=compact)
+            duration_sensor = LastMedicationDurationSensor(hass, runtime, device_info)
+            level_sensor = TemperatureLevelSensor(hass, runtime, device_info, compact=compact)
+            entities.extend([temp_sensor, med_sensor, duration_sensor, level_sensor])
+
+            # Attach sensor references to the member runtime
+            runtime.temperature_sensor = temp_sensor
+            runtime.medication_sensor = med_sensor
+            runtime.duration_sensor = duration_sensor
+            runtime.level_sensor = level_sensor
+
+            # Populate the sensors before they are added; done before the
+            # statistics sensors exist so the reading is not counted twice
+            _restore_member(runtime)
+
+            # Rolling statistics, seeded once from the in-memory history
+            runtime.statistics_sensors = [
+                TemperatureStatisticsSensor(hass, runtime, device_info, hours)
+                for hours in windows
+            ]
+            if windows:
+                ring = runtime.history.ring(runtime.key)
+                for measurement in ring.since(now - max(windows) * 3600):
+                    if measurement.temperature is None:
+                        continue
+                    for stats_sensor in runtime.statistics_sensors:
+                        stats_sensor.add_reading(measurement.timestamp, measurement.temperature)
+            entities.extend(runtime.statistics_sensors)
+
+        async_add_entities(entities)
+
+    _async_add_members(entry_data["members"].values())
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_MEMBERS_ADDED.format(config_entry.entry_id),
+            _async_add_members,
+        )
+    )
+
+def _restore_member(runtime: MemberRuntime) -> None:
+    """Restore a member's sensors from the state snapshot or its history."""
+    state = runtime.snapshot.get(runtime.key)
+    if state is None:
+        state = state_from_history(runtime.history.ring(runtime.key))
+
+    def _local(timestamp: float) -> datetime:
+        return dt_util.as_local(dt_util.utc_from_timestamp(timestamp))
+
+    if "temperature" in state:
+        measured_at = _local(state["temperature_at"])
+        runtime.temperature_sensor.set_temperature(state["temperature"], measured_at)
+        # The level follows from the temperature and the current ranges
+        runtime.level_sensor.set_temperature(state["temperature"])
+    if "medication" in state:
+        runtime.medication_sensor.set_medication(
+            state["medication"], _local(state["medication_at"])
+        )
+    if "last_dose" in state:
+        runtime.duration_sensor.set_medication_time(
+            state["last_dose"], _local(state["last_dose_at"])
         )
-
-        temp_sensor = TemperatureSensor(hass, member, device_info, config_entry.entry_id)
-        med_sensor = MedicationSensor(hass, member, device_info, config_entry.entry_id)
-        duration_sensor = LastMedicationDurationSensor(hass, member, device_info, config_entry.entry_id)
-        level_sensor = TemperatureLevelSensor(hass, member, device_info, config_entry.entry_id)
-        entities.extend([temp_sensor, med_sensor, duration_sensor, level_sensor])
-
-        # Store sensor references
-        entity_id_temp = f"sensor.temperature_{member_lower}"
-        entity_id_med = f"sensor.medication_{member_lower}"
-        entity_id_duration = f"sensor.medication_duration_{member_lower}"
-        entity_id_level = f"sensor.temperature_level_{member_lower}"
-
-        hass.data[DOMAIN][config_entry.entry_id][entity_id_temp] = temp_sensor
-        hass.data[DOMAIN][config_entry.entry_id][entity_id_med] = med_sensor
-        hass.data[DOMAIN][config_entry.entry_id][entity_id_duration] = duration_sensor
-        hass.data[DOMAIN][config_entry.entry_id][entity_id_level] = level_sensor
-
-    async_add_entities(entities, True)
 
 class TemperatureSensor(SensorEntity):
     """Temperature sensor for a family member."""
 
-    def __init__(self, hass: HomeAssistant, name: str, device_info: DeviceInfo, entry_id: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        member: MemberRuntime,
+        device_info: DeviceInfo,
+        *,
+        compact: bool = False,
+    ) -> None:
         """Initialize the sensor."""
         self._hass = hass
-        self._name = name
-        self._entry_id = entry_id
+        self._member = member
+        self._name = name = member.name
+        self._entry_id = member.entry_id
+        self._compact = compact
         self._state = None
         self._last_updated = None
         
@@ -90,10 +155,10 @@ class TemperatureSensor(SensorEntity):
         self.entity_id = f"sensor.temperature_{name.lower()}"
         self._attr_name = f"{name} Temperature"
 
-        self._attributes = {
-            "last_measurement": None,
-            "last_updated": None
-        }
+        # last_measurement repeats the state, so compact mode leaves it out
+        self._attributes = {"last_updated": None}
+        if not compact:
+            self._attributes["last_measurement"] = None
 
     @property
     def state(self) -> Optional[float]:
@@ -105,41 +170,51 @@ class TemperatureSensor(SensorEntity):
         """Return the state attributes."""
         return self._attributes
 
-    async def update_temperature(self, temperature: float) -> None:
-        """Update temperature measurement."""
+    def set_temperature(self, temperature: float, measured_at: datetime) -> None:
+        """Set the temperature without writing the state."""
         self._state = temperature
-        self._last_updated = datetime.now().isoformat()
-        self._attributes["last_measurement"] = temperature
+        self._last_updated = measured_at.isoformat()
+        if not self._compact:
+            self._attributes["last_measurement"] = temperature
         self._attributes["last_updated"] = self._last_updated
-        self.async_schedule_update_ha_state()
 
-        # Update the level sensor
-        name_lower = self._name.lower()
-        level_sensor_id = f"sensor.temperature_level_{name_lower}"
-        level_sensor = self._hass.data[DOMAIN][self._entry_id].get(level_sensor_id)
-        if level_sensor:
-            await level_sensor.update_temperature(temperature)
+        timestamp = measured_at.timestamp()
+        for stats_sensor in self._member.statistics_sensors:
+            stats_sensor.add_reading(timestamp, temperature)
 
 class MedicationSensor(SensorEntity):
     """Medication sensor for a family member."""
 
-    def __init__(self, hass: HomeAssistant, name: str, device_info: DeviceInfo, entry_id: str) -> None:
+    # Library metadata is static; the library sensor on the hub holds it
+    _unrecorded_attributes = frozenset({ATTR_DOSAGE, ATTR_INTERVAL, ATTR_CATEGORY})
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        member: MemberRuntime,
+        device_info: DeviceInfo,
+        *,
+        compact: bool = False,
+    ) -> None:
         """Initialize the sensor."""
         self._hass = hass
-        self._name = name
-        self._entry_id = entry_id
+        self._member = member
+        self._name = name = member.name
+        self._entry_id = member.entry_id
+        self._compact = compact
         self._state = "none"
         self._last_updated = None
 
         self._attr_device_info = device_info
+        self._medications = hass.data[DOMAIN][self._entry_id]["medications"]
         self._attr_unique_id = f"{self._entry_id}_{name.lower()}_medication"
         self.entity_id = f"sensor.medication_{name.lower()}"
         self._attr_name = f"{name} Medication"
 
-        self._attributes = {
-            "last_medication": None,
-            "last_updated": None
-        }
+        # last_medication repeats the state, so compact mode leaves it out
+        self._attributes = {"last_updated": None}
+        if not compact:
+            self._attributes["last_medication"] = None
 
     @property
     def state(self) -> str:
@@ -149,44 +224,29 @@ class MedicationSensor(SensorEntity):
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """Return the state attributes."""
+        if self._compact or self._state == "none":
+            return self._attributes
         attributes = self._attributes.copy()
-        if self._state != "none":
-            user_medications = self._hass.data[DOMAIN].get(CONF_MEDICATIONS, {})
-            med_info = get_combined_medications(user_medications).get(self._state, {})
-            attributes.update({
-                "dosage": med_info.get("dosage"),
-                "interval_hours": med_info.get("interval_hours"),
-                "category": med_info.get("category")
-            })
+        attributes.update(self._medications.attributes(self._state))
         return attributes
 
-    async def update_medication(self, medication: str) -> None:
-        """Update medication status."""
-        _LOGGER.debug("Updating medication for %s to %s", self._name, medication)
+    def set_medication(self, medication: str, measured_at: datetime) -> None:
+        """Set the medication without writing the state."""
         self._state = medication
-        self._last_updated = datetime.now().isoformat()
-        self._attributes["last_medication"] = medication
+        self._last_updated = measured_at.isoformat()
+        if not self._compact:
+            self._attributes["last_medication"] = medication
         self._attributes["last_updated"] = self._last_updated
-        self.async_schedule_update_ha_state()
-
-        # Update the duration sensor
-        name_lower = self._name.lower()
-        duration_sensor_id = f"sensor.medication_duration_{name_lower}"
-        duration_sensor = self._hass.data[DOMAIN][self._entry_id].get(duration_sensor_id)
-        if duration_sensor:
-            _LOGGER.debug("Found duration sensor, updating time")
-            await duration_sensor.update_medication_time(medication)
-        else:
-            _LOGGER.warning("Could not find duration sensor: %s", duration_sensor_id)
 
 class LastMedicationDurationSensor(SensorEntity):
     """Sensor tracking duration since last medication."""
 
-    def __init__(self, hass: HomeAssistant, name: str, device_info: DeviceInfo, entry_id: str) -> None:
+    def __init__(self, hass: HomeAssistant, member: MemberRuntime, device_info: DeviceInfo) -> None:
         """Initialize the sensor."""
         self._hass = hass
-        self._name = name
-        self._entry_id = entry_id
+        self._member = member
+        self._name = name = member.name
+        self._entry_id = member.entry_id
         self._state = None
         self._last_medication_time = None
 
@@ -197,39 +257,85 @@ class LastMedicationDurationSensor(SensorEntity):
         self.entity_id = f"sensor.medication_duration_{name.lower()}"
         self._attr_name = f"{name} Time Since Medication"
         self._attr_translation_key = "medication_duration"
+        self._refreshed_value = None
 
     @property
     def native_value(self) -> float | None:
         """Return the duration in hours."""
         if self._last_medication_time is None:
             return None
-        now = datetime.now()
-        duration = now - self._last_medication_time
+        duration = dt_util.now() - self._last_medication_time
         return round(duration.total_seconds() / 3600, 1)  # Convert to hours with 1 decimal
 
-    async def update_medication_time(self, medication: str) -> None:
-        """Update the last medication time."""
-        _LOGGER.debug(
-            "Updating medication time for %s. Medication: %s, Current time: %s",
-            self._name,
-            medication,
-            datetime.now()
-        )
-        if medication != "none":  # Use string literal instead of constant
-            self._last_medication_time = datetime.now()
-            _LOGGER.debug("Updated last medication time to: %s", self._last_medication_time)
-            self.async_schedule_update_ha_state()
-        else:
-            _LOGGER.debug("Skipping update for 'none' medication")
+    async def async_added_to_hass(self) -> None:
+        """Register with the shared ticker once a medication is known."""
+        if self._last_medication_time is not None:
+            async_get_ticker(self._hass).async_track(self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop the shared ticker from refreshing this sensor."""
+        async_get_ticker(self._hass).async_untrack(self)
+
+    @callback
+    def async_tick(self) -> bool:
+        """Write the state if the displayed duration changed.
+
+        Called by the shared ticker; returns True if the state was written.
+        """
+        value = self.native_value
+        if value == self._refreshed_value:
+            return False
+        self._refreshed_value = value
+        self.async_write_ha_state()
+        return True
+
+    def next_refresh(self, now: float) -> float:
+        """Return when the rounded duration next steps up.
+
+        The value rounds to 0.1 h, so it changes half a step past each
+        multiple of DURATION_REFRESH_SECONDS since the medication.
+        """
+        start = self._last_medication_time.timestamp() + DURATION_REFRESH_SECONDS / 2
+        steps = (now - start) // DURATION_REFRESH_SECONDS + 1
+        return start + steps * DURATION_REFRESH_SECONDS
+
+    def set_medication_time(self, medication: str, measured_at: datetime) -> bool:
+        """Set the last medication time without writing the state.
+
+        Returns True if the medication time changed.
+        """
+        if medication == "none":  # Use string literal instead of constant
+            return False
+        if (
+            self._last_medication_time is not None
+            and measured_at < self._last_medication_time
+        ):
+            return False
+        self._last_medication_time = measured_at
+        if self.hass is not None:
+            async_get_ticker(self._hass).async_track(self)
+        return True
 
 class TemperatureLevelSensor(SensorEntity):
     """Temperature level sensor for a family member."""
 
-    def __init__(self, hass: HomeAssistant, name: str, device_info: DeviceInfo, entry_id: str) -> None:
+    # The range table is static; the library sensor on the hub holds it
+    _unrecorded_attributes = frozenset({"ranges"})
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        member: MemberRuntime,
+        device_info: DeviceInfo,
+        *,
+        compact: bool = False,
+    ) -> None:
         """Initialize the sensor."""
         self._hass = hass
-        self._name = name
-        self._entry_id = entry_id
+        self._member = member
+        self._name = name = member.name
+        self._entry_id = member.entry_id
+        self._compact = compact
         self._state = None
         self._current_temp = None
         
@@ -240,9 +346,8 @@ class TemperatureLevelSensor(SensorEntity):
         self._attr_translation_key = "temperature_level"
 
         # Get custom ranges from config if available
-        self._temp_levels = TEMP_LEVELS
-        if hass.data.get(DOMAIN, {}).get("temp_levels"):
-            self._temp_levels = hass.data[DOMAIN]["temp_levels"]
+        self._levels = get_levels(hass, member.key)
+        self._temp_levels = self._levels.ranges
 
     @property
     def state(self) -> str | None:
@@ -250,8 +355,12 @@ class TemperatureLevelSensor(SensorEntity):
         return self._state
 
     @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
+    def extra_state_attributes(self) -> Dict[str, Any] | None:
         """Return the state attributes."""
+        if self._compact:
+            # The temperature sensor already records the temperature, and
+            # without it the state only changes when the level does
+            return None
         return {
             "temperature": self._current_temp,
             "ranges": self._temp_levels
@@ -259,13 +368,192 @@ class TemperatureLevelSensor(SensorEntity):
 
     def _get_level(self, temperature: float) -> str:
         """Determine temperature level based on current ranges."""
-        for level, range_data in self._temp_levels.items():
-            if range_data["min"] <= temperature <= range_data["max"]:
-                return level
-        return "unknown"
+        return self._levels.classify(temperature)
 
-    async def update_temperature(self, temperature: float) -> None:
-        """Update temperature level."""
+    def set_temperature(self, temperature: float) -> None:
+        """Set the temperature level without writing the state."""
         self._current_temp = temperature
         self._state = self._get_level(temperature)
-        self.async_schedule_update_ha_state()
\ No newline at end of file
+
+class TemperatureStatisticsSensor(SensorEntity):
+    """Rolling temperature statistics for a family member."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        member: MemberRuntime,
+        device_info: DeviceInfo,
+        window_hours: float,
+    ) -> None:
+        """Initialize the sensor."""
+        self._hass = hass
+        self._member = member
+        self._name = name = member.name
+        self._entry_id = member.entry_id
+        self._window_hours = window_hours
+        self._window = RollingWindow(window_hours * 3600)
+        self._ticked_value = None
+
+        self._attr_device_info = device_info
+        self._attr_device_class = SensorDeviceClass.TEMPERATURE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+        self._attr_unique_id = f"{self._entry_id}_{name.lower()}_temperature_stats_{window_hours}h"
+        self.entity_id = f"sensor.temperature_stats_{window_hours}h_{name.lower()}"
+        self._attr_name = f"{name} Temperature {window_hours}h Average"
+        self._attr_translation_key = "temperature_statistics"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the mean temperature over the window."""
+        self._window.evict(dt_util.utcnow().timestamp())
+        mean = self._window.mean
+        return round(mean, 2) if mean is not None else None
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the state attributes."""
+        window = self._window
+        now = dt_util.utcnow().timestamp()
+        window.evict(now)
+        std_dev = window.std_dev
+        return {
+            "window_hours": self._window_hours,
+            "samples": window.count,
+            "min": window.minimum,
+            "max": window.maximum,
+            "std_dev": round(std_dev, 3) if std_dev is not None else None,
+            f"hours_above_{FEVER_THRESHOLD:g}": round(window.seconds_above(now) / 3600, 2),
+        }
+
+    def add_reading(self, timestamp: float, temperature: float) -> None:
+        """Add a reading without writing the state."""
+        self._window.add(timestamp, temperature)
+        if self.hass is not None:
+            async_get_ticker(self._hass).async_track(self)
+
+    async def async_added_to_hass(self) -> None:
+        """Register with the shared ticker while the window has data."""
+        if self._window.count:
+            async_get_ticker(self._hass).async_track(self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop the shared ticker from refreshing this sensor."""
+        async_get_ticker(self._hass).async_untrack(self)
+
+    @callback
+    def async_tick(self) -> bool:
+        """Write the state if readings slid out of the window.
+
+        Called by the shared ticker; returns True if the state was written.
+        """
+        now = dt_util.utcnow().timestamp()
+        self._window.evict(now)
+        value = (self._window.count, round(self._window.seconds_above(now) / 3600, 2))
+        if not self._window.count and not value[1]:
+            async_get_ticker(self._hass).async_untrack(self)
+        if value == self._ticked_value:
+            return False
+        self._ticked_value = value
+        self.async_write_ha_state()
+        return True
+
+    def next_refresh(self, now: float) -> float:
+        """Return the next multiple of DURATION_REFRESH_SECONDS."""
+        return (now // DURATION_REFRESH_SECONDS + 1) * DURATION_REFRESH_SECONDS
+
+
+class MedicationLibrarySensor(SensorEntity):
+    """Hub sensor holding the static reference data of a config entry.
+
+    The medication library and the temperature level ranges rarely change,
+    so they live here once instead of on every member sensor write.
+    """
+
+    _unrecorded_attributes = frozenset({"medications", "ranges", "member_ranges"})
+
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self._hass = hass
+        self._entry_id = config_entry.entry_id
+        self._medications = hass.data[DOMAIN][self._entry_id]["medications"]
+        self._members = hass.data[DOMAIN][self._entry_id]["members"]
+
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, self._entry_id)})
+        self._attr_unique_id = f"{self._entry_id}_medication_library"
+        self.entity_id = "sensor.medication_library"
+        self._attr_name = "Medication Library"
+        self._attr_translation_key = "medication_library"
+        self._attr_native_unit_of_measurement = "medications"
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of medications in the library."""
+        return len(self._medications)
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the library and the temperature level ranges."""
+        shared = get_levels(self._hass)
+        attributes = {
+            "medications": dict(self._medications.medications),
+            "ranges": shared.ranges,
+        }
+        member_ranges = {}
+        for runtime in self._members.values():
+            levels = get_levels(self._hass, runtime.key)
+            if levels is not shared:
+                member_ranges[runtime.name] = levels.ranges
+        if member_ranges:
+            attributes["member_ranges"] = member_ranges
+        return attributes
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh when the medication library changes."""
+
+        @callback
+        def _library_updated(event) -> None:
+            if event.data.get("entry_id") == self._entry_id:
+                self.async_schedule_update_ha_state()
+
+        self.async_on_remove(
+            self._hass.bus.async_listen(f"{DOMAIN}_medications_updated", _library_updated)
+        )
+
+
+class LatencySensor(SensorEntity):
+    """Hub diagnostic sensor exposing the entry's latency instrumentation.
+
+    Only created while instrumentation is enabled. The state is the p95
+    latency of add_measurement; the attributes hold every histogram
+    summary and counter. It is polled, so recording stays write free.
+    """
+
+    _unrecorded_attributes = frozenset({"latency", "counters"})
+
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self._hass = hass
+        self._entry_id = config_entry.entry_id
+        self._metrics = hass.data[DOMAIN][self._entry_id]["metrics"]
+
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, self._entry_id)})
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_should_poll = True
+        self._attr_unique_id = f"{self._entry_id}_record_latency"
+        self.entity_id = "sensor.record_latency"
+        self._attr_name = "Record Latency"
+        self._attr_translation_key = "record_latency"
+        self._attr_native_unit_of_measurement = "ms"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the p95 latency of add_measurement."""
+        histogram = self._metrics.histogram("add_measurement")
+        return histogram.percentile(0.95) if histogram is not None else None
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the latency summaries and counters."""
+        data = self._metrics.as_dict()
+        return {"latency": data["latency"], "counters": data["counters"]}
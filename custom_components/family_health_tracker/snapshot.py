@@ -0,0 +1,100 @@
+"""Last known member state for Family Health Tracker."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import SNAPSHOT_SAVE_DELAY, SNAPSHOT_STORAGE_KEY, SNAPSHOT_STORAGE_VERSION
+from .history import MeasurementRing
+
+
+class StateSnapshot:
+    """Last temperature, medication and dose time of every member of an entry.
+
+    Everything lives in one small storage file that is read once at setup,
+    so every sensor has its value before its first state write. Updates
+    only touch memory and schedule a delayed save.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the snapshot."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{SNAPSHOT_STORAGE_KEY}.{entry_id}"
+        )
+        self._members: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the snapshot."""
+        data = await self._store.async_load() or {}
+        self._members = data.get("members", {})
+
+    async def async_save(self) -> None:
+        """Write the snapshot now."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the persisted snapshot."""
+        await self._store.async_remove()
+
+    def get(self, member_key: str) -> dict[str, Any] | None:
+        """Return the last known state of a member."""
+        return self._members.get(member_key)
+
+    @callback
+    def async_update(
+        self,
+        member_key: str,
+        timestamp: float,
+        temperature: float | None,
+        medication: str,
+    ) -> None:
+        """Fold a measurement into the member's last known state."""
+        state = self._members.setdefault(member_key, {})
+        changed = _apply(state, timestamp, temperature, medication)
+        if changed:
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the snapshot to persist."""
+        return {"members": self._members}
+
+
+def _apply(
+    state: dict[str, Any],
+    timestamp: float,
+    temperature: float | None,
+    medication: str,
+) -> bool:
+    """Update state with a measurement unless it holds newer values."""
+    changed = False
+    if temperature is not None and timestamp >= state.get("temperature_at", 0):
+        state["temperature"] = temperature
+        state["temperature_at"] = timestamp
+        changed = True
+    if timestamp >= state.get("medication_at", 0):
+        state["medication"] = medication
+        state["medication_at"] = timestamp
+        changed = True
+    if medication != "none" and timestamp >= state.get("last_dose_at", 0):
+        state["last_dose"] = medication
+        state["last_dose_at"] = timestamp
+        changed = True
+    return changed
+
+
+def state_from_history(ring: MeasurementRing) -> dict[str, Any]:
+    """Rebuild a member's last known state from its history ring.
+
+    Used for members without a snapshot yet, e.g. right after an upgrade.
+    Walks back from the newest measurement until every field is known.
+    """
+    state: dict[str, Any] = {}
+    for index in range(len(ring) - 1, -1, -1):
+        timestamp, temperature, medication = ring[index]
+        _apply(state, timestamp, temperature, medication)
+        if "temperature" in state and "last_dose" in state:
+            break
+    return state
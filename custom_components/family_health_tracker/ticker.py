@@ -0,0 +1,134 @@
+"""Shared refresh timer for time-dependent sensors."""
+from __future__ import annotations
+
+import heapq
+import logging
+from datetime import datetime
+from itertools import count
+from typing import Protocol
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TickingSensor(Protocol):
+    """A sensor whose value changes with elapsed time."""
+
+    def async_tick(self) -> bool:
+        """Write the state if the displayed value changed; return True if written."""
+
+    def next_refresh(self, now: float) -> float:
+        """Return the timestamp after now at which the displayed value changes."""
+
+
+class DurationTicker:
+    """Refresh every active time-dependent sensor from a single timer.
+
+    Each sensor reports when its displayed value next changes, so a duration
+    rolls over when its own 0.1 h step is reached rather than on a shared
+    grid. Those moments live in a min-heap with lazy invalidation, like the
+    dose deadlines, and one timer is armed for the earliest: a wake only
+    pops the sensors that are due and rearms in O(log n). Only sensors with
+    something to show (a recorded medication, readings in a statistics
+    window) are tracked, and the timer is cancelled while none are, so idle
+    installs do no work.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the ticker."""
+        self._hass = hass
+        self._heap: list[tuple[float, int, TickingSensor]] = []
+        self._sequence = count()
+        self._due: dict[TickingSensor, float] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+        self._armed: float | None = None
+
+    @callback
+    def async_track(self, sensor: TickingSensor) -> None:
+        """Start refreshing a sensor, or reschedule it after its value changed."""
+        due = sensor.next_refresh(dt_util.utcnow().timestamp())
+        if self._due.get(sensor) == due:
+            return
+        self._push(sensor, due)
+        self._compact()
+        if self._armed is None or due < self._armed:
+            self._arm()
+
+    @callback
+    def async_untrack(self, sensor: TickingSensor) -> None:
+        """Stop refreshing a sensor."""
+        self._due.pop(sensor, None)
+        if not self._due:
+            self._heap.clear()
+            self._disarm()
+
+    def _push(self, sensor: TickingSensor, due: float) -> None:
+        self._due[sensor] = due
+        heapq.heappush(self._heap, (due, next(self._sequence), sensor))
+
+    def _compact(self) -> None:
+        """Drop stale heap entries once they outnumber the live ones."""
+        if len(self._heap) > 2 * len(self._due) + 16:
+            self._heap = [
+                item for item in self._heap if self._due.get(item[2]) == item[0]
+            ]
+            heapq.heapify(self._heap)
+
+    @callback
+    def _disarm(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+        self._unsub = None
+        self._armed = None
+
+    @callback
+    def _arm(self) -> None:
+        """Arm the timer for the earliest live refresh."""
+        self._disarm()
+        heap = self._heap
+        while heap and self._due.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        if not heap:
+            return
+        self._armed = heap[0][0]
+        self._unsub = async_track_point_in_utc_time(
+            self._hass, self._tick, dt_util.utc_from_timestamp(self._armed)
+        )
+
+    @callback
+    def _tick(self, _now: datetime) -> None:
+        """Write the state of every due sensor whose displayed value changed."""
+        self._unsub = None
+        self._armed = None
+        now = dt_util.utcnow().timestamp()
+        heap = self._heap
+        due: list[tuple[TickingSensor, float]] = []
+        while heap and heap[0][0] <= now:
+            at, _, sensor = heapq.heappop(heap)
+            if self._due.get(sensor) == at:
+                due.append((sensor, at))
+        written = 0
+        # Sensors may untrack or reschedule themselves while ticking
+        for sensor, at in due:
+            if sensor.async_tick():
+                written += 1
+            if self._due.get(sensor) == at:
+                self._push(sensor, sensor.next_refresh(now))
+        _LOGGER.debug(
+            "Tick refreshed %s of %s due sensors", written, len(due)
+        )
+        self._arm()
+
+
+@callback
+def async_get_ticker(hass: HomeAssistant) -> DurationTicker:
+    """Return the domain-wide duration ticker."""
+    ticker = hass.data[DOMAIN].get("duration_ticker")
+    if ticker is None:
+        ticker = hass.data[DOMAIN]["duration_ticker"] = DurationTicker(hass)
+    return ticker
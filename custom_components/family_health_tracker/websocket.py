@@ -0,0 +1,202 @@
+"""Websocket API for Family Health Tracker."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.const import CONF_DEVICE_ID, CONF_NAME
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CURSOR,
+    ATTR_END,
+    ATTR_LIMIT,
+    ATTR_START,
+    DOMAIN,
+    EVENT_MEASUREMENT,
+    HISTORY_MAX_PAGE_SIZE,
+    HISTORY_PAGE_SIZE,
+)
+from .query import query_page
+from .runtime import async_get_member_directory, normalize_member
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe_measurements)
+    websocket_api.async_register_command(hass, ws_history)
+
+
+class MeasurementSubscription:
+    """Server-side filtered, rate limited feed of measurement events.
+
+    Events that do not match the filters are dropped in the event loop.
+    With a minimum interval, at most one message is sent per interval,
+    carrying only the newest measurement of each member since the last
+    one; earlier ones are counted as coalesced.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        entry_id: str | None,
+        members: set[str] | None,
+        levels: set[str] | None,
+        min_interval: float,
+    ) -> None:
+        """Initialize the subscription."""
+        self._hass = hass
+        self._connection = connection
+        self._msg_id = msg_id
+        self._entry_id = entry_id
+        self._members = members
+        self._levels = levels
+        self._min_interval = min_interval
+        self._pending: dict[tuple[str, str], dict[str, Any]] = {}
+        self._coalesced = 0
+        self._last_sent: float | None = None
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._unsub_event = hass.bus.async_listen(EVENT_MEASUREMENT, self._async_handle)
+
+    @callback
+    def _async_handle(self, event: Event) -> None:
+        """Filter a measurement event and send or queue it."""
+        data = event.data
+        if (
+            (self._entry_id is not None and data["entry_id"] != self._entry_id)
+            or (self._members is not None and data["member"] not in self._members)
+            or (self._levels is not None and data["level"] not in self._levels)
+        ):
+            return
+
+        if not self._min_interval:
+            self._send([data], 0)
+            return
+
+        key = (data["entry_id"], data["member"])
+        if key in self._pending:
+            self._coalesced += 1
+        self._pending[key] = data
+        if self._unsub_flush is not None:
+            return
+        now = self._hass.loop.time()
+        wait = 0.0 if self._last_sent is None else self._last_sent + self._min_interval - now
+        if wait <= 0:
+            self._async_flush()
+        else:
+            self._unsub_flush = async_call_later(self._hass, wait, self._async_flush)
+
+    @callback
+    def _async_flush(self, _now: Any = None) -> None:
+        """Send the queued measurements."""
+        self._unsub_flush = None
+        if not self._pending:
+            return
+        measurements = list(self._pending.values())
+        coalesced = self._coalesced
+        self._pending = {}
+        self._coalesced = 0
+        self._send(measurements, coalesced)
+
+    def _send(self, measurements: list[dict[str, Any]], coalesced: int) -> None:
+        self._last_sent = self._hass.loop.time()
+        self._connection.send_message(
+            websocket_api.event_message(
+                self._msg_id,
+                {"measurements": measurements, "coalesced": coalesced},
+            )
+        )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop the subscription."""
+        self._unsub_event()
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_measurements",
+        vol.Optional("entry_id"): cv.string,
+        vol.Optional("member"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("level"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("min_interval", default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=3600)
+        ),
+    }
+)
+@callback
+def ws_subscribe_measurements(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to new measurements, filtered and rate limited per subscriber."""
+    members = msg.get("member")
+    levels = msg.get("level")
+    subscription = MeasurementSubscription(
+        hass,
+        connection,
+        msg["id"],
+        msg.get("entry_id"),
+        {normalize_member(name) for name in members} if members else None,
+        set(levels) if levels else None,
+        msg["min_interval"],
+    )
+    connection.subscriptions[msg["id"]] = subscription.async_cancel
+    connection.send_result(msg["id"])
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/history",
+        vol.Exclusive(CONF_NAME, "member"): cv.string,
+        vol.Exclusive(CONF_DEVICE_ID, "member"): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_CURSOR): cv.string,
+        vol.Optional(ATTR_LIMIT, default=HISTORY_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=HISTORY_MAX_PAGE_SIZE)
+        ),
+    }
+)
+@callback
+def ws_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return one page of a member's readings within a time range."""
+    try:
+        runtime = async_get_member_directory(hass).resolve(
+            msg.get(CONF_NAME), msg.get(CONF_DEVICE_ID)
+        )
+    except HomeAssistantError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(err))
+        return
+
+    start = msg.get(ATTR_START)
+    end = msg.get(ATTR_END)
+    try:
+        page = query_page(
+            runtime,
+            dt_util.as_utc(start).timestamp() if start else None,
+            dt_util.as_utc(end).timestamp() if end else None,
+            msg.get(ATTR_CURSOR),
+            msg[ATTR_LIMIT],
+        )
+    except ValueError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, str(err))
+        return
+    connection.send_result(msg["id"], page)
@@ -0,0 +1,41 @@
+"""Tests for the Family Health Tracker integration."""
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+
+from custom_components.family_health_tracker.const import CONF_MEMBERS, DOMAIN
+from custom_components.family_health_tracker.runtime import MemberRuntime
+
+MEDICATIONS = {
+    "paracetamol": {
+        "name": "Paracetamol",
+        "label": "Paracetamol given",
+        "dosage": "250mg",
+        "interval_hours": 6,
+        "category": "fever_reducer",
+    }
+}
+
+
+async def async_setup_members(
+    hass: HomeAssistant, members: list[str], **options
+) -> MockConfigEntry:
+    """Set up a config entry for the given members."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Health Tracker",
+        data={CONF_NAME: "Health Tracker", CONF_MEMBERS: ", ".join(members)},
+        options=options,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def get_runtime(hass: HomeAssistant, entry: MockConfigEntry, key: str) -> MemberRuntime:
+    """Return the runtime of a loaded member."""
+    return hass.data[DOMAIN][entry.entry_id]["members"][key]
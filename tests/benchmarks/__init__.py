@@ -0,0 +1 @@
+"""Benchmarks for the Family Health Tracker integration."""
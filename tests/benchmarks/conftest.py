@@ -0,0 +1,117 @@
+"""Timing fixture and result reporting for the benchmarks.
+
+Each measurement runs a number of rounds and keeps the median and the
+fastest round per operation. Results are written as JSON with
+--benchmark-json, and --benchmark-compare fails any benchmark whose
+median is more than --benchmark-tolerance times the stored one, so two
+runs can be compared and regressions caught in CI.
+"""
+from __future__ import annotations
+
+import inspect
+import json
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+_RESULTS: dict[str, dict[str, Any]] = {}
+
+
+class Benchmark:
+    """Time callables and record the results under a name."""
+
+    def __init__(self, config: pytest.Config, baseline: dict[str, Any]) -> None:
+        """Initialize the benchmark."""
+        self._tolerance: float = config.getoption("--benchmark-tolerance")
+        self._baseline = baseline
+
+    async def async_measure(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        *,
+        ops: int = 1,
+        rounds: int = 5,
+        **extra: Any,
+    ) -> dict[str, Any]:
+        """Time func, a plain or async callable doing ops operations per call."""
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            result = func()
+            if inspect.isawaitable(result):
+                await result
+            timings.append((time.perf_counter() - started) / ops)
+        return self.record(name, timings, ops, **extra)
+
+    def record(
+        self, name: str, timings: list[float], ops: int = 1, **extra: Any
+    ) -> dict[str, Any]:
+        """Record per-operation timings in seconds, and check for a regression."""
+        median = statistics.median(timings)
+        result = {
+            "median_us": round(median * 1e6, 3),
+            "min_us": round(min(timings) * 1e6, 3),
+            "ops_per_s": round(1 / median) if median else None,
+            "rounds": len(timings),
+            "ops": ops,
+            **extra,
+        }
+        _RESULTS[name] = result
+
+        previous = self._baseline.get(name)
+        if previous is not None and median * 1e6 > previous["median_us"] * self._tolerance:
+            pytest.fail(
+                f"{name} regressed: {result['median_us']} us per operation, "
+                f"was {previous['median_us']} us"
+            )
+        return result
+
+
+@pytest.fixture(scope="session")
+def _benchmark_baseline(pytestconfig: pytest.Config) -> dict[str, Any]:
+    path = pytestconfig.getoption("--benchmark-compare")
+    if not path:
+        return {}
+    return json.loads(Path(path).read_text(encoding="utf-8"))["results"]
+
+
+@pytest.fixture
+def benchmark(
+    pytestconfig: pytest.Config, _benchmark_baseline: dict[str, Any]
+) -> Benchmark:
+    """Return the benchmark timer."""
+    return Benchmark(pytestconfig, _benchmark_baseline)
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Print the results and write them to --benchmark-json."""
+    if not _RESULTS:
+        return
+    width = max(map(len, _RESULTS))
+    lines = ["", "benchmark results (per operation):"]
+    for name, result in sorted(_RESULTS.items()):
+        lines.append(
+            f"  {name:<{width}}  median {result['median_us']:>12.3f} us"
+            f"  min {result['min_us']:>12.3f} us"
+        )
+    print("\n".join(lines))
+
+    path = session.config.getoption("--benchmark-json")
+    if path:
+        Path(path).write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": dict(sorted(_RESULTS.items())),
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
@@ -0,0 +1,37 @@
+"""Benchmark of the analytics over a synthetic multi-year history."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from custom_components.family_health_tracker.analytics import MemberSeries, summarize
+from custom_components.family_health_tracker.levels import DEFAULT_LEVELS
+
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+YEARS = 3
+INTERVAL = 15 * 60
+
+
+async def test_multi_year_summary(benchmark: Benchmark) -> None:
+    """Build the columns and summarize three years of 15 minute readings."""
+    rng = np.random.default_rng(0)
+    times = np.arange(0, YEARS * 365 * 86400, INTERVAL, dtype=np.float64)
+    temperatures = rng.normal(37.0, 0.8, times.size).round(1)
+    medications = np.where(
+        rng.random(times.size) < 0.02, "paracetamol", "none"
+    ).tolist()
+    columns = (times.tolist(), temperatures.tolist(), medications)
+    series = MemberSeries(*columns)
+    end = float(times[-1])
+
+    await benchmark.async_measure(
+        "analytics_build_columns", lambda: MemberSeries(*columns), readings=times.size
+    )
+    await benchmark.async_measure(
+        "analytics_summary_3y",
+        lambda: summarize(series, DEFAULT_LEVELS, None, end, 3600, 4 * 3600),
+        readings=times.size,
+    )
@@ -0,0 +1,97 @@
+"""Benchmark of device trigger dispatch with hundreds of attached triggers."""
+from __future__ import annotations
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_mock_service
+
+from homeassistant.components import automation
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.setup import async_setup_component
+
+from custom_components.family_health_tracker.const import DOMAIN, EVENT_MEASUREMENT
+
+from .. import async_setup_members, get_runtime
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+MEMBERS = 100
+MEASUREMENTS = 100
+TRIGGERS_PER_MEMBER = (
+    ("measurement_recorded", {}),
+    ("measurement_recorded", {}),
+    ("level_entered", {"level": "medium"}),
+    ("level_entered", {"level": "high"}),
+    ("dose_due", {}),
+)
+
+
+async def test_trigger_dispatch(hass: HomeAssistant, benchmark: Benchmark) -> None:
+    """A measurement with 500 triggers attached across 100 member devices.
+
+    Triggers listen on their own device's dispatcher signal, so a
+    measurement only wakes its member's five triggers. The second
+    measurement adds what a global event would cost on top: one event bus
+    listener per trigger, each filtering on the member.
+    """
+    entry = await async_setup_members(
+        hass, [f"Member {index}" for index in range(MEMBERS)]
+    )
+    runtimes = [
+        get_runtime(hass, entry, f"member {index}") for index in range(MEMBERS)
+    ]
+    async_mock_service(hass, "test", "automation")
+    assert await async_setup_component(
+        hass,
+        automation.DOMAIN,
+        {
+            automation.DOMAIN: [
+                {
+                    "trigger": {
+                        "platform": "device",
+                        "domain": DOMAIN,
+                        "device_id": runtime.device_id,
+                        "type": trigger_type,
+                        **extra,
+                    },
+                    "action": {"service": "test.automation"},
+                }
+                for runtime in runtimes
+                for trigger_type, extra in TRIGGERS_PER_MEMBER
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+    runtime = runtimes[7]
+
+    async def _measure() -> None:
+        for index in range(MEASUREMENTS):
+            runtime.async_fire_measurement(1_700_000_000 + index, 36.5, "none")
+        await hass.async_block_till_done()
+
+    await benchmark.async_measure(
+        "device_trigger_dispatch_500", _measure, ops=MEASUREMENTS
+    )
+
+    matched = 0
+
+    def _listener(member_key: str):
+        @callback
+        def _filter(event: Event) -> None:
+            nonlocal matched
+            if event.data["member"] == member_key:
+                matched += 1
+
+        return _filter
+
+    unsubs = [
+        hass.bus.async_listen(EVENT_MEASUREMENT, _listener(other.key))
+        for other in runtimes
+        for _ in TRIGGERS_PER_MEMBER
+    ]
+    await benchmark.async_measure(
+        "device_trigger_bus_filter_500", _measure, ops=MEASUREMENTS
+    )
+    for unsub in unsubs:
+        unsub()
+    assert matched == 5 * MEASUREMENTS * 5
@@ -0,0 +1,42 @@
+"""Benchmark of sustained measurement writes."""
+from __future__ import annotations
+
+from itertools import count
+from pathlib import Path
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.family_health_tracker.history import HistoryStore
+
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+WRITES = 10_000
+
+
+async def test_sustained_writes(
+    hass: HomeAssistant, benchmark: Benchmark, tmp_path: Path
+) -> None:
+    """Record measurements and flush them to the journal file."""
+    hass.config.config_dir = str(tmp_path)
+    store = HistoryStore(hass, "benchmark")
+    await store.async_load()
+    timestamps = count(1_700_000_000)
+
+    def _record() -> None:
+        for _ in range(WRITES):
+            store.async_record("john", next(timestamps), 37.5, "none")
+
+    async def _record_and_flush() -> None:
+        _record()
+        await store.async_flush()
+
+    await benchmark.async_measure("history_record", _record, ops=WRITES)
+    await store.async_flush()
+    await benchmark.async_measure(
+        "history_record_and_flush", _record_and_flush, ops=WRITES
+    )
+    await store.async_close()
@@ -0,0 +1,151 @@
+"""Benchmarks of the integration's hot paths."""
+from __future__ import annotations
+
+import time
+from itertools import count
+
+import pytest
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.family_health_tracker.const import (
+    CONF_MEDICATIONS,
+    DOMAIN,
+    get_combined_medications,
+    get_medication_options,
+)
+from custom_components.family_health_tracker.medications import MedicationIndex
+
+from .. import MEDICATIONS, async_setup_members, get_runtime
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+LIBRARY = {
+    **MEDICATIONS,
+    **{
+        f"med_{index}": {
+            "name": f"Medication {index}",
+            "label": f"Medication {index} given",
+            "dosage": "5ml",
+            "interval_hours": 6,
+            "category": "other",
+        }
+        for index in range(20)
+    },
+}
+TEMPERATURES = [35.0 + (index % 80) / 10 for index in range(10_000)]
+
+
+async def test_add_measurement(hass: HomeAssistant, benchmark: Benchmark) -> None:
+    """Service call to state write, through the whole recording path."""
+    await async_setup_members(hass, ["John", "Jane"])
+    sequence = count()
+
+    async def _record_100() -> None:
+        for _ in range(100):
+            # Distinct values so no reading is taken for a retried one
+            await hass.services.async_call(
+                DOMAIN,
+                "add_measurement",
+                {
+                    "name": "John",
+                    "temperature": 36 + next(sequence) / 10_000,
+                    "medication": "none",
+                },
+                blocking=True,
+            )
+
+    await benchmark.async_measure("add_measurement", _record_100, ops=100)
+    assert float(hass.states.get("sensor.temperature_john").state) > 36
+
+
+async def test_level_classification(hass: HomeAssistant, benchmark: Benchmark) -> None:
+    """TemperatureLevelSensor._get_level on its own."""
+    entry = await async_setup_members(hass, ["John"])
+    get_level = get_runtime(hass, entry, "john").level_sensor._get_level
+
+    def _classify() -> None:
+        for temperature in TEMPERATURES:
+            get_level(temperature)
+
+    await benchmark.async_measure(
+        "level_sensor_get_level", _classify, ops=len(TEMPERATURES)
+    )
+
+
+async def test_medication_attributes(hass: HomeAssistant, benchmark: Benchmark) -> None:
+    """MedicationSensor.extra_state_attributes with a medication given."""
+    entry = await async_setup_members(
+        hass, ["John"], **{CONF_MEDICATIONS: LIBRARY}
+    )
+    sensor = get_runtime(hass, entry, "john").medication_sensor
+    sensor.set_medication("med_3", dt_util.now())
+
+    def _attributes() -> None:
+        for _ in range(10_000):
+            sensor.extra_state_attributes
+
+    await benchmark.async_measure(
+        "medication_sensor_attributes", _attributes, ops=10_000
+    )
+    assert sensor.extra_state_attributes["dosage"] == "5ml"
+
+
+async def test_medication_helpers(benchmark: Benchmark) -> None:
+    """The const helpers against the precomputed MedicationIndex."""
+    index = MedicationIndex(LIBRARY)
+
+    def _helpers() -> None:
+        for _ in range(1_000):
+            get_combined_medications(LIBRARY)
+            get_medication_options(LIBRARY)
+
+    def _index() -> None:
+        for _ in range(1_000):
+            index.medications
+            index.options
+
+    await benchmark.async_measure("medication_helpers", _helpers, ops=1_000)
+    await benchmark.async_measure("medication_index", _index, ops=1_000)
+
+
+async def test_button_press(hass: HomeAssistant, benchmark: Benchmark) -> None:
+    """RecordMeasurementButton.async_press with both inputs set."""
+    entry = await async_setup_members(hass, ["John"])
+    runtime = get_runtime(hass, entry, "john")
+    await runtime.temperature_input.async_set_native_value(38.2)
+    button = runtime.button
+
+    async def _press_100() -> None:
+        for _ in range(100):
+            # Every press counts, not only the first of a debounce window
+            button._last_press = None
+            await button.async_press()
+
+    await benchmark.async_measure("button_press", _press_100, ops=100)
+    assert hass.states.get("sensor.temperature_john").state == "38.2"
+
+
+@pytest.mark.parametrize("members", [10, 100])
+async def test_platform_setup(
+    hass: HomeAssistant, benchmark: Benchmark, members: int
+) -> None:
+    """Set up an entry with all platforms for N members."""
+    entry = await async_setup_members(
+        hass, [f"Member {index}" for index in range(members)]
+    )
+
+    timings = []
+    for _ in range(3):
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        started = time.perf_counter()
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        timings.append(time.perf_counter() - started)
+        assert entry.state is ConfigEntryState.LOADED
+
+    benchmark.record(f"platform_setup_{members}_members", timings, members=members)
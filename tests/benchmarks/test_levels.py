@@ -0,0 +1,33 @@
+"""Benchmark of the temperature level classification."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from custom_components.family_health_tracker.levels import DEFAULT_LEVELS
+
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+READINGS = 1_000_000
+
+
+async def test_classify_readings(benchmark: Benchmark) -> None:
+    """Classify 1M readings, one at a time and as one array."""
+    temperatures = np.random.default_rng(0).uniform(34.0, 44.0, READINGS)
+    readings = temperatures.tolist()
+
+    def _scalar() -> None:
+        classify = DEFAULT_LEVELS.classify
+        for temperature in readings:
+            classify(temperature)
+
+    await benchmark.async_measure(
+        "classify_1m_readings_scalar", _scalar, ops=READINGS, rounds=3
+    )
+    await benchmark.async_measure(
+        "classify_1m_readings_array",
+        lambda: DEFAULT_LEVELS.classify_many(temperatures),
+        ops=READINGS,
+    )
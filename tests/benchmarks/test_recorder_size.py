@@ -0,0 +1,101 @@
+"""Recorder database growth per 1,000 readings, with and without compact attributes."""
+from __future__ import annotations
+
+import time
+
+import pytest
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+from sqlalchemy import text
+
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+
+from custom_components.family_health_tracker.const import (
+    CONF_COMPACT_ATTRIBUTES,
+    CONF_MEDICATIONS,
+    CONF_STATISTICS_WINDOWS,
+    DOMAIN,
+)
+
+from .. import MEDICATIONS, async_setup_members
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+READINGS = 1_000
+TABLES = ("states", "state_attributes")
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_mock: Recorder, enable_custom_integrations: None
+) -> None:
+    """Set up the recorder before Home Assistant is created."""
+
+
+def _table_sizes(instance: Recorder) -> dict[str, dict[str, int]]:
+    """Return the rows and bytes of the states tables (recorder thread)."""
+    sizes = {}
+    with session_scope(session=instance.get_session(), read_only=True) as session:
+        for table in TABLES:
+            rows = session.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            pages = session.execute(
+                text("SELECT SUM(pgsize) FROM dbstat WHERE name = :table"),
+                {"table": table},
+            ).scalar()
+            sizes[table] = {"rows": rows, "bytes": pages or 0}
+        sizes["state_attributes"]["json_bytes"] = session.execute(
+            text("SELECT COALESCE(SUM(LENGTH(shared_attrs)), 0) FROM state_attributes")
+        ).scalar()
+    return sizes
+
+
+@pytest.mark.parametrize("statistics", [True, False], ids=["statistics", "no_statistics"])
+@pytest.mark.parametrize("compact", [False, True], ids=["full", "compact"])
+async def test_recorder_bytes_per_1000_readings(
+    hass: HomeAssistant, benchmark: Benchmark, compact: bool, statistics: bool
+) -> None:
+    """Record 1,000 readings, a dose on every fourth, and measure the DB growth.
+
+    The rolling statistics sensors write attributes that change with every
+    reading in both modes, so they are also measured switched off to show
+    the attributes the compact mode does affect.
+    """
+    options = {CONF_MEDICATIONS: MEDICATIONS, CONF_COMPACT_ATTRIBUTES: compact}
+    if not statistics:
+        options[CONF_STATISTICS_WINDOWS] = []
+    await async_setup_members(hass, ["John"], **options)
+    instance = get_instance(hass)
+    await async_wait_recording_done(hass)
+    before = await instance.async_add_executor_job(_table_sizes, instance)
+
+    started = time.perf_counter()
+    for index in range(READINGS):
+        await hass.services.async_call(
+            DOMAIN,
+            "add_measurement",
+            {
+                "name": "John",
+                "temperature": 36 + index % 40 / 10,
+                "medication": "paracetamol" if index % 4 == 0 else "none",
+            },
+            blocking=True,
+        )
+    await async_wait_recording_done(hass)
+    elapsed = time.perf_counter() - started
+    after = await instance.async_add_executor_job(_table_sizes, instance)
+
+    growth = {
+        f"{table}_{key}": after[table][key] - before[table][key]
+        for table in TABLES
+        for key in after[table]
+    }
+    mode = ("compact" if compact else "full") + ("" if statistics else "_no_statistics")
+    benchmark.record(
+        f"recorder_size_{mode}", [elapsed / READINGS], READINGS, **growth
+    )
+    print(f"\nrecorder growth per {READINGS} readings ({mode}): {growth}")
+    assert growth["states_rows"] >= READINGS
@@ -0,0 +1,59 @@
+"""Benchmark of the per-measurement member lookup."""
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.family_health_tracker.runtime import async_get_member_directory
+
+from .. import async_setup_members, get_runtime
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+LOOKUPS = 10_000
+
+
+async def test_member_lookup(hass: HomeAssistant, benchmark: Benchmark) -> None:
+    """Entity id lookups per measurement, before and after the member runtime.
+
+    Before, a measurement formatted the entity ids of the temperature,
+    medication, level and duration sensors and looked each one up in the
+    entry's data. Now the member is resolved once and its sensors are
+    direct references.
+    """
+    entry = await async_setup_members(hass, [f"Member {index}" for index in range(20)])
+    runtime = get_runtime(hass, entry, "member 7")
+    entities = {
+        entity.entity_id: entity
+        for entity in (
+            runtime.temperature_sensor,
+            runtime.medication_sensor,
+            runtime.level_sensor,
+            runtime.duration_sensor,
+        )
+    }
+    directory = async_get_member_directory(hass)
+    name = runtime.name
+
+    def _string_keyed() -> None:
+        for _ in range(LOOKUPS):
+            name_lower = name.lower()
+            entities.get(f"sensor.temperature_{name_lower}")
+            entities.get(f"sensor.medication_{name_lower}")
+            entities.get(f"sensor.temperature_level_{name_lower}")
+            entities.get(f"sensor.medication_duration_{name_lower}")
+
+    def _runtime() -> None:
+        for _ in range(LOOKUPS):
+            member = directory.resolve(name)
+            member.temperature_sensor
+            member.medication_sensor
+            member.level_sensor
+            member.duration_sensor
+
+    await benchmark.async_measure(
+        "member_lookup_string_keyed", _string_keyed, ops=LOOKUPS
+    )
+    await benchmark.async_measure("member_lookup_runtime", _runtime, ops=LOOKUPS)
@@ -0,0 +1,56 @@
+"""Startup benchmark of a large household."""
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+import pytest
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from .. import async_setup_members
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+MEMBERS = 500
+
+
+async def test_setup_500_members(hass: HomeAssistant, benchmark: Benchmark) -> None:
+    """Set up an entry with 500 members: setup time and allocations."""
+    entry = await async_setup_members(
+        hass, [f"Member {index}" for index in range(MEMBERS)]
+    )
+
+    async def _reload() -> float:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        started = time.perf_counter()
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert entry.state is ConfigEntryState.LOADED
+        return time.perf_counter() - started
+
+    timings = [await _reload() for _ in range(3)]
+
+    # Allocations in a separate round, tracemalloc slows everything down
+    tracemalloc.start()
+    try:
+        await _reload()
+        allocated, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = benchmark.record(
+        f"setup_{MEMBERS}_members",
+        timings,
+        members=MEMBERS,
+        allocated_kib=round(allocated / 1024),
+        peak_kib=round(peak / 1024),
+    )
+    print(
+        f"\nsetup of {MEMBERS} members: {result['median_us'] / 1e6:.3f} s, "
+        f"{result['allocated_kib']} KiB held, {result['peak_kib']} KiB peak"
+    )
+    assert len(hass.states.async_entity_ids()) >= MEMBERS * 8
@@ -0,0 +1,77 @@
+"""Fixtures for Family Health Tracker tests."""
+from __future__ import annotations
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+
+from custom_components.family_health_tracker.const import CONF_MEMBERS, DOMAIN
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the benchmark options."""
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        help="run the benchmarks in tests/benchmarks",
+    )
+    group.addoption(
+        "--benchmark-json",
+        metavar="PATH",
+        help="write the benchmark results to PATH as JSON",
+    )
+    group.addoption(
+        "--benchmark-compare",
+        metavar="PATH",
+        help="fail benchmarks that are slower than the results in PATH",
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=1.5,
+        help="slowdown factor over --benchmark-compare that fails (default 1.5)",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip the benchmarks unless they were asked for."""
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components."""
+
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Return a config entry for two family members."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Health Tracker",
+        data={CONF_NAME: "Health Tracker", CONF_MEMBERS: "John, Jane"},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def loaded_entry(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> MockConfigEntry:
+    """Set up the config entry."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    return config_entry
@@ -0,0 +1,178 @@
+"""Tests for the columnar measurement analytics."""
+from __future__ import annotations
+
+import math
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.family_health_tracker.analytics import (
+    MAX_HOLD_SECONDS,
+    MemberSeries,
+    dose_responses,
+    fever_curve,
+    summarize,
+    time_in_levels,
+    time_weighted_average,
+)
+from custom_components.family_health_tracker.const import CONF_MEDICATIONS, DOMAIN
+from custom_components.family_health_tracker.levels import DEFAULT_LEVELS
+
+from . import async_setup_members
+
+HOUR = 3600
+START = 1_700_000_000 - 1_700_000_000 % HOUR
+
+
+@pytest.fixture
+def series() -> MemberSeries:
+    """A dose at 39.0 followed by three readings over five hours."""
+    return MemberSeries(
+        [START, START + HOUR, START + 2 * HOUR, START + 5 * HOUR],
+        [39.0, 38.5, 37.5, 38.0],
+        ["paracetamol", "none", "none", "none"],
+    )
+
+
+def test_columns(series: MemberSeries) -> None:
+    """Medications are coded against a sorted id table."""
+    assert len(series) == 4
+    assert series.medication_ids == ["none", "paracetamol"]
+    assert series.codes.tolist() == [1, 0, 0, 0]
+    assert series.none_code == 0
+    assert len(series.window(START + HOUR, START + 2 * HOUR)) == 2
+    assert len(series.window(None, START)) == 1
+
+
+def test_time_weighted_average(series: MemberSeries) -> None:
+    """Each reading counts for as long as it held."""
+    end = START + 6 * HOUR
+
+    assert series.hold_durations(end).tolist() == [HOUR, HOUR, 3 * HOUR, HOUR]
+    assert time_weighted_average(series, end) == pytest.approx(38.0)
+
+
+def test_hold_capped() -> None:
+    """A reading holds for at most MAX_HOLD_SECONDS."""
+    series = MemberSeries([START, START + 24 * HOUR], [37.0, 39.0], ["none", "none"])
+
+    assert series.hold_durations(START + 24 * HOUR).tolist() == [MAX_HOLD_SECONDS, 0]
+    assert time_weighted_average(series, START + 24 * HOUR) == 37.0
+
+
+def test_time_in_levels(series: MemberSeries) -> None:
+    """Hours per level, with readings without a temperature as unknown."""
+    hours = time_in_levels(series, DEFAULT_LEVELS, START + 6 * HOUR)
+
+    assert hours["medium"] == pytest.approx(2.0)
+    assert hours["elevated"] == pytest.approx(4.0)
+    assert hours["normal"] == 0
+    assert hours["unknown"] == 0
+
+    medication_only = MemberSeries(
+        [START, START + HOUR], [None, 37.0], ["paracetamol", "none"]
+    )
+    hours = time_in_levels(medication_only, DEFAULT_LEVELS, START + 2 * HOUR)
+    assert hours["unknown"] == pytest.approx(1.0)
+    assert hours["normal"] == pytest.approx(1.0)
+    assert time_weighted_average(medication_only, START + 2 * HOUR) == 37.0
+
+
+def test_fever_curve(series: MemberSeries) -> None:
+    """Empty bins are skipped."""
+    curve = fever_curve(series, 2 * HOUR)
+
+    assert [point["start"] for point in curve] == [
+        START,
+        START + 2 * HOUR,
+        START + 4 * HOUR,
+    ]
+    assert curve[0] == {"start": START, "mean": 38.75, "max": 39.0, "readings": 2}
+    assert curve[2]["readings"] == 1
+
+
+def test_dose_responses(series: MemberSeries) -> None:
+    """The lowest reading within the response window of a dose."""
+    (response,) = dose_responses(series, 4 * HOUR)
+
+    assert response == {
+        "given_at": START,
+        "medication": "paracetamol",
+        "temperature": 39.0,
+        "lowest": 37.5,
+        "drop": 1.5,
+        "hours_to_lowest": 2.0,
+    }
+
+
+def test_summarize_empty_window(series: MemberSeries) -> None:
+    """A window without readings summarizes to empty values."""
+    summary = summarize(
+        series, DEFAULT_LEVELS, START + 10 * HOUR, START + 11 * HOUR, HOUR, HOUR
+    )
+
+    assert summary["readings"] == 0
+    assert summary["min"] is None
+    assert summary["time_weighted_average"] is None
+    assert summary["fever_curve"] == []
+    assert summary["dose_responses"] == []
+    assert not any(summary["hours_in_levels"].values())
+
+
+async def test_get_analytics_service(hass: HomeAssistant) -> None:
+    """The service summarizes the member's recorded history."""
+    await async_setup_members(
+        hass,
+        ["John"],
+        **{
+            CONF_MEDICATIONS: {
+                "paracetamol": {
+                    "name": "Paracetamol",
+                    "label": "Paracetamol given",
+                    "dosage": "250mg",
+                    "interval_hours": 6,
+                    "category": "fever_reducer",
+                }
+            }
+        },
+    )
+    start = dt_util.now().replace(microsecond=0) - timedelta(hours=6)
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurements_batch",
+        {
+            "measurements": [
+                {
+                    "name": "John",
+                    "temperature": temperature,
+                    "medication": medication,
+                    "measured_at": start + timedelta(hours=offset),
+                }
+                for offset, temperature, medication in (
+                    (0, 39.0, "paracetamol"),
+                    (1, 38.5, "none"),
+                    (2, 37.5, "none"),
+                    (5, 38.0, "none"),
+                )
+            ]
+        },
+        blocking=True,
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "get_analytics",
+        {"name": "John", "end": start + timedelta(hours=6)},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["member"] == "John"
+    assert response["readings"] == 4
+    assert response["min"] == 37.5
+    assert response["max"] == 39.0
+    assert math.isclose(response["time_weighted_average"], 38.0)
+    assert response["dose_responses"][0]["drop"] == 1.5
@@ -0,0 +1,94 @@
+"""Tests for the recorder history import."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.family_health_tracker.backfill import RecorderImporter
+from custom_components.family_health_tracker.const import DOMAIN
+
+from . import async_setup_members, get_runtime
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_mock: Recorder, enable_custom_integrations: None
+) -> None:
+    """Set up the recorder before Home Assistant is created."""
+
+
+async def test_reimport_after_reload(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Restored states written on reload do not import as new readings."""
+    entry = await async_setup_members(hass, ["John"])
+    measured_at = dt_util.utcnow()
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurement",
+        {"name": "John", "temperature": 38.5, "medication": "none"},
+        blocking=True,
+    )
+    await async_wait_recording_done(hass)
+
+    # Each reload writes the restored state again, hours later
+    for _ in range(2):
+        freezer.tick(timedelta(hours=2))
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+        assert hass.states.get("sensor.temperature_john").state == "38.5"
+    await async_wait_recording_done(hass)
+
+    runtime = get_runtime(hass, entry, "john")
+    importer = RecorderImporter(hass, runtime)
+    chunk = await get_instance(hass).async_add_executor_job(importer.fetch_chunk)
+    assert [(item.timestamp, item.temperature) for item in chunk] == [
+        (measured_at.timestamp(), 38.5)
+    ]
+
+    progress = await hass.services.async_call(
+        DOMAIN, "import_recorder_history", {}, blocking=True, return_response=True
+    )
+    assert progress["imported"] == 0
+    assert progress["skipped"] == 1
+    assert len(runtime.history.ring("john")) == 1
+
+
+async def test_rows_older_than_full_ring_are_skipped(hass: HomeAssistant) -> None:
+    """Rows the full ring would drop count as skipped and are not journaled."""
+    entry = await async_setup_members(hass, ["John"])
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurement",
+        {"name": "John", "temperature": 38.5, "medication": "none"},
+        blocking=True,
+    )
+    await async_wait_recording_done(hass)
+
+    runtime = get_runtime(hass, entry, "john")
+    history = runtime.history
+    ring = history.ring("john")
+    ring_start = ring.last.timestamp + 60
+    # Fill the ring with newer readings; the recorded one is pushed out
+    for index in range(ring.capacity):
+        history.async_record("john", ring_start + index, 37.0, "none")
+    await history.async_flush()
+    journal_records = history._journal_records
+
+    progress = await hass.services.async_call(
+        DOMAIN, "import_recorder_history", {}, blocking=True, return_response=True
+    )
+    assert progress["imported"] == 0
+    assert progress["skipped"] == 1
+    assert ring[0].timestamp == ring_start
+    await history.async_flush()
+    assert history._journal_records == journal_records
@@ -0,0 +1,60 @@
+"""Tests for the batch measurement service."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.family_health_tracker.const import CONF_MEDICATIONS, DOMAIN
+
+from . import MEDICATIONS, async_setup_members, get_runtime
+
+
+async def test_batch_writes_each_entity_once(hass: HomeAssistant) -> None:
+    """A 50-record batch writes the dose sensor and the others once."""
+    entry = await async_setup_members(
+        hass, ["John"], **{CONF_MEDICATIONS: MEDICATIONS}
+    )
+    runtime = get_runtime(hass, entry, "john")
+    writes: dict[str, int] = {}
+
+    def _counting(entity):
+        write = entity.async_write_ha_state
+
+        def _write() -> None:
+            writes[entity.entity_id] = writes.get(entity.entity_id, 0) + 1
+            write()
+
+        return _write
+
+    for entity in (
+        runtime.dose_sensor,
+        runtime.temperature_sensor,
+        runtime.medication_sensor,
+    ):
+        entity.async_write_ha_state = _counting(entity)
+    start = dt_util.now() - timedelta(hours=10)
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurements_batch",
+        {
+            "measurements": [
+                {
+                    "name": "John",
+                    "temperature": 37 + index / 50,
+                    "medication": "paracetamol",
+                    "measured_at": start + timedelta(minutes=index),
+                }
+                for index in range(50)
+            ]
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert writes["binary_sensor.dose_due_john"] == 1
+    assert writes["sensor.temperature_john"] == 1
+    assert writes["sensor.medication_john"] == 1
+    # The last dose was over six hours ago
+    assert hass.states.get("binary_sensor.dose_due_john").state == "on"
@@ -0,0 +1,49 @@
+"""Tests for the record measurement button."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+
+from . import async_setup_members, get_runtime
+
+
+async def _press(hass: HomeAssistant) -> None:
+    await hass.services.async_call(
+        "button",
+        "press",
+        {"entity_id": "button.record_measurement_john"},
+        blocking=True,
+    )
+
+
+async def test_press_attributes_are_current(hass: HomeAssistant) -> None:
+    """The latency and debounce attributes reflect the press just made."""
+    entry = await async_setup_members(hass, ["John"])
+    await get_runtime(hass, entry, "john").temperature_input.async_set_native_value(
+        38.2
+    )
+
+    await _press(hass)
+    attributes = hass.states.get("button.record_measurement_john").attributes
+    assert attributes["last_record_latency_ms"] is not None
+    assert attributes["debounced_presses"] == 0
+    assert hass.states.get("sensor.temperature_john").state == "38.2"
+
+    await _press(hass)
+    attributes = hass.states.get("button.record_measurement_john").attributes
+    assert attributes["debounced_presses"] == 1
+
+
+async def test_missing_inputs_do_not_debounce(hass: HomeAssistant) -> None:
+    """A press without a temperature does not hold back a corrected retry."""
+    entry = await async_setup_members(hass, ["John"])
+
+    await _press(hass)
+    assert hass.states.get("sensor.temperature_john").state == "unknown"
+
+    await get_runtime(hass, entry, "john").temperature_input.async_set_native_value(
+        37.4
+    )
+    await _press(hass)
+    assert hass.states.get("sensor.temperature_john").state == "37.4"
+    attributes = hass.states.get("button.record_measurement_john").attributes
+    assert attributes["debounced_presses"] == 0
@@ -0,0 +1,244 @@
+"""Tests for the config and options flows."""
+from __future__ import annotations
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant import config_entries
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from custom_components.family_health_tracker.const import (
+    CONF_COMPACT_ATTRIBUTES,
+    CONF_INSTRUMENTATION,
+    CONF_MEDICATIONS,
+    CONF_MEMBERS,
+    CONF_STATISTICS_WINDOWS,
+    DOMAIN,
+)
+
+from . import get_runtime
+
+
+async def test_user_flow(hass: HomeAssistant) -> None:
+    """The user step creates an entry, and needs at least one member."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] == FlowResultType.FORM
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"name": "Family", CONF_MEMBERS: ""}
+    )
+    assert result["errors"] == {"base": "no_members"}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"name": "Family", CONF_MEMBERS: "John, Jane"}
+    )
+    await hass.async_block_till_done()
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["title"] == "Family"
+    assert result["data"] == {"name": "Family", CONF_MEMBERS: "John, Jane"}
+
+
+async def _options_step(hass: HomeAssistant, entry: MockConfigEntry, step: str):
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"step": step}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == step
+    return result
+
+
+async def test_options_settings(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """The settings step stores the options and reloads the entry."""
+    result = await _options_step(hass, loaded_entry, "settings")
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_COMPACT_ATTRIBUTES: True,
+            CONF_INSTRUMENTATION: True,
+            CONF_STATISTICS_WINDOWS: "6, 24, 72",
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert loaded_entry.options == {
+        CONF_COMPACT_ATTRIBUTES: True,
+        CONF_INSTRUMENTATION: True,
+        CONF_STATISTICS_WINDOWS: [6, 24, 72],
+    }
+    assert loaded_entry.state is ConfigEntryState.LOADED
+    state = hass.states.get("sensor.temperature_john")
+    assert "last_measurement" not in state.attributes
+
+
+async def test_options_statistics_windows(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """The settings step replaces the statistics sensors with the new windows."""
+    result = await _options_step(hass, loaded_entry, "settings")
+    for invalid in ("0", "6, 1.5", "-3", "six"):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {
+                CONF_COMPACT_ATTRIBUTES: False,
+                CONF_INSTRUMENTATION: False,
+                CONF_STATISTICS_WINDOWS: invalid,
+            },
+        )
+        assert result["type"] == FlowResultType.FORM
+        assert result["errors"] == {
+            CONF_STATISTICS_WINDOWS: "invalid_statistics_windows"
+        }
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_COMPACT_ATTRIBUTES: False,
+            CONF_INSTRUMENTATION: False,
+            CONF_STATISTICS_WINDOWS: "12, 6, 6",
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert loaded_entry.options[CONF_STATISTICS_WINDOWS] == [6, 12]
+    entity_registry = er.async_get(hass)
+    assert hass.states.get("sensor.temperature_stats_12h_john") is not None
+    assert hass.states.get("sensor.temperature_stats_6h_jane") is not None
+    assert entity_registry.async_get("sensor.temperature_stats_24h_john") is None
+    assert hass.states.get("sensor.temperature_stats_72h_jane") is None
+
+    # An emptied field turns the statistics sensors off
+    result = await _options_step(hass, loaded_entry, "settings")
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_COMPACT_ATTRIBUTES: False, CONF_INSTRUMENTATION: False},
+    )
+    await hass.async_block_till_done()
+    assert loaded_entry.options[CONF_STATISTICS_WINDOWS] == []
+    assert entity_registry.async_get("sensor.temperature_stats_6h_john") is None
+
+
+async def test_options_medication(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """The medication step adds to the library and keeps other options."""
+    hass.config_entries.async_update_entry(
+        loaded_entry, options={CONF_COMPACT_ATTRIBUTES: True}
+    )
+    await hass.async_block_till_done()
+    result = await _options_step(hass, loaded_entry, "medication")
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            "id": "Ibuprofen Kids",
+            "name": "Ibuprofen Kids",
+            "label": "Ibuprofen given",
+            "dosage": "100mg/5ml",
+            "interval_hours": 6,
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert loaded_entry.options[CONF_COMPACT_ATTRIBUTES] is True
+    assert loaded_entry.options[CONF_MEDICATIONS]["ibuprofen_kids"]["dosage"] == (
+        "100mg/5ml"
+    )
+    runtime = get_runtime(hass, loaded_entry, "john")
+    assert "ibuprofen_kids" in runtime.medications
+
+
+async def _set_members(
+    hass: HomeAssistant, entry: MockConfigEntry, members: str
+) -> None:
+    result = await _options_step(hass, entry, "members")
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_MEMBERS: members}
+    )
+    await hass.async_block_till_done()
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_MEMBERS] == members
+
+
+async def _record(hass: HomeAssistant, name: str, temperature: float) -> None:
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurement",
+        {"name": name, "temperature": temperature, "medication": "none"},
+        blocking=True,
+    )
+
+
+async def test_options_add_member(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """Adding a member leaves the others running."""
+    await _record(hass, "John", 38.5)
+    john = get_runtime(hass, loaded_entry, "john")
+
+    await _set_members(hass, loaded_entry, "John, Jane, Max")
+
+    assert get_runtime(hass, loaded_entry, "john") is john
+    assert hass.states.get("sensor.temperature_john").state == "38.5"
+    assert hass.states.get("sensor.temperature_max").state == "unknown"
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, f"{loaded_entry.entry_id}_max")}
+    )
+    assert device is not None
+    assert get_runtime(hass, loaded_entry, "max").device_id == device.id
+    await _record(hass, "Max", 37.2)
+    assert hass.states.get("sensor.temperature_level_max").state == "normal"
+
+
+async def test_options_remove_member(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """Removing a member removes its device and entities only."""
+    await _record(hass, "John", 38.5)
+    jane = get_runtime(hass, loaded_entry, "jane")
+    john = get_runtime(hass, loaded_entry, "john")
+
+    await _set_members(hass, loaded_entry, "John")
+
+    assert hass.states.get("sensor.temperature_jane") is None
+    assert er.async_get(hass).async_get("sensor.temperature_jane") is None
+    assert dr.async_get(hass).async_get(jane.device_id) is None
+    assert get_runtime(hass, loaded_entry, "john") is john
+    assert hass.states.get("sensor.temperature_john").state == "38.5"
+    with pytest.raises(HomeAssistantError):
+        await _record(hass, "Jane", 37.0)
+
+
+async def test_options_rename_member(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """A renamed member gets a new device; history stays with the old name."""
+    await _record(hass, "John", 38.5)
+    jane = get_runtime(hass, loaded_entry, "jane")
+
+    await _set_members(hass, loaded_entry, "Johnny, Jane")
+
+    assert hass.states.get("sensor.temperature_john") is None
+    assert hass.states.get("sensor.temperature_johnny").state == "unknown"
+    assert get_runtime(hass, loaded_entry, "jane") is jane
+    await _record(hass, "Johnny", 37.0)
+    assert hass.states.get("sensor.temperature_johnny").state == "37.0"
+
+    # Renaming back picks up the kept history again
+    await _set_members(hass, loaded_entry, "John, Jane")
+    assert hass.states.get("sensor.temperature_john").state == "38.5"
+    assert loaded_entry.state is ConfigEntryState.LOADED
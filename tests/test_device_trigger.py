@@ -0,0 +1,172 @@
+"""Tests for the member device triggers."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_get_device_automations,
+    async_mock_service,
+)
+import voluptuous as vol
+
+from homeassistant.components import automation
+from homeassistant.components.device_automation import DeviceAutomationType
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import device_registry as dr
+from homeassistant.setup import async_setup_component
+
+from custom_components.family_health_tracker.const import CONF_MEDICATIONS, DOMAIN
+from custom_components.family_health_tracker.device_trigger import (
+    async_get_trigger_capabilities,
+)
+
+from . import MEDICATIONS, async_setup_members, get_runtime
+
+LIBRARY = {
+    **MEDICATIONS,
+    "cream": {
+        "name": "Cream",
+        "label": "Cream applied",
+        "dosage": None,
+        "interval_hours": None,
+        "category": "other",
+    },
+}
+
+
+@pytest.fixture
+async def entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Set up two members with a medication library."""
+    return await async_setup_members(
+        hass, ["John", "Jane"], **{CONF_MEDICATIONS: LIBRARY}
+    )
+
+
+@pytest.fixture
+def calls(hass: HomeAssistant) -> list[ServiceCall]:
+    """Track automation actions."""
+    return async_mock_service(hass, "test", "automation")
+
+
+def _trigger(device_id: str, trigger_type: str, **extra: str) -> dict:
+    return {
+        "trigger": {
+            "platform": "device",
+            "domain": DOMAIN,
+            "device_id": device_id,
+            "type": trigger_type,
+            **extra,
+        },
+        "action": {
+            "service": "test.automation",
+            "data_template": {"fired": f"{trigger_type} {{{{ trigger.member }}}}"},
+        },
+    }
+
+
+async def _record(
+    hass: HomeAssistant, name: str, temperature: float, medication: str = "none"
+) -> None:
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurement",
+        {"name": name, "temperature": temperature, "medication": medication},
+        blocking=True,
+    )
+
+
+async def test_get_triggers(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Member devices have the three triggers, the hub none."""
+    device_registry = dr.async_get(hass)
+    john = get_runtime(hass, entry, "john")
+    hub = device_registry.async_get_device(identifiers={(DOMAIN, entry.entry_id)})
+
+    triggers = await async_get_device_automations(
+        hass, DeviceAutomationType.TRIGGER, john.device_id
+    )
+    assert {
+        trigger["type"] for trigger in triggers if trigger["domain"] == DOMAIN
+    } == {"measurement_recorded", "level_entered", "dose_due"}
+    triggers = await async_get_device_automations(
+        hass, DeviceAutomationType.TRIGGER, hub.id
+    )
+    assert not [trigger for trigger in triggers if trigger["domain"] == DOMAIN]
+
+
+async def test_trigger_capabilities(
+    hass: HomeAssistant, entry: MockConfigEntry
+) -> None:
+    """Levels and medications come from the live library."""
+    device_id = get_runtime(hass, entry, "john").device_id
+
+    capabilities = await async_get_trigger_capabilities(
+        hass, {"device_id": device_id, "type": "level_entered"}
+    )
+    schema = capabilities["extra_fields"]
+    assert schema({"level": "very_high"}) == {"level": "very_high"}
+    with pytest.raises(vol.Invalid):
+        schema({"level": "boiling"})
+
+    capabilities = await async_get_trigger_capabilities(
+        hass, {"device_id": device_id, "type": "dose_due"}
+    )
+    schema = capabilities["extra_fields"]
+    assert schema({"medication": "paracetamol"}) == {"medication": "paracetamol"}
+    # Without a dose interval a medication never becomes due
+    with pytest.raises(vol.Invalid):
+        schema({"medication": "cream"})
+
+    assert (
+        await async_get_trigger_capabilities(
+            hass, {"device_id": device_id, "type": "measurement_recorded"}
+        )
+        == {}
+    )
+
+
+async def test_triggers_fire(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    calls: list[ServiceCall],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Each trigger fires for its own device only."""
+    device_id = get_runtime(hass, entry, "john").device_id
+    assert await async_setup_component(
+        hass,
+        automation.DOMAIN,
+        {
+            automation.DOMAIN: [
+                _trigger(device_id, "measurement_recorded"),
+                _trigger(device_id, "level_entered", level="medium"),
+                _trigger(device_id, "dose_due", medication="paracetamol"),
+            ]
+        },
+    )
+
+    await _record(hass, "Jane", 38.5, "paracetamol")
+    await hass.async_block_till_done()
+    assert calls == []
+
+    await _record(hass, "John", 38.5)
+    await hass.async_block_till_done()
+    assert sorted(call.data["fired"] for call in calls) == [
+        "level_entered john",
+        "measurement_recorded john",
+    ]
+
+    # Still medium: the level was not entered again
+    calls.clear()
+    await _record(hass, "John", 38.7, "paracetamol")
+    await hass.async_block_till_done()
+    assert [call.data["fired"] for call in calls] == ["measurement_recorded john"]
+
+    calls.clear()
+    freezer.tick(timedelta(hours=6, seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert [call.data["fired"] for call in calls] == ["dose_due john"]
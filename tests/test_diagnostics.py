@@ -0,0 +1,63 @@
+"""Tests for the config entry diagnostics."""
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+
+from custom_components.family_health_tracker.const import (
+    CONF_INSTRUMENTATION,
+    CONF_MEDICATIONS,
+    CONF_MEMBERS,
+    DOMAIN,
+)
+from custom_components.family_health_tracker.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+
+async def test_diagnostics_redacted(hass: HomeAssistant) -> None:
+    """Member names and the medication library are redacted."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Health Tracker",
+        data={CONF_NAME: "Health Tracker", CONF_MEMBERS: "John"},
+        options={
+            CONF_MEMBERS: "John, Jane Doe",
+            CONF_INSTRUMENTATION: True,
+            CONF_MEDICATIONS: {
+                "paracetamol": {
+                    "name": "Paracetamol",
+                    "label": "Paracetamol given",
+                    "dosage": "250mg",
+                    "interval_hours": 6,
+                    "category": "fever_reducer",
+                }
+            },
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurement",
+        {"name": "Jane Doe", "temperature": 38.5, "medication": "paracetamol"},
+        blocking=True,
+    )
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["options"] == {
+        CONF_MEMBERS: REDACTED,
+        CONF_MEDICATIONS: REDACTED,
+        CONF_INSTRUMENTATION: True,
+    }
+    assert diagnostics["members"] == 2
+    assert diagnostics["medications"] == 2
+    assert sorted(diagnostics["history_sizes"]) == [0, 1]
+    assert diagnostics["metrics"]["counters"]["measurements"] == 1
+    for text in ("John", "Jane", "Paracetamol", "250mg"):
+        assert text.lower() not in repr(diagnostics).lower()
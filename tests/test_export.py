@@ -0,0 +1,72 @@
+"""Tests for the history export service."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.family_health_tracker.const import DOMAIN
+
+
+async def _record(hass: HomeAssistant, *temperatures: float) -> None:
+    for temperature in temperatures:
+        await hass.services.async_call(
+            DOMAIN,
+            "add_measurement",
+            {"name": "John", "temperature": temperature, "medication": "none"},
+            blocking=True,
+        )
+
+
+async def test_export_default_path(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry, tmp_path: Path
+) -> None:
+    """Without a path the export goes to the integration's own folder."""
+    hass.config.config_dir = str(tmp_path)
+    await _record(hass, 37.0, 38.5)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "export_history",
+        {"name": "John", "format": "jsonl"},
+        blocking=True,
+        return_response=True,
+    )
+
+    path = Path(response["path"])
+    assert path.parent == tmp_path / DOMAIN
+    assert response["rows"] == 2
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row["temperature"] for row in rows] == [37.0, 38.5]
+    assert rows[1]["level"] == "medium"
+
+
+async def test_export_path_allowlist(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry, tmp_path: Path
+) -> None:
+    """A given path has to be in allowlist_external_dirs."""
+    await _record(hass, 37.0)
+    path = tmp_path / "john.csv"
+
+    with pytest.raises(HomeAssistantError, match="not allowed"):
+        await hass.services.async_call(
+            DOMAIN,
+            "export_history",
+            {"name": "John", "path": str(path)},
+            blocking=True,
+        )
+    assert not path.exists()
+
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    await hass.services.async_call(
+        DOMAIN,
+        "export_history",
+        {"name": "John", "path": str(path)},
+        blocking=True,
+    )
+    assert path.read_text().splitlines()[0].startswith("member,measured_at")
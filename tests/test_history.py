@@ -0,0 +1,177 @@
+"""Tests for the write-behind measurement history."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.family_health_tracker.const import (
+    HISTORY_STORAGE_KEY,
+    HISTORY_STORAGE_VERSION,
+)
+from custom_components.family_health_tracker.history import (
+    HistoryStore,
+    Measurement,
+)
+
+ENTRY_ID = "entry"
+STORAGE_KEY = f"{HISTORY_STORAGE_KEY}.{ENTRY_ID}"
+
+
+@pytest.fixture
+def journal(hass: HomeAssistant, tmp_path: Path) -> Path:
+    """Keep the journal in a temporary configuration directory."""
+    hass.config.config_dir = str(tmp_path)
+    return tmp_path / ".storage" / f"{STORAGE_KEY}.journal"
+
+
+def _write_journal(path: Path, records: list[list[Any]], tail: str = "") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        "".join(json.dumps(record) + "\n" for record in records) + tail,
+        encoding="utf-8",
+    )
+
+
+async def _load(hass: HomeAssistant) -> HistoryStore:
+    store = HistoryStore(hass, ENTRY_ID)
+    await store.async_load()
+    return store
+
+
+async def test_flush_and_reload(hass: HomeAssistant, journal: Path) -> None:
+    """Flushed journal records survive a restart without a snapshot."""
+    store = await _load(hass)
+    store.async_record("john", 100.0, 38.5, "none")
+    store.async_record("john", 200.0, None, "paracetamol")
+    assert not journal.exists()
+
+    await store.async_flush()
+    assert len(journal.read_text().splitlines()) == 2
+
+    reloaded = await _load(hass)
+    assert list(reloaded.ring("john")) == [
+        Measurement(100.0, 38.5, "none"),
+        Measurement(200.0, None, "paracetamol"),
+    ]
+    await store.async_close()
+    await reloaded.async_close()
+
+
+async def test_torn_final_line(
+    hass: HomeAssistant, journal: Path, hass_storage: dict[str, Any]
+) -> None:
+    """A record torn by a crash is skipped and the journal starts clean."""
+    _write_journal(
+        journal,
+        [[1, "john", 100.0, 37.0, "none"], [2, "john", 200.0, 38.0, "none"]],
+        tail='[3, "john", 300.0, 3',
+    )
+
+    store = await _load(hass)
+
+    assert [item.timestamp for item in store.ring("john")] == [100.0, 200.0]
+    # Compacted straight away, so new records never follow the torn line
+    assert not journal.exists()
+    assert hass_storage[STORAGE_KEY]["data"]["seq"] == 2
+
+    store.async_record("john", 300.0, 39.0, "none")
+    await store.async_flush()
+    assert json.loads(journal.read_text())[0] == 3
+    await store.async_close()
+
+
+async def test_crash_between_snapshot_and_truncation(
+    hass: HomeAssistant, journal: Path, hass_storage: dict[str, Any]
+) -> None:
+    """Journal records already in the snapshot are not replayed twice."""
+    hass_storage[STORAGE_KEY] = {
+        "version": HISTORY_STORAGE_VERSION,
+        "key": STORAGE_KEY,
+        "data": {
+            "seq": 2,
+            "members": {
+                "john": {
+                    "timestamps": [100.0, 200.0],
+                    "temperatures": [37.0, 38.0],
+                    "medications": ["none", "none"],
+                }
+            },
+        },
+    }
+    # The snapshot was saved, the journal it covers was never removed
+    _write_journal(
+        journal,
+        [
+            [1, "john", 100.0, 37.0, "none"],
+            [2, "john", 200.0, 38.0, "none"],
+            [3, "john", 300.0, 39.0, "none"],
+            [4, "jane", 150.0, 36.8, "none"],
+        ],
+    )
+
+    store = await _load(hass)
+
+    assert [item.timestamp for item in store.ring("john")] == [100.0, 200.0, 300.0]
+    assert [item.timestamp for item in store.ring("jane")] == [150.0]
+    assert hass_storage[STORAGE_KEY]["data"]["seq"] == 4
+    assert not journal.exists()
+    await store.async_close()
+
+
+async def test_replay_order(hass: HomeAssistant, journal: Path) -> None:
+    """Records replay in sequence order into rings ordered by time."""
+    _write_journal(
+        journal,
+        [
+            [1, "john", 300.0, 38.0, "none"],
+            [2, "john", 100.0, 37.0, "none"],
+            [3, "john", 200.0, None, "paracetamol"],
+            [4, "john", 200.0, 37.5, "none"],
+        ],
+    )
+
+    store = await _load(hass)
+
+    # Out-of-order times are sorted; equal times keep their journal order
+    assert list(store.ring("john")) == [
+        Measurement(100.0, 37.0, "none"),
+        Measurement(200.0, None, "paracetamol"),
+        Measurement(200.0, 37.5, "none"),
+        Measurement(300.0, 38.0, "none"),
+    ]
+    store.async_record("john", 400.0, 37.0, "none")
+    await store.async_close()
+
+    reloaded = await _load(hass)
+    assert reloaded.ring("john").last == Measurement(400.0, 37.0, "none")
+    await reloaded.async_close()
+
+
+async def test_full_ring_drops_older(hass: HomeAssistant, journal: Path) -> None:
+    """A measurement older than a full ring is neither kept nor journaled."""
+    store = HistoryStore(hass, ENTRY_ID, capacity=3)
+    await store.async_load()
+    for timestamp in (100.0, 200.0, 300.0):
+        assert store.async_record("john", timestamp, 37.0, "none")
+    ring = store.ring("john")
+    version = ring.version
+
+    assert not store.async_record("john", 50.0, 39.0, "none")
+    assert ring.version == version
+    # An older reading that still fits replaces the oldest one
+    assert store.async_record("john", 150.0, 38.0, "none")
+    assert [item.timestamp for item in ring] == [150.0, 200.0, 300.0]
+
+    await store.async_flush()
+    assert [json.loads(line)[2] for line in journal.read_text().splitlines()] == [
+        100.0,
+        200.0,
+        300.0,
+        150.0,
+    ]
+    await store.async_close()
@@ -0,0 +1,144 @@
+"""Tests for duplicate measurement detection."""
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from custom_components.family_health_tracker.const import DOMAIN
+from custom_components.family_health_tracker.idempotency import (
+    IdempotencyCache,
+    async_get_idempotency_cache,
+)
+from custom_components.family_health_tracker.runtime import MemberRuntime
+
+from . import get_runtime
+
+
+def test_cache_expiry_and_eviction() -> None:
+    """Keys expire after their time to live and the cache stays bounded."""
+    cache = IdempotencyCache(max_size=2)
+    with patch(
+        "custom_components.family_health_tracker.idempotency.monotonic",
+        return_value=100.0,
+    ) as monotonic:
+        assert not cache.async_seen("a")
+        cache.async_add("a", 10)
+        assert cache.async_seen("a")
+
+        monotonic.return_value = 111.0
+        assert not cache.async_seen("a")
+        assert len(cache) == 0
+
+        for key in ("a", "b", "c"):
+            cache.async_add(key, 10)
+        assert len(cache) == 2
+        assert not cache.async_seen("a")
+
+    assert cache.as_dict() == {
+        "size": 2,
+        "max_size": 2,
+        "hits": 1,
+        "misses": 3,
+        "evictions": 1,
+    }
+
+
+def _count_writes(entity, writes: list[str]) -> None:
+    write = entity.async_write_ha_state
+
+    def _write() -> None:
+        writes.append(entity.entity_id)
+        write()
+
+    entity.async_write_ha_state = _write
+
+
+async def test_high_duplicate_rate(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """Retried calls and batches cause no extra state writes."""
+    runtime = get_runtime(hass, loaded_entry, "john")
+    jane = get_runtime(hass, loaded_entry, "jane")
+    writes: list[str] = []
+    _count_writes(runtime.temperature_sensor, writes)
+    _count_writes(jane.temperature_sensor, writes)
+
+    # Ten readings, each retried ten times
+    for attempt in range(10):
+        for reading in range(10):
+            await hass.services.async_call(
+                DOMAIN,
+                "add_measurement",
+                {
+                    "name": "John",
+                    "temperature": 37 + reading / 10,
+                    "medication": "none",
+                    "idempotency_key": f"reading-{reading}",
+                },
+                blocking=True,
+            )
+    assert len(writes) == 10
+    assert len(runtime.history.ring("john")) == 10
+
+    start = dt_util.now() - timedelta(hours=1)
+    batch = {
+        "measurements": [
+            {
+                "name": "Jane",
+                "temperature": 38 + index % 5 / 10,
+                "medication": "none",
+                "measured_at": start + timedelta(minutes=index % 5),
+            }
+            for index in range(50)
+        ]
+    }
+    for _ in range(5):
+        await hass.services.async_call(
+            DOMAIN, "add_measurements_batch", batch, blocking=True
+        )
+    assert writes.count("sensor.temperature_jane") == 1
+    assert len(jane.history.ring("jane")) == 5
+    assert async_get_idempotency_cache(hass).hits == 90 + 45 + 4 * 50
+
+
+async def test_repeat_without_key_applied(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """Identical readings stamped on arrival are all recorded."""
+    for _ in range(3):
+        await hass.services.async_call(
+            DOMAIN,
+            "add_measurement",
+            {"name": "John", "temperature": 38.0, "medication": "none"},
+            blocking=True,
+        )
+
+    assert len(get_runtime(hass, loaded_entry, "john").history.ring("john")) == 3
+
+
+async def test_failed_call_can_be_retried(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """A key is only remembered once its measurement was applied."""
+    data = {
+        "name": "John",
+        "temperature": 38.0,
+        "medication": "none",
+        "idempotency_key": "retry",
+    }
+
+    with patch.object(
+        MemberRuntime, "async_record", side_effect=HomeAssistantError("failed")
+    ), pytest.raises(HomeAssistantError):
+        await hass.services.async_call(DOMAIN, "add_measurement", data, blocking=True)
+
+    await hass.services.async_call(DOMAIN, "add_measurement", data, blocking=True)
+    assert hass.states.get("sensor.temperature_john").state == "38.0"
+    assert async_get_idempotency_cache(hass).hits == 0
@@ -0,0 +1,130 @@
+"""Tests for the temperature level classification."""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.family_health_tracker.const import DOMAIN
+from custom_components.family_health_tracker.levels import (
+    COMPILED_TABLES,
+    DEFAULT_LEVELS,
+    LEVEL_UNKNOWN,
+    TemperatureLevels,
+    _compile_frozen,
+    get_levels,
+)
+
+from . import async_setup_members
+
+CHILD_LEVELS = {
+    "normal": {"min": 36.0, "max": 37.5},
+    "fever": {"min": 37.6, "max": 38.9},
+    "high_fever": {"min": 39.0, "max": 42.0},
+}
+
+
+@pytest.mark.parametrize(
+    ("temperature", "level"),
+    [
+        (-0.1, LEVEL_UNKNOWN),
+        (0.0, "low"),
+        (35.9, "low"),
+        (36.0, "normal"),
+        (37.2, "normal"),
+        (37.25, "normal"),
+        (37.3, "elevated"),
+        (37.5, "elevated"),
+        (38.0, "elevated"),
+        (38.05, "elevated"),
+        (38.1, "medium"),
+        (39.0, "medium"),
+        (39.05, "medium"),
+        (39.1, "high"),
+        (40.0, "high"),
+        (40.1, "very_high"),
+        (43.0, "very_high"),
+        (43.01, LEVEL_UNKNOWN),
+        (math.nan, LEVEL_UNKNOWN),
+    ],
+)
+def test_default_boundaries(temperature: float, level: str) -> None:
+    """Thresholds belong to the level they start, gaps to the level below."""
+    assert DEFAULT_LEVELS.classify(temperature) == level
+    assert DEFAULT_LEVELS.classify_many([temperature]).tolist() == [level]
+
+
+def test_classify_many_matches_classify() -> None:
+    """The array path agrees with the scalar path on every reading."""
+    temperatures = np.round(np.arange(34.0, 44.0, 0.05), 2)
+
+    assert DEFAULT_LEVELS.classify_many(temperatures).tolist() == [
+        DEFAULT_LEVELS.classify(temperature) for temperature in temperatures
+    ]
+
+
+def test_custom_table_boundaries() -> None:
+    """A custom table is ordered by its minimums, not by insertion."""
+    levels = TemperatureLevels(dict(reversed(CHILD_LEVELS.items())))
+
+    assert levels.levels == ["normal", "fever", "high_fever"]
+    assert levels.classify(37.5) == "normal"
+    assert levels.classify(37.55) == "normal"
+    assert levels.classify(37.6) == "fever"
+    assert levels.classify(39.0) == "high_fever"
+    assert levels.classify(35.9) == LEVEL_UNKNOWN
+    assert levels.classify(42.1) == LEVEL_UNKNOWN
+    with pytest.raises(ValueError):
+        TemperatureLevels({})
+
+
+async def test_get_levels_overrides(hass: HomeAssistant) -> None:
+    """A single table applies to everyone, a mapping per member."""
+    assert get_levels(hass, "anna") is DEFAULT_LEVELS
+
+    hass.data[DOMAIN] = {"temp_levels": CHILD_LEVELS}
+    assert get_levels(hass).levels == list(CHILD_LEVELS)
+    assert get_levels(hass, "anna").classify(38.0) == "fever"
+
+    hass.data[DOMAIN] = {"temp_levels": {"anna": CHILD_LEVELS}}
+    assert get_levels(hass, "anna").classify(38.0) == "fever"
+    assert get_levels(hass, "ben") is DEFAULT_LEVELS
+    assert get_levels(hass) is DEFAULT_LEVELS
+
+
+async def test_member_override_sensor(hass: HomeAssistant) -> None:
+    """The level sensor classifies with its member's own table."""
+    hass.data[DOMAIN] = {"temp_levels": {"anna": CHILD_LEVELS}}
+    await async_setup_members(hass, ["Anna", "Ben"])
+
+    for name in ("Anna", "Ben"):
+        await hass.services.async_call(
+            DOMAIN,
+            "add_measurement",
+            {"name": name, "temperature": 39.0, "medication": "none"},
+            blocking=True,
+        )
+
+    assert hass.states.get("sensor.temperature_level_anna").state == "high_fever"
+    assert hass.states.get("sensor.temperature_level_ben").state == "medium"
+
+
+async def test_compiled_tables_bounded(hass: HomeAssistant) -> None:
+    """Equal tables share one compiled table and the cache stays bounded."""
+    _compile_frozen.cache_clear()
+    hass.data[DOMAIN] = {"temp_levels": {"anna": CHILD_LEVELS}}
+    compiled = get_levels(hass, "anna")
+
+    copied = {level: dict(limits) for level, limits in CHILD_LEVELS.items()}
+    hass.data[DOMAIN] = {"temp_levels": {"anna": copied}}
+    assert get_levels(hass, "anna") is compiled
+
+    for offset in range(COMPILED_TABLES * 3):
+        hass.data[DOMAIN] = {
+            "temp_levels": {"normal": {"min": 36.0 + offset / 100, "max": 38.0}}
+        }
+        get_levels(hass)
+    assert _compile_frozen.cache_info().currsize == COMPILED_TABLES
@@ -0,0 +1,137 @@
+"""Tests for the paginated history queries."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from homeassistant.components.websocket_api import ERR_INVALID_FORMAT
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from custom_components.family_health_tracker.const import DOMAIN
+
+from . import async_setup_members, get_runtime
+
+START = 1_700_000_000.0
+READINGS = 25
+
+
+@pytest.fixture
+async def entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Set up John with 25 readings, three at each timestamp."""
+    entry = await async_setup_members(hass, ["John"])
+    history = get_runtime(hass, entry, "john").history
+    for index in range(READINGS):
+        history.async_record("john", START + index // 3, 36 + index / 10, "none")
+    return entry
+
+
+async def _page(hass: HomeAssistant, **data: Any) -> dict[str, Any]:
+    return await hass.services.async_call(
+        DOMAIN,
+        "get_history",
+        {"name": "John", **data},
+        blocking=True,
+        return_response=True,
+    )
+
+
+async def _walk(hass: HomeAssistant, **data: Any) -> tuple[list[float], set[int]]:
+    """Follow the cursors; return the temperatures and the totals seen."""
+    temperatures, totals = [], set()
+    cursor = None
+    while True:
+        page = await _page(hass, **data, **({"cursor": cursor} if cursor else {}))
+        temperatures.extend(item["temperature"] for item in page["readings"])
+        totals.add(page["total"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return temperatures, totals
+
+
+def _local(timestamp: float) -> str:
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).isoformat()
+
+
+async def test_walk_splits_equal_timestamps(
+    hass: HomeAssistant, entry: MockConfigEntry
+) -> None:
+    """Pages that end inside a run of equal timestamps lose and repeat nothing."""
+    # Four per page, so every page boundary falls inside a group of three
+    temperatures, totals = await _walk(hass, limit=4)
+
+    assert temperatures == [36 + index / 10 for index in range(READINGS)]
+    assert totals == {READINGS}
+
+
+async def test_walk_within_range(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """A cursor keeps to the start and end of the range it was issued for."""
+    temperatures, totals = await _walk(
+        hass, start=_local(START + 2), end=_local(START + 5), limit=5
+    )
+
+    # Timestamps 2 to 5 inclusive hold readings 6 to 17
+    assert temperatures == [36 + index / 10 for index in range(6, 18)]
+    assert totals == {12}
+
+    page = await _page(hass, start=_local(START + 8), limit=100)
+    assert page["total"] == 1
+    assert page["next_cursor"] is None
+
+
+async def test_cursor_before_start(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """A cursor from before the range start resumes at the start."""
+    first = await _page(hass, limit=2)
+    page = await _page(
+        hass, start=_local(START + 4), cursor=first["next_cursor"], limit=3
+    )
+    assert [item["temperature"] for item in page["readings"]] == [37.2, 37.3, 37.4]
+    assert page["total"] == READINGS - 12
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "1700000000.0:x", "nan:0", "1700000000.0:-2"])
+async def test_invalid_cursor_service(
+    hass: HomeAssistant, entry: MockConfigEntry, cursor: str
+) -> None:
+    """The service rejects a cursor it did not issue."""
+    with pytest.raises(HomeAssistantError, match="Invalid cursor"):
+        await _page(hass, cursor=cursor)
+
+
+async def test_history_websocket(
+    hass: HomeAssistant, entry: MockConfigEntry, hass_ws_client: WebSocketGenerator
+) -> None:
+    """The websocket command pages like the service and rejects bad cursors."""
+    client = await hass_ws_client()
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/history", "name": "John", "limit": 20}
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    page = response["result"]
+    assert len(page["readings"]) == 20
+    assert page["total"] == READINGS
+
+    await client.send_json_auto_id(
+        {
+            "type": f"{DOMAIN}/history",
+            "name": "John",
+            "cursor": page["next_cursor"],
+        }
+    )
+    page = (await client.receive_json())["result"]
+    assert [item["temperature"] for item in page["readings"]] == [
+        36 + index / 10 for index in range(20, READINGS)
+    ]
+    assert page["next_cursor"] is None
+
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/history", "name": "John", "cursor": "garbage"}
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == ERR_INVALID_FORMAT
@@ -0,0 +1,180 @@
+"""Tests for the rolling temperature statistics."""
+from __future__ import annotations
+
+from datetime import timedelta
+import random
+import statistics
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.family_health_tracker.const import (
+    CONF_STATISTICS_WINDOWS,
+    DOMAIN,
+    FEVER_THRESHOLD,
+)
+from custom_components.family_health_tracker.rolling import RollingWindow
+from custom_components.family_health_tracker.ticker import async_get_ticker
+
+from . import async_setup_members, get_runtime
+
+HOUR = 3600
+
+
+def _seconds_above(readings: list[tuple[float, float]], now: float, window: float) -> float:
+    """Time at or above the threshold within the window, from every reading."""
+    cutoff = now - window
+    total = 0.0
+    for index, (timestamp, temperature) in enumerate(readings):
+        if temperature < FEVER_THRESHOLD:
+            continue
+        end = readings[index + 1][0] if index + 1 < len(readings) else now
+        total += max(0.0, min(end, now) - max(timestamp, cutoff))
+    return total
+
+
+def _assert_matches(
+    window: RollingWindow, readings: list[tuple[float, float]], now: float
+) -> None:
+    inside = [t for ts, t in readings if ts >= now - window.window_seconds]
+    window.evict(now)
+    assert window.count == len(inside)
+    if inside:
+        assert window.mean == pytest.approx(statistics.fmean(inside))
+        assert window.minimum == min(inside)
+        assert window.maximum == max(inside)
+        expected = statistics.stdev(inside) if len(inside) > 1 else 0.0
+        assert window.std_dev == pytest.approx(expected, abs=1e-6)
+    else:
+        assert window.mean is None
+        assert window.minimum is None
+        assert window.maximum is None
+    assert window.seconds_above(now) == pytest.approx(
+        _seconds_above(readings, now, window.window_seconds)
+    )
+
+
+def test_matches_brute_force() -> None:
+    """Mean, std, min, max and time above match a full recomputation."""
+    rng = random.Random(7)
+    window = RollingWindow(6 * HOUR)
+    readings: list[tuple[float, float]] = []
+    now = 0.0
+    for _ in range(2_000):
+        now += rng.uniform(0, 1_800)
+        temperature = round(rng.uniform(36.0, 40.5), 1)
+        window.add(now, temperature)
+        readings.append((now, temperature))
+        _assert_matches(window, readings, now)
+
+    # Let the window drain reading by reading
+    while window.count:
+        now += 900
+        _assert_matches(window, readings, now)
+
+
+def test_min_max_after_removal() -> None:
+    """The extremes fall back to the next reading once they leave the window."""
+    window = RollingWindow(HOUR)
+    window.add(0, 39.5)
+    window.add(600, 36.1)
+    window.add(1_200, 37.0)
+    assert (window.minimum, window.maximum) == (36.1, 39.5)
+
+    window.evict(HOUR + 1)
+    assert (window.minimum, window.maximum) == (36.1, 37.0)
+    window.evict(HOUR + 601)
+    assert (window.minimum, window.maximum) == (37.0, 37.0)
+    assert window.std_dev == 0.0
+
+
+def test_seconds_above_partial_oldest_segment() -> None:
+    """Only the part of a fever segment inside the window is counted."""
+    window = RollingWindow(HOUR)
+    window.add(0, 38.5)
+    window.add(1_800, 37.0)
+    window.add(2_400, 38.2)
+
+    # 0-1800 above, 1800-2400 below, 2400-now above
+    assert window.seconds_above(2_400) == 1_800
+    window.evict(3_000)
+    # The window starts at -600, so the whole first segment still counts
+    assert window.seconds_above(3_000) == 1_800 + 600
+    window.evict(4_200)
+    # The window starts at 600: 1200 s of the first segment, 1800 s of the last
+    assert window.seconds_above(4_200) == 1_200 + 1_800
+    assert window.count == 2
+
+
+def test_out_of_order_reading_ignored() -> None:
+    """A reading older than the last one does not change the window."""
+    window = RollingWindow(HOUR)
+    window.add(1_000, 37.0)
+    window.add(500, 40.0)
+    assert window.count == 1
+    assert window.maximum == 37.0
+
+
+async def test_statistics_sensor_untracks_when_empty(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """The sensor drops out of the ticker once its window has emptied."""
+    await async_setup_members(hass, ["John"], **{CONF_STATISTICS_WINDOWS: [1]})
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurement",
+        {"name": "John", "temperature": 37.5, "medication": "none"},
+        blocking=True,
+    )
+    state = hass.states.get("sensor.temperature_stats_1h_john")
+    assert state.state == "37.5"
+    assert state.attributes["samples"] == 1
+    assert hass.states.get("sensor.temperature_stats_6h_john") is None
+    ticker = async_get_ticker(hass)
+    assert len(ticker._due) == 1
+
+    for _ in range(12):
+        freezer.tick(timedelta(minutes=10))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.temperature_stats_1h_john")
+    assert state.state == "unknown"
+    assert state.attributes["samples"] == 0
+    assert not ticker._due
+    assert ticker._unsub is None
+
+
+async def test_statistics_seeded_from_history(hass: HomeAssistant) -> None:
+    """A reload seeds each window from the measurement history."""
+    entry = await async_setup_members(
+        hass, ["John"], **{CONF_STATISTICS_WINDOWS: [1, 6]}
+    )
+    now = dt_util.now()
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurements_batch",
+        {
+            "measurements": [
+                {
+                    "name": "John",
+                    "temperature": temperature,
+                    "medication": "none",
+                    "measured_at": now - timedelta(hours=hours),
+                }
+                for hours, temperature in ((3, 39.0), (0.5, 37.0))
+            ]
+        },
+        blocking=True,
+    )
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.temperature_stats_1h_john").state == "37.0"
+    assert hass.states.get("sensor.temperature_stats_6h_john").state == "38.0"
+    statistics_sensors = get_runtime(hass, entry, "john").statistics_sensors
+    assert [sensor._window.count for sensor in statistics_sensors] == [1, 2]
@@ -0,0 +1,106 @@
+"""Tests for the member runtimes and the member directory."""
+from __future__ import annotations
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.family_health_tracker.const import DOMAIN
+from custom_components.family_health_tracker.runtime import (
+    async_get_member_directory,
+    normalize_member,
+)
+
+from . import async_setup_members, get_runtime
+
+
+async def test_runtime_references(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """Every platform attaches its entities to the member's runtime."""
+    runtime = get_runtime(hass, loaded_entry, "john")
+
+    assert runtime.temperature_sensor.entity_id == "sensor.temperature_john"
+    assert runtime.level_sensor.entity_id == "sensor.temperature_level_john"
+    assert runtime.medication_sensor.entity_id == "sensor.medication_john"
+    assert runtime.duration_sensor.entity_id == "sensor.medication_duration_john"
+    assert runtime.temperature_input.entity_id == "number.temperature_john"
+    assert runtime.medication_input.entity_id == "select.medication_john"
+    assert runtime.button.entity_id == "button.record_measurement_john"
+    assert runtime.dose_sensor.entity_id == "binary_sensor.dose_due_john"
+    assert len(runtime.statistics_sensors) == 3
+    assert runtime.sensors_ready
+
+
+async def test_add_measurement_updates_member(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """A measurement reaches the member's sensors through the runtime."""
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurement",
+        {"name": " JOHN ", "temperature": 38.5, "medication": "none"},
+        blocking=True,
+    )
+
+    assert hass.states.get("sensor.temperature_john").state == "38.5"
+    assert hass.states.get("sensor.temperature_level_john").state == "medium"
+    assert hass.states.get("sensor.medication_john").state == "none"
+    assert hass.states.get("sensor.temperature_jane").state == "unknown"
+
+
+async def test_resolve_by_device(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """Members resolve by name or by their device id."""
+    directory = async_get_member_directory(hass)
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, f"{loaded_entry.entry_id}_jane")}
+    )
+
+    assert directory.resolve(name="Jane").key == "jane"
+    assert directory.resolve(device_id=device.id).key == "jane"
+    assert directory.get_by_device(device.id) is get_runtime(hass, loaded_entry, "jane")
+    with pytest.raises(HomeAssistantError):
+        directory.resolve(name="John", device_id=device.id)
+    with pytest.raises(HomeAssistantError):
+        directory.resolve(name="Nobody")
+
+
+async def test_resolve_name_in_several_entries(hass: HomeAssistant) -> None:
+    """A name shared by two entries needs the device id."""
+    first = await async_setup_members(hass, ["Max"])
+    second = await async_setup_members(hass, ["Max", "Mia"])
+    directory = async_get_member_directory(hass)
+
+    with pytest.raises(HomeAssistantError, match="several entries"):
+        directory.resolve(name="max")
+    runtime = get_runtime(hass, second, "max")
+    assert directory.resolve(device_id=runtime.device_id) is runtime
+    assert directory.resolve(name="Mia").entry_id == second.entry_id
+
+    assert await hass.config_entries.async_unload(second.entry_id)
+    assert directory.resolve(name="Max").entry_id == first.entry_id
+    assert {runtime.key for runtime in directory} == {"max"}
+
+
+async def test_unknown_member_service_error(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """Recording for an unknown member fails the service call."""
+    with pytest.raises(HomeAssistantError, match="Unknown family member"):
+        await hass.services.async_call(
+            DOMAIN,
+            "add_measurement",
+            {"name": "Nobody", "temperature": 37.0, "medication": "none"},
+            blocking=True,
+        )
+
+
+def test_normalize_member() -> None:
+    """Member keys ignore case and surrounding whitespace."""
+    assert normalize_member("  John ") == "john"
+    assert normalize_member("Anna Lena") == "anna lena"
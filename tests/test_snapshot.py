@@ -0,0 +1,98 @@
+"""Tests for restoring member sensors at setup."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.family_health_tracker.const import (
+    CONF_MEDICATIONS,
+    DOMAIN,
+    SNAPSHOT_STORAGE_KEY,
+)
+
+from . import MEDICATIONS, async_setup_members, get_runtime
+
+
+async def _record(
+    hass: HomeAssistant, name: str, temperature: float, medication: str
+) -> None:
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurement",
+        {"name": name, "temperature": temperature, "medication": medication},
+        blocking=True,
+    )
+
+
+@pytest.fixture
+async def entry(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> MockConfigEntry:
+    """Record a dose for John 90 minutes ago and a plain reading since."""
+    entry = await async_setup_members(
+        hass, ["John", "Jane"], **{CONF_MEDICATIONS: MEDICATIONS}
+    )
+    await _record(hass, "John", 38.6, "paracetamol")
+    freezer.tick(timedelta(minutes=60))
+    await _record(hass, "John", 37.4, "none")
+    freezer.tick(timedelta(minutes=30))
+    return entry
+
+
+def _assert_restored(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    assert hass.states.get("sensor.temperature_john").state == "37.4"
+    assert hass.states.get("sensor.temperature_level_john").state == "elevated"
+    assert hass.states.get("sensor.medication_john").state == "none"
+    assert hass.states.get("sensor.medication_duration_john").state == "1.5"
+    duration_sensor = get_runtime(hass, entry, "john").duration_sensor
+    assert duration_sensor._last_medication_time is not None
+    # Jane has no readings and stays unknown
+    assert hass.states.get("sensor.temperature_jane").state == "unknown"
+    assert hass.states.get("sensor.medication_duration_jane").state == "unknown"
+
+
+async def test_restore_after_reload(
+    hass: HomeAssistant, entry: MockConfigEntry
+) -> None:
+    """The last temperature, level, medication and dose time survive a reload."""
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    _assert_restored(hass, entry)
+
+
+async def test_restore_after_restart(
+    hass: HomeAssistant, entry: MockConfigEntry, hass_storage: dict[str, Any]
+) -> None:
+    """The saved snapshot restores the members after a restart."""
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    snapshot = hass_storage[f"{SNAPSHOT_STORAGE_KEY}.{entry.entry_id}"]
+    assert snapshot["data"]["members"]["john"]["last_dose"] == "paracetamol"
+    # Nothing of the running entry is kept in memory
+    assert entry.entry_id not in hass.data[DOMAIN]
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    _assert_restored(hass, entry)
+
+
+async def test_restore_from_history_without_snapshot(
+    hass: HomeAssistant, entry: MockConfigEntry, hass_storage: dict[str, Any]
+) -> None:
+    """Members without a snapshot are restored from their history."""
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    del hass_storage[f"{SNAPSHOT_STORAGE_KEY}.{entry.entry_id}"]
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    _assert_restored(hass, entry)
@@ -0,0 +1,124 @@
+"""Tests for the shared refresh timer."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.family_health_tracker.const import CONF_MEDICATIONS, DOMAIN
+from custom_components.family_health_tracker.ticker import async_get_ticker
+
+from . import MEDICATIONS, async_setup_members, get_runtime
+
+
+async def _advance(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float
+) -> None:
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_duration_steps_from_dose_time(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Each duration rolls over at its own 0.1 h step, not on a shared grid."""
+    freezer.move_to(dt_util.utc_from_timestamp(36_000 * 50_000 + 100))
+    await async_setup_members(
+        hass, ["John", "Jane"], **{CONF_MEDICATIONS: MEDICATIONS}
+    )
+
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurement",
+        {"name": "John", "temperature": 38.5, "medication": "paracetamol"},
+        blocking=True,
+    )
+    await _advance(hass, freezer, 150)
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurement",
+        {"name": "Jane", "temperature": 38.5, "medication": "paracetamol"},
+        blocking=True,
+    )
+    assert hass.states.get("sensor.medication_duration_john").state == "0.0"
+
+    # John's value steps to 0.1 h 180 s after his dose
+    await _advance(hass, freezer, 31)
+    assert hass.states.get("sensor.medication_duration_john").state == "0.1"
+    assert hass.states.get("sensor.medication_duration_jane").state == "0.0"
+
+    # Jane's 150 s later, well before the next 360 s grid boundary
+    await _advance(hass, freezer, 150)
+    assert hass.states.get("sensor.medication_duration_jane").state == "0.1"
+
+    await _advance(hass, freezer, 360)
+    assert hass.states.get("sensor.medication_duration_john").state == "0.2"
+    assert hass.states.get("sensor.medication_duration_jane").state == "0.2"
+
+
+async def test_untrack_cancels_timer(hass: HomeAssistant) -> None:
+    """The timer is only armed while a sensor is tracked."""
+    entry = await async_setup_members(
+        hass, ["John"], **{CONF_MEDICATIONS: MEDICATIONS}
+    )
+    ticker = async_get_ticker(hass)
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurement",
+        {"name": "John", "temperature": 38.5, "medication": "paracetamol"},
+        blocking=True,
+    )
+    assert ticker._unsub is not None
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert ticker._unsub is None
+
+
+async def test_wake_ticks_only_due_sensors(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A wake refreshes the sensors that are due and leaves the rest alone."""
+    freezer.move_to(dt_util.utc_from_timestamp(36_000 * 50_000 + 100))
+    entry = await async_setup_members(
+        hass, ["John", "Jane"], **{CONF_MEDICATIONS: MEDICATIONS}
+    )
+    for name in ("John", "Jane"):
+        await hass.services.async_call(
+            DOMAIN,
+            "add_measurement",
+            {"name": name, "temperature": 38.5, "medication": "paracetamol"},
+            blocking=True,
+        )
+        await _advance(hass, freezer, 50)
+    ticks: list[str] = []
+    for key in ("john", "jane"):
+        sensor = get_runtime(hass, entry, key).duration_sensor
+        tick = sensor.async_tick
+
+        def _counting(tick=tick, key=key) -> bool:
+            ticks.append(key)
+            return tick()
+
+        sensor.async_tick = _counting
+
+    # John's step is 180 s after his dose, Jane's 50 s later
+    await _advance(hass, freezer, 81)
+    assert ticks == ["john"]
+    await _advance(hass, freezer, 50)
+    assert ticks == ["john", "jane"]
+
+    # Repeated readings do not grow the heap without bound
+    ticker = async_get_ticker(hass)
+    runtime = get_runtime(hass, entry, "john")
+    for _ in range(200):
+        runtime.duration_sensor.set_medication_time(
+            "paracetamol", dt_util.now()
+        )
+        await _advance(hass, freezer, 1)
+    assert len(ticker._heap) <= 2 * len(ticker._due) + 16
@@ -0,0 +1,112 @@
+"""Tests for the websocket measurement subscription."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.family_health_tracker.const import DOMAIN
+
+from . import async_setup_members
+
+
+async def _record(hass: HomeAssistant, name: str, temperature: float) -> None:
+    await hass.services.async_call(
+        DOMAIN,
+        "add_measurement",
+        {"name": name, "temperature": temperature, "medication": "none"},
+        blocking=True,
+    )
+
+
+async def _subscribe(hass_ws_client: WebSocketGenerator, **filters: Any):
+    client = await hass_ws_client()
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/subscribe_measurements", **filters}
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    return client, response["id"]
+
+
+async def _no_message(client) -> None:
+    """Assert nothing else was sent before the reply to a ping."""
+    await client.send_json_auto_id({"type": "ping"})
+    assert (await client.receive_json())["type"] == "pong"
+
+
+async def test_member_filter_and_rate_limit(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """A burst for two members sends only the filtered member, once per interval."""
+    await async_setup_members(hass, ["John", "Jane"])
+    client, _ = await _subscribe(hass_ws_client, member="John", min_interval=10)
+
+    for index in range(5):
+        await _record(hass, "John", 37.0 + index / 10)
+        await _record(hass, "Jane", 38.0 + index / 10)
+
+    # The first reading goes out at once, the rest wait for the interval
+    message = await client.receive_json()
+    assert message["type"] == "event"
+    event = message["event"]
+    assert [item["temperature"] for item in event["measurements"]] == [37.0]
+    assert event["measurements"][0]["member"] == "john"
+    assert event["coalesced"] == 0
+    await _no_message(client)
+
+    freezer.tick(timedelta(seconds=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    # Only the newest of the four queued readings, the others coalesced
+    event = (await client.receive_json())["event"]
+    assert [item["temperature"] for item in event["measurements"]] == [37.4]
+    assert event["coalesced"] == 3
+    await _no_message(client)
+
+
+async def test_level_filter_without_interval(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Without an interval every matching measurement is sent on its own."""
+    await async_setup_members(hass, ["John", "Jane"])
+    client, _ = await _subscribe(hass_ws_client, level=["high", "very_high"])
+
+    for name, temperature in (
+        ("John", 37.0),
+        ("Jane", 39.5),
+        ("John", 40.2),
+        ("Jane", 38.0),
+    ):
+        await _record(hass, name, temperature)
+
+    for member, level in (("jane", "high"), ("john", "very_high")):
+        event = (await client.receive_json())["event"]
+        assert event["coalesced"] == 0
+        assert [(item["member"], item["level"]) for item in event["measurements"]] == [
+            (member, level)
+        ]
+    await _no_message(client)
+
+
+async def test_unsubscribe(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Nothing is sent once the subscription is cancelled."""
+    await async_setup_members(hass, ["John"])
+    client, subscription = await _subscribe(hass_ws_client)
+
+    await client.send_json_auto_id(
+        {"type": "unsubscribe_events", "subscription": subscription}
+    )
+    assert (await client.receive_json())["success"]
+    await _record(hass, "John", 37.0)
+    await _no_message(client)